@@ -0,0 +1,312 @@
+# Batalha dos Feiticeiros — Afinador de Balanceamento
+# Procura números de feitiços (dano, chance, mana, status_chance) e de
+# dificuldades (vida, mana, vida_inimigo, mana_inimigo, enemy_acc_mod) que
+# levem cada dificuldade à taxa de vitória e à duração média desejadas:
+# - cada candidato é avaliado no simulador vetorizado (um lote por
+#   dificuldade), com números aleatórios comuns: a mesma semente por
+#   dificuldade para todos os candidatos, então a diferença entre dois
+#   candidatos vem dos números, não do sorteio
+# - busca (1+λ): a cada geração, λ variações do melhor atual, avaliadas em
+#   paralelo num pool de processos; o passo cresce quando melhora e
+#   encolhe quando não
+# - cache em disco dos candidatos já avaliados (mesmo arquivo base,
+#   partidas, semente e política): rodar de novo continua de onde parou
+# - o resultado é um arquivo de feitiços completo, com a seção
+#   "dificuldades"; o jogo usa com BATALHA_FEITICOS=caminho.json
+#
+# Requer: numpy
+#
+# Execução:
+#   python afinador_balanceamento.py --geracoes 30
+#   python afinador_balanceamento.py --alvo Normal=0.5:12 Difícil=0.3:13 --politica gulosa --processos 8
+#   BATALHA_FEITICOS=tabelas/feiticos_balanceados.json python batalha_dos_feiticeiros_plus_fixed.py
+
+import copy
+import hashlib
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import feiticos
+from motor_batalha import DIFICULDADES, DIFICULDADES_IA_EMBUTIDA, teto_inicial
+from simulador_vetorizado import (PARAMETROS, LoteBatalhas, TabelasFeiticos, politica_aleatoria,
+                                  politica_gulosa, resumo)
+
+PASTA_TABELAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tabelas")
+SAIDA_PADRAO = os.path.join(PASTA_TABELAS, "feiticos_balanceados.json")
+CACHE_PADRAO = os.path.join(PASTA_TABELAS, "cache_afinador.json")
+
+POLITICAS = {"aleatoria": politica_aleatoria, "gulosa": politica_gulosa}
+
+# dificuldade -> (taxa de vitória do jogador, turnos médios)
+ALVOS = {"Fácil": (0.75, 10.0), "Normal": (0.55, 11.0), "Difícil": (0.35, 12.0)}
+# Quanto de erro em cada métrica vale "1" no erro total
+TOLERANCIA_TAXA = 0.02
+TOLERANCIA_TURNOS = 0.5
+
+# Limites de busca: (mínimo, máximo); máximo None = motor_batalha.teto_inicial
+# (vida e mana acima de 100 o motor cortaria na primeira cura ou regeneração)
+LIMITES_FEITICO = {"dano": (5, 80), "chance": (10, 95), "mana": (5, 60), "status_chance": (0, 100)}
+LIMITES_DIFICULDADE = {"vida": (50, None), "mana": (50, None), "vida_inimigo": (50, None),
+                       "mana_inimigo": (50, None), "enemy_acc_mod": (-25, 25)}
+
+
+# ---------- Espaço de busca ----------
+def eixos_busca(base, dificuldades, feiticos_livres=True, dificuldades_livres=True):
+    """
+    Lista de eixos (seção, nome, campo, mínimo, máximo) e o vetor inicial
+    (os números do arquivo base, sobre os de motor_batalha.DIFICULDADES).
+    """
+    eixos, vetor = [], []
+    if feiticos_livres:
+        for f in base["feiticos"]:
+            for campo, (lo, hi) in LIMITES_FEITICO.items():
+                if campo == "status_chance" and not f.get("status"):
+                    continue
+                eixos.append(("feiticos", f["id"], campo, lo, hi))
+                vetor.append(f.get(campo, 0))
+    if dificuldades_livres:
+        for d in dificuldades:
+            for campo, (lo, hi) in LIMITES_DIFICULDADE.items():
+                eixos.append(("dificuldades", d, campo, lo, teto_inicial(d, campo) if hi is None else hi))
+                vetor.append(configuracao(base, d)[campo])
+    return eixos, tuple(min(max(v, e[3]), e[4]) for v, e in zip(vetor, eixos))
+
+
+def aplicar(base, eixos, vetor):
+    # Arquivo de feitiços (dict) com os números do vetor
+    dados = copy.deepcopy(base)
+    por_id = {f["id"]: f for f in dados["feiticos"]}
+    ajustes = dados.setdefault("dificuldades", {})
+    for (secao, nome, campo, _, _), v in zip(eixos, vetor):
+        if secao == "feiticos":
+            por_id[nome][campo] = int(v)
+        else:
+            ajustes.setdefault(nome, {})[campo] = int(v)
+    if not ajustes:
+        del dados["dificuldades"]
+    return dados
+
+
+def configuracao(dados, dificuldade):
+    cfg = {k: DIFICULDADES[dificuldade][k] for k in PARAMETROS}
+    cfg.update(dados.get("dificuldades", {}).get(dificuldade, {}))
+    return cfg
+
+
+def semente_dificuldade(semente, dificuldade):
+    # Estável entre processos e execuções (hash() do Python não é)
+    chave = f"{semente}|{dificuldade}".encode()
+    return int.from_bytes(hashlib.blake2b(chave, digest_size=8).digest(), "little")
+
+
+# ---------- Avaliação (em cada processo) ----------
+def _avaliar(tarefa):
+    vetor, contexto = tarefa
+    dados = aplicar(contexto["base"], contexto["eixos"], vetor)
+    tabelas = TabelasFeiticos(feiticos.de_dados(dados, "<candidato>"))
+    politica = POLITICAS[contexto["politica"]]
+    n = contexto["partidas"]
+    metricas = {}
+    for d in contexto["dificuldades"]:
+        cfg = configuracao(dados, d)
+        # números aleatórios comuns: a mesma sequência para todo candidato
+        rng = np.random.default_rng(semente_dificuldade(contexto["semente"], d))
+        lote = LoteBatalhas({k: np.full(n, cfg[k]) for k in PARAMETROS}, rng, tabelas).simular(politica)
+        r = resumo(lote)
+        metricas[d] = (r["taxa_vitoria"], r["turnos_media"])
+    return vetor, metricas
+
+
+def erro(metricas, alvos):
+    total = 0.0
+    for d, (taxa_alvo, turnos_alvo) in alvos.items():
+        taxa, turnos = metricas[d]
+        total += ((taxa - taxa_alvo) / TOLERANCIA_TAXA) ** 2 + ((turnos - turnos_alvo) / TOLERANCIA_TURNOS) ** 2
+    return total
+
+
+# ---------- Cache ----------
+class CacheAvaliacoes:
+    """
+    {vetor: métricas} de um contexto (arquivo base, eixos, partidas,
+    semente, política). Outro contexto começa vazio.
+    """
+
+    def __init__(self, caminho, contexto):
+        self.caminho = caminho
+        self.chave = hashlib.blake2b(json.dumps(contexto, sort_keys=True, ensure_ascii=False).encode(),
+                                     digest_size=8).hexdigest()
+        self.avaliados = {}
+        self.acertos = 0
+        if caminho and os.path.exists(caminho):
+            try:
+                with open(caminho, encoding="utf-8") as f:
+                    dados = json.load(f)
+            except (OSError, ValueError):
+                dados = {}
+            if dados.get("contexto") == self.chave:
+                self.avaliados = {tuple(json.loads(k)): {d: tuple(m) for d, m in v.items()}
+                                  for k, v in dados.get("avaliados", {}).items()}
+
+    def get(self, vetor):
+        m = self.avaliados.get(vetor)
+        if m is not None:
+            self.acertos += 1
+        return m
+
+    def __setitem__(self, vetor, metricas):
+        self.avaliados[vetor] = metricas
+
+    def __len__(self):
+        return len(self.avaliados)
+
+    def salvar(self):
+        if not self.caminho:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.caminho)), exist_ok=True)
+        temporario = self.caminho + ".tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            json.dump({"contexto": self.chave,
+                       "avaliados": {json.dumps(list(v)): m for v, m in self.avaliados.items()}}, f)
+        os.replace(temporario, self.caminho)
+
+
+# ---------- Busca ----------
+def _variar(vetor, eixos, escala, rng):
+    # 1 a 3 eixos mudam; passo proporcional ao intervalo de cada eixo
+    novo = list(vetor)
+    for k in rng.sample(range(len(eixos)), min(len(eixos), rng.randint(1, 3))):
+        _, _, _, lo, hi = eixos[k]
+        passo = round(rng.gauss(0, escala * (hi - lo) / 10)) or rng.choice((-1, 1))
+        novo[k] = min(hi, max(lo, novo[k] + passo))
+    return tuple(novo)
+
+
+def afinar(alvos=ALVOS, geracoes=30, variacoes=8, partidas=4000, politica="aleatoria", semente=0,
+           processos=None, feiticos_livres=True, dificuldades_livres=True, caminho_base=None,
+           caminho_cache=CACHE_PADRAO, saida=print):
+    """
+    Devolve (dados do melhor arquivo de feitiços, métricas, erro, métricas
+    iniciais). Toda avaliação passa pelo cache.
+    """
+    with open(caminho_base or os.environ.get("BATALHA_FEITICOS") or feiticos.ARQUIVO_PADRAO,
+              encoding="utf-8") as f:
+        base = json.load(f)
+    dificuldades = list(alvos)
+    eixos, inicial = eixos_busca(base, dificuldades, feiticos_livres, dificuldades_livres)
+    contexto = {"base": base, "eixos": eixos, "dificuldades": dificuldades, "partidas": partidas,
+                "semente": semente, "politica": politica}
+    cache = CacheAvaliacoes(caminho_cache, contexto)
+    rng = random.Random(semente)
+    processos = processos or os.cpu_count() or 1
+    pool = ProcessPoolExecutor(max_workers=processos) if processos > 1 else None
+
+    def avaliar(vetores):
+        pendentes = list(dict.fromkeys(v for v in vetores if cache.get(v) is None))
+        tarefas = [(v, contexto) for v in pendentes]
+        resultados = pool.map(_avaliar, tarefas, chunksize=1) if pool else map(_avaliar, tarefas)
+        for v, m in resultados:
+            cache[v] = m
+        return [(v, cache.avaliados[v]) for v in vetores]
+
+    try:
+        (atual, metricas), = avaliar([inicial])
+        inicio_metricas = metricas
+        atual_erro = erro(metricas, alvos)
+        escala = 1.0
+        saida(f"início: erro {atual_erro:9.2f}  {_texto_metricas(metricas)}")
+        for g in range(geracoes):
+            candidatos = [_variar(atual, eixos, escala, rng) for _ in range(variacoes)]
+            melhor = min(avaliar(candidatos), key=lambda vm: erro(vm[1], alvos))
+            if erro(melhor[1], alvos) < atual_erro:
+                atual, metricas = melhor
+                atual_erro = erro(metricas, alvos)
+                escala = min(2.0, escala * 1.2)
+            else:
+                escala = max(0.1, escala * 0.8)
+            cache.salvar()
+            saida(f"geração {g + 1:3d}: erro {atual_erro:9.2f}  {_texto_metricas(metricas)}  "
+                  f"(cache {len(cache)}, {cache.acertos} reaproveitadas)")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return aplicar(base, eixos, atual), metricas, atual_erro, inicio_metricas
+
+
+def _texto_metricas(metricas):
+    return "  ".join(f"{d} {100 * t:5.1f}%/{n:4.1f}t" for d, (t, n) in metricas.items())
+
+
+def validar(dados, dificuldades, partidas, politica, semente):
+    # Outra semente: confere que o resultado não é só sorte da semente da busca
+    contexto = {"base": dados, "eixos": [], "dificuldades": list(dificuldades), "partidas": partidas,
+                "semente": semente, "politica": politica}
+    return _avaliar(((), contexto))[1]
+
+
+# ---------- Main ----------
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Afinador de números de feitiços e dificuldades.")
+    parser.add_argument("--alvo", nargs="*", metavar="DIFICULDADE=TAXA:TURNOS",
+                        help="padrão: " + " ".join(f"{d}={t}:{n:g}" for d, (t, n) in ALVOS.items()))
+    parser.add_argument("--geracoes", type=int, default=30)
+    parser.add_argument("--variacoes", type=int, default=8, help="candidatos por geração (λ)")
+    parser.add_argument("--partidas", type=int, default=4000, help="partidas por dificuldade e candidato")
+    parser.add_argument("--politica", default="aleatoria", choices=tuple(POLITICAS), help="política do jogador")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--processos", type=int, default=None)
+    parser.add_argument("--fixar", choices=("feiticos", "dificuldades"), help="não mexe nesta parte")
+    parser.add_argument("--base", help="arquivo de feitiços de partida (padrão: o do jogo)")
+    parser.add_argument("--cache", default=CACHE_PADRAO, help="'' desliga o cache em disco")
+    parser.add_argument("--saida", default=SAIDA_PADRAO)
+    args = parser.parse_args(argv)
+
+    alvos = ALVOS
+    if args.alvo:
+        alvos = {}
+        for item in args.alvo:
+            nome, _, valores = item.partition("=")
+            taxa, _, turnos = valores.partition(":")
+            if nome not in DIFICULDADES_IA_EMBUTIDA:
+                parser.error(f"dificuldade inválida: {nome} ({', '.join(DIFICULDADES_IA_EMBUTIDA)})")
+            try:
+                alvos[nome] = (float(taxa), float(turnos))
+            except ValueError:
+                parser.error(f"alvo inválido: {item} (use {nome}=0.55:11)")
+
+    inicio = time.perf_counter()
+    try:
+        dados, metricas, err, iniciais = afinar(alvos, args.geracoes, args.variacoes, args.partidas, args.politica,
+                                                 args.semente, args.processos, args.fixar != "feiticos",
+                                                 args.fixar != "dificuldades", args.base, args.cache or None)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    dados["afinador"] = {"alvos": {d: list(a) for d, a in alvos.items()}, "politica": args.politica,
+                         "partidas": args.partidas, "semente": args.semente, "erro": err,
+                         "metricas": {d: list(m) for d, m in metricas.items()}}
+    os.makedirs(os.path.dirname(os.path.abspath(args.saida)), exist_ok=True)
+    with open(args.saida, "w", encoding="utf-8") as f:
+        json.dump(dados, f, indent=2, ensure_ascii=False)
+
+    validacao = validar(dados, alvos, args.partidas, args.politica, args.semente + 1)
+    print(f"\nBusca em {time.perf_counter() - inicio:.1f}s")
+    print(f"{'Dificuldade':<12}{'alvo':>16}{'antes':>16}{'depois':>16}{'validação':>16}")
+    for d, (taxa, turnos) in alvos.items():
+        celulas = [(taxa, turnos), iniciais[d], metricas[d], validacao[d]]
+        print(f"{d:<12}" + "".join(f"{f'{100 * t:.1f}% / {n:.1f}t':>16}" for t, n in celulas))
+    for f in dados["feiticos"]:
+        print(f"  {f['id']:<10} dano {f['dano']:3d}  acerto {f['chance']:3d}%  mana {f['mana']:3d}"
+              + (f"  status {f['status_chance']}%" if f.get("status") else ""))
+    for d, ajuste in dados.get("dificuldades", {}).items():
+        print(f"  {d:<10} " + "  ".join(f"{c} {v}" for c, v in ajuste.items()))
+    print(f"\nArquivo: {args.saida}\nPara jogar: BATALHA_FEITICOS={args.saida} python batalha_dos_feiticeiros_plus_fixed.py")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+# Batalha dos Feiticeiros — Ambiente de Aprendizado por Reforço (NumPy)
+# N batalhas num LoteBatalhas (simulador_vetorizado.py); o agente é o
+# inimigo, o jogador segue uma política vetorizada fixa. Interface no
+# estilo Gym, em lote:
+# - reset() -> (obs, info); step(acoes) -> (obs, recompensa, terminado,
+#   truncado, info), um passo = jogada do agente + resposta do jogador
+# - obs: float32 (N, len(OBSERVACAO)), os campos de politica_treinada.py
+# - info["mascara"]: bool (N, len(ACOES)), feitiço sem mana é inválido;
+#   ação inválida segue as regras do motor (feitiço sem mana canaliza)
+# - recompensa +1 quando o inimigo vence, -1 quando perde, 0 no resto;
+#   truncado no limite de turnos
+# - autorreset: partidas que terminam recomeçam no mesmo passo; a
+#   observação final fica em info["obs_final"]
+#
+# Treino: método da entropia cruzada sobre a política linear de
+# politica_treinada.py (população x partidas num único lote). O arquivo
+# gerado é lido pela dificuldade "Treinada" da interface.
+#
+# Requer: numpy
+#
+# Execução:
+#   python ambiente_rl.py --passos 2000 --partidas 4096
+#   python ambiente_rl.py --treinar --geracoes 40 --jogador gulosa --saida tabelas/politica_treinada.json
+
+import time
+
+import numpy as np
+
+from motor_batalha import DIFICULDADES
+from politica_treinada import (ACOES, CAMINHO_PADRAO, CUSTO_CANALIZAR, CUSTOS, FEITICO_CANALIZAR, OBSERVACAO,
+                               PoliticaLinear)
+from simulador_vetorizado import (DEFENDER, NOMES_FEITICOS, STATUS, LoteBatalhas, politica_aleatoria,
+                                  politica_gulosa)
+
+POLITICAS_JOGADOR = {"aleatoria": politica_aleatoria, "gulosa": politica_gulosa}
+LIMITE_TURNOS = 200
+
+# Índice em ACOES -> código de ação do simulador (canalizar = feitiço mais caro)
+CODIGOS = np.array([NOMES_FEITICOS.index(a) for a in ACOES[:len(NOMES_FEITICOS)]]
+                   + [DEFENDER, NOMES_FEITICOS.index(FEITICO_CANALIZAR)], dtype=np.intp)
+_CUSTOS = np.array(CUSTOS, dtype=np.int32)
+N_STATUS = len(STATUS)
+
+
+# ---------- Observação ----------
+def observar(lote, saida=None):
+    # Mesma ordem e escala de politica_treinada.observacao
+    obs = np.empty((lote.n, len(OBSERVACAO)), dtype=np.float32) if saida is None else saida
+    obs[:, 0] = lote.vida_inimigo / 100
+    obs[:, 1] = lote.vida_jogador / 100
+    obs[:, 2] = lote.mana_inimigo / 100
+    obs[:, 3] = lote.mana_jogador / 100
+    obs[:, 4] = lote.pocoes / 3
+    obs[:, 5] = lote.defesa_inimigo
+    obs[:, 6] = lote.defesa_ativa
+    obs[:, 7:7 + N_STATUS] = lote.status_enemy / 5
+    obs[:, 7 + N_STATUS:7 + 2 * N_STATUS] = lote.status_player / 5
+    obs[:, -1] = 1
+    return obs
+
+
+def mascara(lote):
+    mana = lote.mana_inimigo[:, None]
+    return np.concatenate([mana >= _CUSTOS[None, :], np.ones_like(mana, dtype=bool),
+                           mana < CUSTO_CANALIZAR], axis=1)
+
+
+def escolher(pesos, obs, valido):
+    # pesos (ações, campos) ou (N, ações, campos): ação válida de maior valor
+    if pesos.ndim == 2:
+        valores = obs @ pesos.T
+    else:
+        valores = np.einsum("nac,nc->na", pesos, obs)
+    valores[~valido] = -np.inf
+    return valores.argmax(axis=1)
+
+
+# ---------- Ambiente ----------
+class AmbienteBatalhas:
+    def __init__(self, n, dificuldade="Normal", semente=None, politica_jogador=politica_aleatoria,
+                 limite_turnos=LIMITE_TURNOS, autorreset=True):
+        self.n = n
+        self.dificuldade = dificuldade
+        self.politica_jogador = politica_jogador
+        self.limite_turnos = limite_turnos
+        self.autorreset = autorreset
+        self.rng = np.random.default_rng(semente)
+        self.n_observacao = len(OBSERVACAO)
+        self.n_acoes = len(ACOES)
+        self.lote = None
+        self._obs = np.empty((n, self.n_observacao), dtype=np.float32)
+
+    def _jogador(self, indices=None):
+        lote = self.lote
+        lote.turno_jogador(self.politica_jogador(lote, self.rng), indices)
+
+    def reset(self, semente=None):
+        if semente is not None:
+            self.rng = np.random.default_rng(semente)
+        self.lote = LoteBatalhas.da_dificuldade(self.dificuldade, self.n, self.rng)
+        self._jogador()  # o jogador abre a partida; o agente responde
+        return observar(self.lote, self._obs).copy(), {"mascara": mascara(self.lote)}
+
+    def mascara(self):
+        return mascara(self.lote)
+
+    def step(self, acoes):
+        lote = self.lote
+        antes = lote.ativos
+        lote.turno_inimigo(CODIGOS[np.asarray(acoes)])
+        self._jogador()
+        vencedor = lote.vencedor
+        terminado = antes & (vencedor != 0)
+        truncado = antes & (vencedor == 0) & (lote.turnos >= self.limite_turnos)
+        recompensa = np.zeros(self.n, dtype=np.float32)
+        recompensa[terminado & (vencedor == 2)] = 1
+        recompensa[terminado & (vencedor == 1)] = -1
+        obs = observar(lote, self._obs).copy()
+        info = {}
+        fim = terminado | truncado
+        if self.autorreset and fim.any():
+            info["obs_final"] = obs.copy()
+            idx = np.flatnonzero(fim)
+            lote.reiniciar(idx)
+            self._jogador(idx)
+            obs[idx] = observar(lote, self._obs)[idx]
+        elif truncado.any():
+            lote.vencedor[truncado] = -1  # sem vencedor: sai das partidas ativas
+        info["mascara"] = mascara(lote)
+        return obs, recompensa, terminado, truncado, info
+
+
+# ---------- Avaliação e treino ----------
+def jogar_lote(pesos, n, dificuldade, politica_jogador, rng, limite_turnos=LIMITE_TURNOS):
+    """
+    Partidas completas (sem autorreset) com os pesos dados; pesos=None usa
+    a IA embutida. Devolve o vencedor de cada partida (1 jogador, 2 inimigo,
+    -1 limite de turnos).
+    """
+    lote = LoteBatalhas.da_dificuldade(dificuldade, n, rng)
+    obs = np.empty((n, len(OBSERVACAO)), dtype=np.float32)
+    while True:
+        lote.turno_jogador(politica_jogador(lote, rng))
+        if not lote.ativos.any():
+            break
+        if pesos is None:
+            lote.turno_inimigo()
+        else:
+            lote.turno_inimigo(CODIGOS[escolher(pesos, observar(lote, obs), mascara(lote))])
+        lote.vencedor[lote.ativos & (lote.turnos >= limite_turnos)] = -1
+        if not lote.ativos.any():
+            break
+    return lote.vencedor
+
+
+def treinar(geracoes=40, populacao=64, partidas=256, dificuldade="Normal", politica_jogador=politica_gulosa,
+            semente=0, elite=0.2, saida=print):
+    """
+    Entropia cruzada: a cada geração, `populacao` conjuntos de pesos
+    sorteados de N(media, desvio) jogam `partidas` cada, todos no mesmo
+    lote; a média e o desvio passam a ser os da elite (maior taxa de vitória
+    do inimigo). Devolve a PoliticaLinear da média final.
+    """
+    rng = np.random.default_rng(semente)
+    forma = (len(ACOES), len(OBSERVACAO))
+    media = np.zeros(forma)
+    desvio = np.ones(forma)
+    n_elite = max(2, int(populacao * elite))
+    grupo = np.repeat(np.arange(populacao), partidas)
+    for g in range(geracoes):
+        candidatos = media + desvio * rng.standard_normal((populacao,) + forma)
+        vencedor = jogar_lote(candidatos[grupo].astype(np.float32), populacao * partidas, dificuldade,
+                              politica_jogador, rng)
+        taxa = np.bincount(grupo, weights=vencedor == 2, minlength=populacao) / partidas
+        melhores = candidatos[np.argsort(taxa)[-n_elite:]]
+        media = melhores.mean(axis=0)
+        # piso no desvio (decrescente) para não convergir cedo demais
+        desvio = melhores.std(axis=0) + 0.5 * max(0.0, 1 - g / (0.7 * geracoes))
+        saida(f"geração {g + 1:3d}: melhor {100 * taxa.max():5.1f}%  média {100 * taxa.mean():5.1f}%")
+    return PoliticaLinear(media.tolist(), {"dificuldade": dificuldade, "geracoes": geracoes,
+                                           "populacao": populacao, "partidas": partidas, "semente": semente})
+
+
+def avaliar(pesos, partidas, dificuldade, politica_jogador, semente=0):
+    # Taxa de vitória do inimigo (pesos=None: IA embutida)
+    vencedor = jogar_lote(pesos, partidas, dificuldade, politica_jogador, np.random.default_rng(semente))
+    return float((vencedor == 2).mean())
+
+
+# ---------- Main ----------
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Ambiente vetorizado de aprendizado por reforço (inimigo).")
+    parser.add_argument("--partidas", type=int, default=4096, help="partidas em paralelo (--passos, avaliação)")
+    parser.add_argument("--dificuldade", default="Normal", choices=tuple(DIFICULDADES))
+    parser.add_argument("--jogador", default="gulosa", choices=tuple(POLITICAS_JOGADOR))
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--passos", type=int, help="mede passos/s com ações válidas ao acaso")
+    parser.add_argument("--treinar", action="store_true")
+    parser.add_argument("--geracoes", type=int, default=40)
+    parser.add_argument("--populacao", type=int, default=64)
+    parser.add_argument("--por-candidato", type=int, default=256, help="partidas por candidato em cada geração")
+    parser.add_argument("--saida", default=CAMINHO_PADRAO)
+    parser.add_argument("--avaliar", metavar="CAMINHO", help="avalia uma política salva")
+    args = parser.parse_args(argv)
+    politica_jogador = POLITICAS_JOGADOR[args.jogador]
+
+    if args.passos:
+        amb = AmbienteBatalhas(args.partidas, args.dificuldade, args.semente, politica_jogador)
+        _, info = amb.reset()
+        rng = np.random.default_rng(args.semente)
+        episodios = 0
+        inicio = time.perf_counter()
+        for _ in range(args.passos):
+            sorteio = rng.random((args.partidas, amb.n_acoes))
+            sorteio[~info["mascara"]] = -1
+            _, _, terminado, truncado, info = amb.step(sorteio.argmax(axis=1))
+            episodios += int(terminado.sum() + truncado.sum())
+        duracao = time.perf_counter() - inicio
+        total = args.passos * args.partidas
+        print(f"{total:,} passos em {duracao:.2f}s ({total / max(duracao, 1e-9):,.0f} passos/s), "
+              f"{episodios:,} partidas terminadas")
+        return
+
+    if args.treinar:
+        inicio = time.perf_counter()
+        politica = treinar(args.geracoes, args.populacao, args.por_candidato, args.dificuldade, politica_jogador,
+                           args.semente)
+        politica.info["jogador"] = args.jogador
+        politica.salvar(args.saida)
+        print(f"Treino em {time.perf_counter() - inicio:.1f}s; política salva em {args.saida}")
+        caminho = args.saida
+    elif args.avaliar:
+        caminho = args.avaliar
+    else:
+        parser.error("use --passos, --treinar ou --avaliar")
+
+    try:
+        pesos = np.array(PoliticaLinear.carregar(caminho).pesos, dtype=np.float32)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    treinada = avaliar(pesos, args.partidas, args.dificuldade, politica_jogador, args.semente + 1)
+    embutida = avaliar(None, args.partidas, args.dificuldade, politica_jogador, args.semente + 1)
+    print(f"Vitórias do inimigo contra a política {args.jogador} ({args.partidas:,} partidas, {args.dificuldade}): "
+          f"treinada {100 * treinada:.1f}% | IA embutida {100 * embutida:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
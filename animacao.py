@@ -0,0 +1,216 @@
+# Batalha dos Feiticeiros — Agendador de Animações
+# Um único root.after por quadro (taxa fixa) avança todas as animações:
+# - Animações são funções do tempo decorrido (não de contagem de quadros),
+#   então quadros atrasados não deixam nada para trás
+# - Escritas no canvas (coords/itemconfig) são acumuladas durante o quadro
+#   e aplicadas uma vez por item no fim dele
+# - Textos flutuantes e partículas vêm de um pool de itens pré-criados,
+#   escondidos quando livres (sem create/delete por golpe)
+# - escala multiplica todas as durações (anim_speed_ms / padrão)
+# - O tick só roda enquanto houver animação ativa
+# - medidor (opcional, instrumentacao.py) recebe o tempo de cada passo de
+#   animação, das escritas no canvas e o intervalo entre quadros
+
+import time
+
+FPS = 60
+VELOCIDADE_PADRAO_MS = 12  # anim_speed_ms que corresponde a escala 1.0
+
+
+class PoolItens:
+    """Itens de canvas reaproveitáveis; quando acabam, recicla o mais antigo."""
+
+    def __init__(self, canvas, criar, tamanho):
+        self.canvas = canvas
+        self.livres = [criar() for _ in range(tamanho)]
+        self.em_uso = []
+
+    def obter(self):
+        if self.livres:
+            item = self.livres.pop()
+        else:
+            item = self.em_uso.pop(0)
+        self.em_uso.append(item)
+        return item
+
+    def devolver(self, item):
+        if item in self.em_uso:
+            self.em_uso.remove(item)
+            self.livres.append(item)
+
+
+class AgendadorAnimacoes:
+    def __init__(self, root, canvas, fps=FPS, max_textos=8, max_particulas=4):
+        self.root = root
+        self.canvas = canvas
+        self.intervalo_ms = max(1, round(1000 / fps))
+        self.escala = 1.0
+        self.animacoes = {}  # chave -> (inicio, função(t_ms) -> bool, ao_terminar)
+        self._seq = 0
+        self._after = None
+        self._coords = {}
+        self._config = {}
+        self._base_coords = {}
+        self._base_cor = {}
+        self.quadros = 0  # contadores para perfilamento
+        self.escritas = 0
+        self.medidor = None  # instrumentacao.Instrumentacao, quando ligada
+        self._ultimo_tick = None  # início do quadro anterior da mesma sequência
+        self.textos = PoolItens(canvas, lambda: canvas.create_text(
+            -100, -100, text="", state="hidden", font=("Segoe UI", 12, "bold")), max_textos)
+        self.particulas = PoolItens(canvas, lambda: canvas.create_oval(
+            -10, -10, -10, -10, fill="#ffffff", outline="", state="hidden"), max_particulas)
+
+    def registrar_sprite(self, item):
+        # posição e cor de repouso: tremor/piscada sempre voltam a elas
+        self._base_coords[item] = tuple(self.canvas.coords(item))
+        self._base_cor[item] = self.canvas.itemcget(item, "fill")
+
+    def definir_velocidade(self, anim_speed_ms):
+        self.escala = anim_speed_ms / VELOCIDADE_PADRAO_MS
+
+    # ---------- Escritas acumuladas ----------
+    def coords(self, item, *c):
+        self._coords[item] = c
+
+    def config(self, item, **opcoes):
+        self._config.setdefault(item, {}).update(opcoes)
+
+    def _aplicar(self):
+        canvas = self.canvas
+        for item, c in self._coords.items():
+            canvas.coords(item, *c)
+        for item, opcoes in self._config.items():
+            canvas.itemconfigure(item, **opcoes)
+        self.escritas += len(self._coords) + len(self._config)
+        self._coords.clear()
+        self._config.clear()
+
+    # ---------- Laço ----------
+    def adicionar(self, funcao, chave=None, ao_terminar=None):
+        """
+        funcao(t_ms) é chamada a cada quadro com o tempo decorrido (já
+        dividido pela escala) e devolve False quando acabou. Uma chave
+        repetida substitui a animação anterior (ex.: tremor no mesmo alvo).
+        """
+        if chave is None:
+            self._seq += 1
+            chave = ("anim", self._seq)
+        anterior = self.animacoes.pop(chave, None)
+        if anterior and anterior[2]:
+            anterior[2]()
+        self.animacoes[chave] = (time.perf_counter(), funcao, ao_terminar)
+        if self._after is None:
+            self._after = self.root.after(0, self._tick)
+
+    def _tick(self):
+        agora = time.perf_counter()
+        escala = self.escala or 1.0
+        medidor = self.medidor
+        terminadas = []
+        for chave, (inicio, funcao, _) in list(self.animacoes.items()):
+            if medidor is None:
+                viva = funcao((agora - inicio) * 1000 / escala)
+            else:
+                t = time.perf_counter()
+                viva = funcao((agora - inicio) * 1000 / escala)
+                medidor.registrar("anim." + chave[0], time.perf_counter() - t)
+            if not viva:
+                terminadas.append(chave)
+        for chave in terminadas:
+            _, _, ao_terminar = self.animacoes.pop(chave)
+            if ao_terminar:
+                ao_terminar()
+        if medidor is None:
+            self._aplicar()
+        else:
+            t = time.perf_counter()
+            self._aplicar()
+            fim = time.perf_counter()
+            medidor.registrar("anim.canvas", fim - t)
+            medidor.registrar("anim.quadro", fim - agora)
+            if self._ultimo_tick is not None:
+                medidor.registrar("quadro", agora - self._ultimo_tick)
+        self.quadros += 1
+        if self.animacoes:
+            self._ultimo_tick = agora
+            self._after = self.root.after(self.intervalo_ms, self._tick)
+        else:
+            self._ultimo_tick = None
+            self._after = None
+
+    def cancelar_tudo(self):
+        if self._after is not None:
+            self.root.after_cancel(self._after)
+            self._after = None
+        self._ultimo_tick = None
+        for _, _, ao_terminar in self.animacoes.values():
+            if ao_terminar:
+                ao_terminar()
+        self.animacoes.clear()
+        self._aplicar()
+
+    # ---------- Animações ----------
+    def tiro(self, origem_x, origem_y, destino_x, destino_y, duracao_ms=240):
+        item = self.particulas.obter()
+        self.animacoes.pop(("tiro", item), None)
+        self.config(item, state="normal")
+
+        def passo(t):
+            f = min(1.0, t / duracao_ms)
+            x = origem_x + (destino_x - origem_x) * f
+            y = origem_y + (destino_y - origem_y) * f
+            self.coords(item, x - 6, y - 6, x + 6, y + 6)
+            return f < 1.0
+
+        def fim():
+            self.config(item, state="hidden")
+            self.particulas.devolver(item)
+
+        self.adicionar(passo, chave=("tiro", item), ao_terminar=fim)
+
+    def texto(self, x, y, texto, cor, subida=38, duracao_ms=570):
+        item = self.textos.obter()
+        # item reciclado do pool: a animação antiga dele é descartada sem finalizar
+        self.animacoes.pop(("texto", item), None)
+        self.config(item, text=texto, fill=cor, state="normal")
+
+        def passo(t):
+            f = min(1.0, t / duracao_ms)
+            self.coords(item, x, y - subida * f)
+            return f < 1.0
+
+        def fim():
+            self.config(item, state="hidden")
+            self.textos.devolver(item)
+
+        self.adicionar(passo, chave=("texto", item), ao_terminar=fim)
+
+    def piscar(self, item, cor_temp="#ffffff", vezes=3, meio_ciclo_ms=60):
+        base = self._base_cor.get(item) or self.canvas.itemcget(item, "fill")
+
+        def passo(t):
+            ciclo = int(t // meio_ciclo_ms)
+            if ciclo >= 2 * vezes:
+                return False
+            self.config(item, fill=cor_temp if ciclo % 2 == 0 else base)
+            return True
+
+        self.adicionar(passo, chave=("piscar", item), ao_terminar=lambda: self.config(item, fill=base))
+
+    def tremer(self, item, distancia=6, vezes=6, meio_ciclo_ms=25):
+        base = self._base_coords.get(item) or tuple(self.canvas.coords(item))
+
+        def deslocar(dx):
+            self.coords(item, *[c + dx if k % 2 == 0 else c for k, c in enumerate(base)])
+
+        def passo(t):
+            ciclo = int(t // meio_ciclo_ms)
+            if ciclo >= 2 * vezes:
+                return False
+            # ida (alternando o lado) e volta ao centro
+            lado = 1 if (ciclo // 2) % 2 == 0 else -1
+            deslocar(distancia * lado if ciclo % 2 == 0 else 0)
+            return True
+
+        self.adicionar(passo, chave=("tremer", item), ao_terminar=lambda: deslocar(0))
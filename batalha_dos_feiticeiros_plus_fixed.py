@@ -5,40 +5,50 @@
 # - Tooltip ipady corrigido
 # - Contador de turnos consistente
 # - Pequenos polimentos de UI/UX e atalhos
+# - Regras de combate no motor sem interface (motor_batalha.py)
+# - Log limitado e escrito em lote por quadro (registro_combate.py)
+# - Barras e rótulos só mudam quando o valor muda (estado_observavel.py)
+# - Som resolvido uma vez e tocado fora da thread da interface (som.py)
+# - Botões, atalhos e tooltips dos feitiços vêm do registro (feiticos.json)
+# - Toda partida pode ser salva e assistida de novo como replay (replay.py)
+# - Salvar/carregar a batalha e autosave a cada turno, gravado numa thread
+#   (salvamento.py); ao abrir, oferece continuar a batalha interrompida
+# - Partidas terminadas vão para a base de estatísticas (estatisticas.py)
+# - Atalhos ignoram a repetição automática do teclado e, na vez do inimigo,
+#   guardam uma única ação pendente, jogada assim que ele terminar
+# - Medição opcional de handlers, quadros e laço de eventos, com painel
+#   sobre a arena (F3) e perfil em disco (instrumentacao.py)
+# - Jogar Online: a janela vira só a frente de uma partida que roda no
+#   servidor_partidas.py (regras e RNG lá; aqui só eventos e estado)
+# - Modo Progressão: seu feiticeiro ganha experiência a cada partida e sobe
+#   de nível; magia e nível escalam dano e custo dos feitiços dos dois
+#   lados (progressao.py), e os botões mostram os números do nível
 #
 # Execução:
 #   python batalha_dos_feiticeiros_plus_fixed.py
 
-import random
+import os
+import sqlite3
+import time
 import tkinter as tk
-from tkinter import ttk, messagebox
-
-# ---------- Utilidades de Som (opcionais) ----------
-def _beep_ok(enabled=True):
-    if not enabled:
-        return
-    try:
-        import winsound
-        winsound.Beep(880, 100)
-    except Exception:
-        try:
-            root = tk._default_root
-            if root: root.bell()
-        except Exception:
-            pass
-
-def _beep_fail(enabled=True):
-    if not enabled:
-        return
-    try:
-        import winsound
-        winsound.Beep(220, 140)
-    except Exception:
-        try:
-            root = tk._default_root
-            if root: root.bell()
-        except Exception:
-            pass
+from collections import deque
+from tkinter import ttk, messagebox, filedialog, simpledialog
+
+import replay
+import salvamento
+from animacao import VELOCIDADE_PADRAO_MS, AgendadorAnimacoes
+from cliente_partidas import ClientePartidas, EspelhoMotor
+from estado_observavel import EstadoObservavel
+from estatisticas import Estatisticas
+from instrumentacao import Instrumentacao, PainelDesempenho
+from motor_batalha import DIFICULDADES, DIFICULDADES_IA_EMBUTIDA, FEITICOS, REGISTRO, MotorBatalha
+from oponente_mcts import OponenteMCTS
+from politica_treinada import OponentePolitica
+from progressao import TABELA_BASE, Feiticeiro
+from registro_combate import LogTk
+from servidor_partidas import HOST, PORTA, VEZ
+from solucionador import TabelaSolucao, caminho_tabela
+from som import Som, resolver_backend
 
 # ---------- Tooltip simples ----------
 class Tooltip:
@@ -68,6 +78,11 @@ class Tooltip:
             self.tipwindow.destroy()
             self.tipwindow = None
 
+# Handlers medidos pela instrumentação (métodos da instância)
+HANDLERS_MEDIDOS = ("turno_jogador", "turno_inimigo", "defender", "usar_pocao",
+                    "_processar_eventos", "_atualizar_barras", "_log")
+
+
 # ---------- App ----------
 class BatalhaFeiticeirosApp:
     def __init__(self, root):
@@ -103,38 +118,88 @@ class BatalhaFeiticeirosApp:
 
         # Opções / Estado
         self.sound_enabled = True
-        self.anim_speed_ms = 12  # menor = mais rápido
+        self.som = Som(resolver_backend(self.root))  # backend escolhido uma única vez
+        self.anim_speed_ms = VELOCIDADE_PADRAO_MS  # menor = mais rápido (escala global das animações)
         self.dificuldade = "Normal"  # padrão
         self.var_dificuldade = tk.StringVar(value=self.dificuldade)  # variável única
+        self.motor = MotorBatalha(self.dificuldade)  # regras sem interface
+        self.dica_ativa = False
+        self._tabelas = {}  # dificuldade -> TabelaSolucao (mmap)
+        self.mcts_orcamento_ms = 400  # tempo de busca do "Especialista" por turno
+        self.oponente = None  # OponenteMCTS / OponentePolitica quando a dificuldade pede
+        self._avisou_politica = False  # sem política treinada: a janela de aviso sai uma vez por sessão
+        self.feiticeiro = None  # progressao.Feiticeiro com o Modo Progressão ligado
+        self._jogada_inimigo = None  # Future da busca em andamento
+        self._inimigo_after = None  # turno do inimigo agendado (root.after)
+        self._acao_pendente = None  # ação pedida durante o turno do inimigo
+        self._teclas_presas = set()  # keysyms com KeyPress sem KeyRelease
+        self._ultima_soltura = None  # (keysym, time) do último KeyRelease
+        self.replay = None  # replay.Replay em exibição
+        self._replay_after = None
+        self.autosave = salvamento.AutoSalvamento()  # grava fora da thread da interface
+        try:
+            self.estatisticas = Estatisticas()
+        except (sqlite3.Error, OSError):
+            self.estatisticas = None  # sem base (pasta sem escrita, arquivo travado): o jogo segue
+        self.remoto = None  # ClientePartidas quando jogando online
+        self._lado_remoto = None  # "player"/"enemy" na partida do servidor
+        self._remoto_fila = deque()  # mensagens recebidas ainda não mostradas
+        self._remoto_pausa = 0.0  # jogada do adversário só aparece depois disto
+        self._remoto_enviada = False  # ação enviada, resposta ainda não chegou
+        self._remoto_after = None
+        self._endereco_online = f"{HOST}:{PORTA}"
+        self.instrumentacao = None  # criada no primeiro uso (F3 ou BATALHA_PERFIL)
+        self.painel_desempenho = None
 
         # Monta UI
         self._build_menu()
         self._build_ui()
         self._novo_jogo(first=True)
+        self._oferecer_continuar()
+        if os.environ.get("BATALHA_PERFIL"):
+            self._toggle_desempenho()
 
         # Atalhos
-        self.root.bind("f", lambda e: self.turno_jogador("fogo"))
-        self.root.bind("c", lambda e: self.turno_jogador("raio"))
-        self.root.bind("m", lambda e: self.turno_jogador("meteoros"))
-        self.root.bind("p", lambda e: self.usar_pocao())
-        self.root.bind("d", lambda e: self.defender())
+        for f in REGISTRO:
+            if f.tecla:
+                self.root.bind(f.tecla, lambda e, t=f.id: self._tecla(e, t))
+        self.root.bind("p", lambda e: self._tecla(e, "pocao"))
+        self.root.bind("d", lambda e: self._tecla(e, "defender"))
+        self.root.bind("<KeyRelease>", self._soltar_tecla)
+        self.root.bind("<FocusOut>", lambda e: self._teclas_presas.clear())
         self.root.bind("<Control-n>", lambda e: self._novo_jogo())
-        self.root.bind("<Escape>", lambda e: self.root.destroy())
+        self.root.bind("<Control-s>", lambda e: self._salvar_partida())
+        self.root.bind("<Control-o>", lambda e: self._carregar_partida())
+        self.root.bind("<Escape>", lambda e: self._sair())
+        self.root.bind("<F3>", lambda e: self._toggle_desempenho())
+        self.root.protocol("WM_DELETE_WINDOW", self._sair)
 
     # ---------- Menu ----------
     def _build_menu(self):
         menubar = tk.Menu(self.root)
         jogo = tk.Menu(menubar, tearoff=0)
         jogo.add_command(label="Novo Jogo (Ctrl+N)", command=self._novo_jogo)
+        jogo.add_command(label="Salvar Partida... (Ctrl+S)", command=self._salvar_partida)
+        jogo.add_command(label="Carregar Partida... (Ctrl+O)", command=self._carregar_partida)
+        if self.remoto is None:
+            jogo.add_command(label="Jogar Online...", command=self._jogar_online)
+        else:
+            jogo.add_command(label="Sair da Partida Online", command=self._novo_jogo)
+        jogo.add_command(label="Exportar Log...", command=self._exportar_log)
+        jogo.add_command(label="Estatísticas...", command=self._mostrar_estatisticas)
+        jogo.add_separator()
+        jogo.add_command(label="Salvar Replay...", command=self._salvar_replay)
+        jogo.add_command(label="Assistir Replay...", command=self._abrir_replay)
+        jogo.add_command(label="Ir para Turno do Replay...", command=self._ir_para_turno)
         jogo.add_separator()
-        jogo.add_command(label="Sair (Esc)", command=self.root.destroy)
+        jogo.add_command(label="Sair (Esc)", command=self._sair)
         menubar.add_cascade(label="Jogo", menu=jogo)
 
         op = tk.Menu(menubar, tearoff=0)
 
         # Dificuldade com uma única StringVar
         dif = tk.Menu(op, tearoff=0)
-        for d in ("Fácil", "Normal", "Difícil"):
+        for d in DIFICULDADES:
             dif.add_radiobutton(
                 label=d,
                 value=d,
@@ -152,6 +217,19 @@ class BatalhaFeiticeirosApp:
 
         som_label = "Desativar Som" if self.sound_enabled else "Ativar Som"
         op.add_command(label=som_label, command=self._toggle_sound)
+        if self.feiticeiro is None:
+            op.add_command(label="Ativar Modo Progressão", command=self._toggle_progressao)
+        else:
+            op.add_command(label=f"Desativar Modo Progressão (nível {self.feiticeiro.nivel})",
+                           command=self._toggle_progressao)
+        dica_label = "Ocultar Dica de Jogada" if self.dica_ativa else "Mostrar Dica de Jogada"
+        op.add_command(label=dica_label, command=self._toggle_dica)
+        painel_visivel = self.painel_desempenho is not None and self.painel_desempenho.visivel
+        op.add_command(label="Ocultar Desempenho (F3)" if painel_visivel else "Mostrar Desempenho (F3)",
+                       command=self._toggle_desempenho)
+        gravando = self.instrumentacao is not None and self.instrumentacao.gravando
+        op.add_command(label="Parar e Salvar Perfil" if gravando else "Gravar Perfil",
+                       command=self._toggle_perfil)
         menubar.add_cascade(label="Opções", menu=op)
 
         ajuda = tk.Menu(menubar, tearoff=0)
@@ -165,31 +243,124 @@ class BatalhaFeiticeirosApp:
 
         self.root.config(menu=menubar)
 
+    def _beep(self, nome):
+        if self.sound_enabled:
+            self.som.tocar(nome)
+
     def _toggle_sound(self):
         self.sound_enabled = not self.sound_enabled
-        _beep_ok(self.sound_enabled)
+        self._beep("ok")
         # atualiza rótulo do menu reconstruindo-o
         self._build_menu()
 
+    def _toggle_dica(self):
+        self.dica_ativa = not self.dica_ativa
+        if self.dica_ativa and self._tabela_dica() is None:
+            self.dica_ativa = False
+            if self.dificuldade not in DIFICULDADES_IA_EMBUTIDA:
+                # o solucionador só modela a IA embutida (não o MCTS nem a política treinada)
+                messagebox.showinfo("Dica de Jogada", f"Dica indisponível nesta dificuldade ({self.dificuldade}).")
+            else:
+                messagebox.showinfo(
+                    "Dica de Jogada",
+                    f"Tabela de jogo ótimo para {self.dificuldade} não encontrada.\n"
+                    f"Gere com:\n  python solucionador.py --dificuldade {self.dificuldade}"
+                )
+        self._build_menu()
+        self._atualizar_dica()
+
+    def _toggle_progressao(self):
+        if self.feiticeiro is not None:
+            self.feiticeiro = None
+        else:
+            try:
+                self.feiticeiro = Feiticeiro.carregar()
+            except OSError:
+                self.feiticeiro = Feiticeiro("Você")  # primeira vez: nível 1
+            except ValueError as e:
+                messagebox.showwarning("Modo Progressão", f"Feiticeiro salvo inválido ({e}).")
+                return
+        self._build_menu()
+        f = self.feiticeiro
+        estado = "desativado" if f is None else f"ativado: nível {f.nivel}, magia {f.magia}"
+        messagebox.showinfo("Modo Progressão", f"Modo Progressão {estado}.\nEntrará em vigor em um novo jogo.")
+        self._beep("ok")
+
+    def _progresso_partida(self):
+        # Fim de partida local do Modo Progressão: experiência e nível
+        f = self.feiticeiro
+        m = self.motor
+        if f is None or self.replay is not None or self.remoto is not None or m.feiticeiro_jogador != f.par:
+            return
+        pontos = f.experiencia_da_partida(m)
+        subiu = f.ganhar_experiencia(pontos)
+        try:
+            f.salvar()
+        except OSError as e:
+            self._log(f"⚠️ Progresso não gravado: {e}")
+        if subiu:
+            self._log(f"⭐ +{pontos} de experiência — você subiu para o nível {f.nivel} (magia {f.magia})!")
+            self._build_menu()
+        else:
+            self._log(f"⭐ +{pontos} de experiência ({f.falta_para_subir()} para o nível {f.nivel + 1}).")
+
+    def _atualizar_botoes_feiticos(self):
+        # dano e custo do nível do seu feiticeiro (progressao.TabelaNivel)
+        t = self.motor.tabela_jogador
+        for f in REGISTRO:
+            self.btn_feiticos[f.id].config(
+                text=REGISTRO.texto_botao(f._replace(dano=t.dano[f.indice], mana=t.mana[f.indice])))
+
+    def _tabela_dica(self):
+        if self.dificuldade not in DIFICULDADES_IA_EMBUTIDA:
+            return None
+        if self.dificuldade not in self._tabelas:
+            try:
+                self._tabelas[self.dificuldade] = TabelaSolucao(caminho_tabela(self.dificuldade))
+            except (OSError, ValueError):
+                return None
+        return self._tabelas[self.dificuldade]
+
+    def _atualizar_dica(self):
+        m = self.motor
+        tabela = self._tabela_dica() if self.dica_ativa else None
+        if tabela is None or m.fase != "jogador" or self.remoto is not None:
+            self.lbl_dica.config(text="")
+            return
+        if m.tabela_jogador is not TABELA_BASE or m.tabela_inimigo is not TABELA_BASE:
+            # a tabela do solucionador é do nível base
+            self.lbl_dica.config(text="💡 Sem dica fora do nível base (Modo Progressão).")
+            return
+        acao, chance = tabela.consultar(m)
+        if acao is None:
+            self.lbl_dica.config(text="💡 Você perderá esta vez — qualquer ação serve.")
+            return
+        nome = FEITICOS[acao].nome if acao in FEITICOS else {"defender": "Defender", "pocao": "Poção de Cura"}[acao]
+        self.lbl_dica.config(text=f"💡 Melhor jogada: {nome} (vitória estimada {100 * chance:.0f}%)")
+
     def _set_anim_speed(self, ms):
         self.anim_speed_ms = ms
+        self.anim.definir_velocidade(ms)
 
     def _set_dificuldade(self, d):
         self.var_dificuldade.set(d)
         self.dificuldade = d
         messagebox.showinfo("Dificuldade", f"Dificuldade definida como: {d}\nEntrará em vigor em um novo jogo.")
-        _beep_ok(self.sound_enabled)
+        self._beep("ok")
 
     def _mostrar_ajuda(self):
+        teclas = " | ".join(f"{f.tecla.upper()} = {f.nome}" for f in REGISTRO if f.tecla)
+        forte = max(REGISTRO, key=lambda f: f.dano)
+        dicas = "".join(f"- {f.rotulo}: {REGISTRO.texto_dica(f)}\n" for f in REGISTRO if f.descricao)
         msg = (
             "Atalhos:\n"
-            "F = Bola de Fogo | C = Raio Congelante | M = Chuva de Meteoros\n"
+            f"{teclas}\n"
             "P = Poção de Cura | D = Defender | Ctrl+N = Novo Jogo | Esc = Sair\n\n"
             "Dicas:\n"
-            "- Meteoros causa muito dano, mas tem menos precisão e custa mais mana.\n"
+            f"- {forte.rotulo} causa o maior dano ({forte.dano}), com {forte.chance}% de acerto "
+            f"e {forte.mana} de mana.\n"
+            f"{dicas}"
             "- Defender reduz o próximo dano recebido e pode salvar sua rodada.\n"
-            "- Raio pode Congelar (chance) e fazer o inimigo perder a vez.\n"
-            "- Fogo pode aplicar Queimadura (dano por turno).\n"
             "- Use as poções com sabedoria — elas passam a vez."
         )
         messagebox.showinfo("Atalhos e Dicas", msg)
@@ -242,6 +413,21 @@ class BatalhaFeiticeirosApp:
         self.lbl_enemy_mana = ttk.Label(enemy_frame, text="Mana: 100/100", style="Small.TLabel")
         self.lbl_enemy_mana.pack(anchor="w", padx=6, pady=(0,6))
 
+        # Cada widget de status fica ligado só ao campo que mostra
+        def clamp(v): return max(0, min(100, v))
+        def barra(pb): return lambda v: pb.configure(value=clamp(v))
+        def rotulo(lbl, fmt): return lambda v: lbl.config(text=fmt.format(v))
+        self.estado = EstadoObservavel(self.root)
+        self.estado.ligar("vida_jogador", barra(self.pb_player))
+        self.estado.ligar("vida_jogador", rotulo(self.lbl_player_hp, "Vida: {}/100"))
+        self.estado.ligar("vida_inimigo", barra(self.pb_enemy))
+        self.estado.ligar("vida_inimigo", rotulo(self.lbl_enemy_hp, "Vida: {}/100"))
+        self.estado.ligar("mana_jogador", barra(self.pb_player_mana))
+        self.estado.ligar("mana_jogador", rotulo(self.lbl_player_mana, "Mana: {}/100"))
+        self.estado.ligar("mana_inimigo", barra(self.pb_enemy_mana))
+        self.estado.ligar("mana_inimigo", rotulo(self.lbl_enemy_mana, "Mana: {}/100"))
+        self.estado.ligar("pocoes", rotulo(self.lbl_pocoes, "Poções: {}"))
+
         # Arena
         arena = tk.Frame(self.root, bg=self.bg)
         arena.pack(fill="x", padx=16)
@@ -249,28 +435,39 @@ class BatalhaFeiticeirosApp:
         self.canvas.pack(fill="x")
         self.sprite_player = self.canvas.create_rectangle(80, 60, 130, 120, fill="#6C7CFF", outline="")
         self.sprite_enemy  = self.canvas.create_rectangle(720, 60, 770, 120, fill="#FF6C93", outline="")
-        self.particle = self.canvas.create_oval(-10, -10, -10, -10, fill="#ffffff", outline="")
-        self.float_texts = []
+        self.anim = AgendadorAnimacoes(self.root, self.canvas)
+        self.anim.definir_velocidade(self.anim_speed_ms)
+        self.anim.registrar_sprite(self.sprite_player)
+        self.anim.registrar_sprite(self.sprite_enemy)
+        self._alvos = {"player": (105, self.sprite_player), "enemy": (745, self.sprite_enemy)}
 
         # Botões
         actions = tk.Frame(self.root, bg=self.bg)
         actions.pack(fill="x", padx=16, pady=10)
 
-        self.btn_fogo = ttk.Button(actions, text="🔥 Fogo\n(30 dano, 60% acerto, 25 mana)", command=lambda: self.turno_jogador("fogo"))
-        self.btn_raio = ttk.Button(actions, text="❄️ Raio\n(20 dano, 80% acerto, 20 mana)", command=lambda: self.turno_jogador("raio"))
-        self.btn_meteoros = ttk.Button(actions, text="☄️ Meteoros\n(50 dano, 30% acerto, 40 mana)", command=lambda: self.turno_jogador("meteoros"))
-        self.btn_defender = ttk.Button(actions, text="🛡️ Defender\n(-50% próximo dano)", command=self.defender)
-        self.btn_pocao = ttk.Button(actions, text="🧪 Poção de Cura\n(+25 vida)", command=self.usar_pocao)
-
-        for b in (self.btn_fogo, self.btn_raio, self.btn_meteoros, self.btn_defender, self.btn_pocao):
+        # Um botão por feitiço do registro, na ordem do arquivo de dados
+        self.btn_feiticos = {}
+        for f in REGISTRO:
+            self.btn_feiticos[f.id] = ttk.Button(actions, text=REGISTRO.texto_botao(f),
+                                                 command=lambda t=f.id: self.turno_jogador(t))
+        # lambdas (e não o método) para que a instrumentação possa envolvê-los
+        self.btn_defender = ttk.Button(actions, text="🛡️ Defender\n(-50% próximo dano)",
+                                       command=lambda: self.defender())
+        self.btn_pocao = ttk.Button(actions, text="🧪 Poção de Cura\n(+25 vida)", command=lambda: self.usar_pocao())
+
+        self.botoes_acao = (*self.btn_feiticos.values(), self.btn_defender, self.btn_pocao)
+        for b in self.botoes_acao:
             b.pack(side="left", expand=True, fill="x", padx=6)
 
-        Tooltip(self.btn_fogo, "Chance de aplicar Queimadura (5 de dano por 2 turnos).")
-        Tooltip(self.btn_raio, "Pode Congelar (alvo perde a próxima ação, 30% de chance).")
-        Tooltip(self.btn_meteoros, "Pequena chance de Atordoar (20%). Muito dano.")
+        for f in REGISTRO:
+            if f.descricao:
+                Tooltip(self.btn_feiticos[f.id], REGISTRO.texto_dica(f))
         Tooltip(self.btn_defender, "Reduz pela metade o próximo dano que você receber.")
         Tooltip(self.btn_pocao, "Cura 25 de vida. Usa o turno.")
 
+        self.lbl_dica = ttk.Label(self.root, text="", style="Small.TLabel")
+        self.lbl_dica.pack(anchor="w", padx=22)
+
         # Log
         log_frame = tk.Frame(self.root, bg=self.bg)
         log_frame.pack(fill="both", expand=True, padx=16, pady=(4, 12))
@@ -282,6 +479,7 @@ class BatalhaFeiticeirosApp:
         scrollbar = ttk.Scrollbar(log_frame, command=self.txt_log.yview)
         scrollbar.pack(side="right", fill="y")
         self.txt_log.config(yscrollcommand=scrollbar.set)
+        self.log = LogTk(self.root, self.txt_log)
 
         footer = tk.Frame(self.root, bg=self.bg)
         footer.pack(fill="x", padx=16, pady=(0, 14))
@@ -290,401 +488,641 @@ class BatalhaFeiticeirosApp:
 
     # ---------- Mecânicas ----------
     def _novo_jogo(self, first=False):
+        self._desconectar()
+        self._parar_replay()
         # Dificuldade atual (ou "Normal" por padrão)
         self.dificuldade = self.var_dificuldade.get() or "Normal"
 
-        # Ajuste por dificuldade
-        if self.dificuldade == "Fácil":
-            hp = 110; mana = 110; enemy_hp = 90; enemy_acc_mod = -5
-        elif self.dificuldade == "Difícil":
-            hp = 90; mana = 100; enemy_hp = 120; enemy_acc_mod = +8
-        else:  # Normal
-            hp = 100; mana = 100; enemy_hp = 100; enemy_acc_mod = 0
-        self.enemy_acc_mod = enemy_acc_mod
-
-        self.vida_jogador = hp
-        self.vida_inimigo = enemy_hp
-        self.mana_jogador = mana
-        self.mana_inimigo = 100
-        self.pocoes = 3
-        self.defesa_ativa = False
-        self.defesa_inimigo = False
-        self.status_player = {"queimadura": 0, "congelado": 0, "atordoado": 0}
-        self.status_enemy = {"queimadura": 0, "congelado": 0, "atordoado": 0}
-        self.turnos = 0
-        self.acertos_player = 0
-        self.acertos_enemy = 0
-        self.game_over = False
+        # Regras e ajuste por dificuldade ficam no motor (motor_batalha.py)
+        f = self.feiticeiro
+        if f is None:
+            self.motor.novo_jogo(self.dificuldade)
+        else:
+            self.motor.novo_jogo(self.dificuldade, None, f.par, f.oponente())
+        self._atualizar_botoes_feiticos()
+        self.anim.cancelar_tudo()
+        self._cancelar_inimigo()
+        self._preparar_oponente()
 
         self._atualizar_barras()
         self._set_botoes_state("normal")
         self._log_limpar()
         if not first:
-            _beep_ok(self.sound_enabled)
+            self._beep("ok")
+            self._autosalvar()
         self._log(f"🧙‍♂️ Nova batalha começando em {self.dificuldade}!")
+        if f is not None:
+            self._log(f"⭐ {f.nome}: nível {f.nivel}, magia {f.magia} (poder {f.poder}); "
+                      f"o inimigo também está no nível {f.nivel}.")
+        if DIFICULDADES[self.dificuldade].get("ia") and self.oponente is None:
+            self._log(f"⚠️ Oponente de {self.dificuldade} indisponível: o inimigo usa a IA padrão.")
         self._log("Dica: Use DEFENDER para sobreviver a turnos críticos e gerencie sua MANA.")
         self._atualizar_textos()
+        self._atualizar_dica()
+
+    def _preparar_oponente(self):
+        classe = {"mcts": OponenteMCTS, "politica": OponentePolitica}.get(DIFICULDADES[self.dificuldade].get("ia"))
+        if self.oponente is not None and type(self.oponente) is not classe:
+            self.oponente.encerrar()
+            self.oponente = None
+        if classe is None:
+            return
+        if self.oponente is None:
+            if classe is OponenteMCTS:
+                self.oponente = OponenteMCTS(self.mcts_orcamento_ms)
+            else:
+                try:
+                    self.oponente = OponentePolitica.carregar()
+                except (OSError, ValueError) as e:
+                    if not self._avisou_politica:
+                        self._avisou_politica = True
+                        messagebox.showwarning("Política treinada", f"Não foi possível carregar a política ({e}).\n"
+                                               "O inimigo usará a IA padrão. Treine com: python ambiente_rl.py --treinar")
+                    return
+        self.oponente.reiniciar()
 
     def _atualizar_barras(self):
-        def clamp(v): return max(0, min(100, v))
-        self.pb_player["value"] = clamp(self.vida_jogador)
-        self.pb_enemy["value"] = clamp(self.vida_inimigo)
-        self.lbl_player_hp.config(text=f"Vida: {self.vida_jogador}/100")
-        self.lbl_enemy_hp.config(text=f"Vida: {self.vida_inimigo}/100")
-        self.pb_player_mana["value"] = clamp(self.mana_jogador)
-        self.pb_enemy_mana["value"] = clamp(self.mana_inimigo)
-        self.lbl_player_mana.config(text=f"Mana: {self.mana_jogador}/100")
-        self.lbl_enemy_mana.config(text=f"Mana: {self.mana_inimigo}/100")
-        self.lbl_pocoes.config(text=f"Poções: {self.pocoes}")
+        # Publica o estado do motor; só os widgets dos campos que mudaram
+        # são atualizados, uma vez por volta do laço de eventos
+        self.estado.sincronizar(self.motor)
 
     def _log(self, texto):
-        self.txt_log.insert("end", texto + "\n")
-        self.txt_log.see("end")
+        self.log.adicionar(texto)
 
     def _log_limpar(self):
-        self.txt_log.delete("1.0", "end")
+        self.log.limpar()
 
-    def _set_botoes_state(self, state):
-        for b in (self.btn_fogo, self.btn_raio, self.btn_meteoros, self.btn_defender, self.btn_pocao):
-            b.config(state=state)
-
-    def _atualizar_textos(self):  # reservado para futuras labels dinâmicas
-        pass
+    def _exportar_log(self):
+        caminho = filedialog.asksaveasfilename(
+            title="Exportar Log", defaultextension=".txt",
+            filetypes=[("Texto", "*.txt"), ("Todos", "*.*")])
+        if not caminho:
+            return
+        futuro = self.log.registro.exportar(caminho)
 
-    # Dados de mágicas e custos
-    def _dados_feitico(self, tipo):
-        if tipo == "fogo":
-            return {"nome": "Bola de Fogo", "dano": 30, "chance": 60, "emoji": "🔥", "mana": 25, "status": "queimadura", "status_chance": 40}
-        if tipo == "raio":
-            return {"nome": "Raio Congelante", "dano": 20, "chance": 80, "emoji": "❄️", "mana": 20, "status": "congelado", "status_chance": 30}
-        if tipo == "meteoros":
-            return {"nome": "Chuva de Meteoros", "dano": 50, "chance": 30, "emoji": "☄️", "mana": 40, "status": "atordoado", "status_chance": 20}
-        return {"nome": "Feitiço", "dano": 0, "chance": 0, "emoji": "✨", "mana": 0, "status": None, "status_chance": 0}
+        def verificar():
+            if not futuro.done():
+                self.root.after(100, verificar)
+                return
+            erro = futuro.exception()
+            if erro:
+                messagebox.showerror("Exportar Log", f"Falha ao exportar:\n{erro}")
+            else:
+                self._log(f"📄 Log exportado ({futuro.result()} linhas): {caminho}")
 
-    # ---------- Animações ----------
-    def _animar_tiro(self, origem_x, origem_y, destino_x, destino_y, steps=20):
-        self.canvas.coords(self.particle, origem_x-6, origem_y-6, origem_x+6, origem_y+6)
-        dx = (destino_x - origem_x) / steps
-        dy = (destino_y - origem_y) / steps
+        self.root.after(100, verificar)
 
-        def step(i=0):
-            if i > steps:
-                self.canvas.coords(self.particle, -10, -10, -10, -10)
-                return
-            self.canvas.move(self.particle, dx, dy)
-            self.root.after(self.anim_speed_ms, lambda: step(i+1))
+    # ---------- Salvamento ----------
+    def _autosalvar(self):
+        # Fim de cada turno: serializa aqui (microssegundos); o disco fica com a thread
+        if self.replay is None and self.remoto is None:
+            self.autosave.agendar(self.motor)
 
-        step()
+    def _salvar_partida(self):
+        if self.remoto is not None:
+            messagebox.showinfo("Salvar Partida", "A partida online fica no servidor.")
+            return
+        caminho = filedialog.asksaveasfilename(
+            title="Salvar Partida", defaultextension=".bfs",
+            filetypes=[("Batalha salva", "*.bfs"), ("Todos", "*.*")])
+        if not caminho:
+            return
+        try:
+            salvamento.salvar(caminho, self.motor)
+        except OSError as e:
+            messagebox.showerror("Salvar Partida", f"Falha ao salvar:\n{e}")
+            return
+        self._log(f"💾 Partida salva: {caminho}")
 
-    def _flash_sprite(self, target, color_temp="#ffffff"):
-        color = self.canvas.itemcget(target, "fill")
-        def seq(times=3):
-            if times == 0:
-                self.canvas.itemconfig(target, fill=color)
-                return
-            self.canvas.itemconfig(target, fill=color_temp)
-            self.root.after(60, lambda: (self.canvas.itemconfig(target, fill=color),
-                                         self.root.after(60, lambda: seq(times-1))))
-        seq()
+    def _carregar_partida(self):
+        caminho = filedialog.askopenfilename(
+            title="Carregar Partida", filetypes=[("Batalha salva", "*.bfs"), ("Todos", "*.*")])
+        if not caminho:
+            return
+        try:
+            motor = salvamento.carregar(caminho)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Carregar Partida", str(e))
+            return
+        self._retomar(motor)
 
-    def _shake(self, target, distance=6, times=6):
-        # Tremor lateral
-        def go(i=0, dir=1):
-            if i >= times:
-                return
-            self.canvas.move(target, distance*dir, 0)
-            self.root.after(25, lambda: (self.canvas.move(target, -distance*dir, 0),
-                                         self.root.after(25, lambda: go(i+1, -dir))))
-        go()
+    def _oferecer_continuar(self):
+        try:
+            motor = salvamento.carregar(self.autosave.caminho)
+        except (OSError, ValueError):
+            return  # sem autosave (ou de outras regras): começa do zero
+        if motor.game_over or not motor.acoes:
+            return
+        if messagebox.askyesno("Continuar", f"Continuar a batalha interrompida "
+                                            f"({motor.dificuldade}, turno {motor.turnos})?"):
+            self._retomar(motor)
+
+    def _retomar(self, motor):
+        self._desconectar()
+        self._parar_replay()
+        self.anim.cancelar_tudo()
+        self._cancelar_inimigo()
+        self.motor = motor
+        self.dificuldade = motor.dificuldade
+        self.var_dificuldade.set(motor.dificuldade)
+        self._preparar_oponente()
+        self._atualizar_botoes_feiticos()
+        self._log_limpar()
+        self._log(f"💾 Batalha retomada em {self.dificuldade}, turno {motor.turnos}.")
+        self._atualizar_barras()
+        self._atualizar_dica()
+        if motor.fase == "jogador":
+            self._set_botoes_state("normal")
+        elif motor.fase == "inimigo":  # salva logo após a sua ação
+            self._agendar_inimigo()
+        else:
+            self._set_botoes_state("disabled")
 
-    def _float_text(self, x, y, text, color="#EAF0FF"):
-        t = self.canvas.create_text(x, y, text=text, fill=color, font=("Segoe UI", 12, "bold"))
-        def step(i=0):
-            if i > 18:
-                self.canvas.delete(t)
-                return
-            self.canvas.move(t, 0, -2)
-            self.root.after(30, lambda: step(i+1))
-        step()
+    def _sair(self):
+        self._desconectar()
+        if self.instrumentacao is not None and self.instrumentacao.gravando:
+            self.instrumentacao.parar_perfil()
+        # O último turno pode estar na fila do autosave: espera a gravação
+        self.autosave.encerrar()
+        if self.estatisticas is not None:
+            try:
+                self.estatisticas.fechar()
+            except sqlite3.Error:
+                pass
+        self.root.destroy()
+
+    # ---------- Instrumentação ----------
+    def _medir(self, ligar):
+        # Ligada: handlers envolvidos, medidor no agendador e batimento do laço.
+        # Desligada: tudo volta aos métodos originais (custo zero)
+        instr = self.instrumentacao
+        if ligar:
+            if instr is None:
+                instr = self.instrumentacao = Instrumentacao(self.root)
+                self.painel_desempenho = PainelDesempenho(self.root, self.canvas, instr)
+            if not instr.instalada:
+                instr.instalar(self, HANDLERS_MEDIDOS)
+                instr.instalar(self.log, ("descarregar",), "log.")
+                instr.instalar(self.estado, ("descarregar",), "estado.")
+                self.anim.medidor = instr
+                instr.iniciar_batimento()
+        elif instr is not None:
+            instr.parar_batimento()
+            instr.desinstalar()
+            self.anim.medidor = None
+
+    def _toggle_desempenho(self):
+        if self.painel_desempenho is not None and self.painel_desempenho.visivel:
+            self.painel_desempenho.ocultar()
+            if not self.instrumentacao.gravando:
+                self._medir(False)
+        else:
+            self._medir(True)
+            self.painel_desempenho.mostrar()
+        self._build_menu()
 
-    # ---------- Turnos ----------
-    def _aplicar_status(self, quem):
-        # retorna True se ação deve ser pulada (congelado/atordoado)
-        status = self.status_enemy if quem == "enemy" else self.status_player
-        skip = False
-
-        # Queimadura: 5 de dano por 2 turnos
-        if status["queimadura"] > 0:
-            if quem == "enemy":
-                self.vida_inimigo -= 5
-                self._float_text(745, 55, "-5 🔥", self.danger)
-                self._flash_sprite(self.sprite_enemy)
+    def _toggle_perfil(self):
+        if self.instrumentacao is not None and self.instrumentacao.gravando:
+            try:
+                caminhos = self.instrumentacao.parar_perfil()
+            except OSError as e:
+                messagebox.showerror("Perfil", f"Falha ao salvar o perfil:\n{e}")
             else:
-                self.vida_jogador -= 5
-                self._float_text(105, 55, "-5 🔥", self.danger)
-                self._flash_sprite(self.sprite_player)
-            status["queimadura"] -= 1
+                self._log("⏹️ Perfil salvo: " + ", ".join(caminhos))
+            if not self.painel_desempenho.visivel:
+                self._medir(False)
+        else:
+            self._medir(True)
+            self.instrumentacao.iniciar_perfil()
+            self._log("⏺️ Gravando perfil... (Opções > Parar e Salvar Perfil)")
+        self._build_menu()
 
-        # Congelado / Atordoado: perde a ação
-        for k in ("congelado", "atordoado"):
-            if status[k] > 0:
-                skip = True
-                status[k] -= 1
+    # ---------- Estatísticas ----------
+    def _registrar_partida(self):
+        # replays já foram contados; partidas online, o servidor registra
+        if self.estatisticas is None or self.replay is not None or self.remoto is not None:
+            return
+        try:
+            self.estatisticas.registrar(self.motor, "jogo")
+            self.estatisticas.gravar()
+        except sqlite3.Error as e:  # fica pendente e vai na próxima gravação
+            self._log(f"⚠️ Estatísticas não gravadas: {e}")
+
+    def _mostrar_estatisticas(self):
+        if self.estatisticas is None:
+            messagebox.showinfo("Estatísticas", "Base de estatísticas indisponível.")
+            return
+        inicio = time.perf_counter()
+        linhas = self.estatisticas.resumo()
+        feiticos = self.estatisticas.resumo_feiticos()
+        ms = 1000 * (time.perf_counter() - inicio)
+
+        top = tk.Toplevel(self.root)
+        top.title("Estatísticas")
+        top.configure(bg=self.bg)
+        ttk.Label(top, text="Partidas", style="Body.TLabel").pack(anchor="w", padx=12, pady=(10, 2))
+        colunas = ("dificuldade", "origem", "partidas", "vitorias", "turnos")
+        geral = ttk.Treeview(top, columns=colunas, show="headings", height=min(8, max(1, len(linhas))))
+        for c, titulo in zip(colunas, ("Dificuldade", "Origem", "Partidas", "Vitórias", "Turnos médios")):
+            geral.heading(c, text=titulo)
+            geral.column(c, width=110, anchor="w" if c in ("dificuldade", "origem") else "e")
+        for r in linhas:
+            geral.insert("", "end", values=(r["dificuldade"], r["origem"], f"{r['partidas']:,}",
+                                            f"{100 * r['taxa_vitoria']:.1f}%", f"{r['turnos_medios']:.2f}"))
+        geral.pack(fill="x", padx=12)
+
+        ttk.Label(top, text="Acerto por feitiço", style="Body.TLabel").pack(anchor="w", padx=12, pady=(10, 2))
+        colunas = ("feitico", "jogador", "acerto_jogador", "inimigo", "acerto_inimigo")
+        tabela = ttk.Treeview(top, columns=colunas, show="headings", height=min(10, max(1, len(REGISTRO))))
+        for c, titulo in zip(colunas, ("Feitiço", "Você lançou", "Acerto", "Inimigo lançou", "Acerto")):
+            tabela.heading(c, text=titulo)
+            tabela.column(c, width=110, anchor="w" if c == "feitico" else "e")
+        for f in REGISTRO:
+            valores = [f"{f.emoji} {f.nome}"]
+            for lado in ("jogador", "inimigo"):
+                n, a = feiticos.get((f.id, lado), (0, 0))
+                valores += [f"{n:,}", f"{100 * a / n:.1f}%" if n else "-"]
+            tabela.insert("", "end", values=valores)
+        tabela.pack(fill="x", padx=12)
+        total = sum(r["partidas"] for r in linhas)
+        ttk.Label(top, text=f"{total:,} partidas registradas · lido em {ms:.1f} ms",
+                  style="Small.TLabel").pack(anchor="w", padx=12, pady=10)
+
+    # ---------- Replays ----------
+    def _salvar_replay(self):
+        if self.remoto is not None:
+            messagebox.showinfo("Salvar Replay", "A partida online fica no servidor.")
+            return
+        caminho = filedialog.asksaveasfilename(
+            title="Salvar Replay", defaultextension=".bfr",
+            filetypes=[("Replay", "*.bfr"), ("Todos", "*.*")])
+        if not caminho:
+            return
+        try:
+            replay.salvar(caminho, replay.Replay.de_motor(self.motor))
+        except OSError as e:
+            messagebox.showerror("Salvar Replay", f"Falha ao salvar:\n{e}")
+            return
+        self._log(f"🎞️ Replay salvo ({len(self.motor.acoes)} ações): {caminho}")
+
+    def _abrir_replay(self):
+        caminho = filedialog.askopenfilename(
+            title="Assistir Replay", filetypes=[("Replay", "*.bfr"), ("Todos", "*.*")])
+        if not caminho:
+            return
+        try:
+            rep = replay.carregar(caminho)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Assistir Replay", str(e))
+            return
+        self._desconectar()
+        self._parar_replay()
+        self.var_dificuldade.set(rep.dificuldade)
+        self.dificuldade = rep.dificuldade
+        self._cancelar_inimigo()
+        if self.oponente is not None:  # as jogadas do inimigo já estão gravadas
+            self.oponente.encerrar()
+            self.oponente = None
+        self.replay = rep
+        self._log_limpar()
+        self._log(f"🎞️ Replay: {rep.dificuldade}, semente {rep.semente}, {len(rep)} ações.")
+        self._posicionar_replay(0)
 
+    def _ir_para_turno(self):
+        if self.replay is None:
+            messagebox.showinfo("Replay", "Nenhum replay em exibição.")
+            return
+        turno = simpledialog.askinteger("Replay", "Ir para o turno:", parent=self.root, minvalue=0)
+        if turno is not None:
+            self._log(f"⏩ Turno {turno}")
+            self._posicionar_replay(self.replay.jogada_do_turno(turno))
+
+    def _posicionar_replay(self, jogada):
+        # Salta sem animar (a partir do instantâneo mais próximo) e segue tocando
+        self._cancelar_passo_replay()
+        self.anim.cancelar_tudo()
+        self.motor = self.replay.posicionar(jogada, eventos=True)
+        self._atualizar_botoes_feiticos()
+        self._set_botoes_state("disabled")
         self._atualizar_barras()
-        return skip
+        self._atualizar_dica()
+        self._replay_after = self.root.after(self._intervalo_replay(), self._passo_replay)
 
-    def _critico(self):
-        # 12% de chance de crítico (x1.6)
-        return random.random() < 0.12
+    def _intervalo_replay(self):
+        # mesma pausa entre turnos do jogo, na escala da velocidade de animação
+        return int(650 * self.anim_speed_ms / VELOCIDADE_PADRAO_MS)
 
-    def _consumir_mana(self, de_quem, custo):
-        if de_quem == "player":
-            if self.mana_jogador < custo:
-                return False
-            self.mana_jogador -= custo
-        else:
-            if self.mana_inimigo < custo:
-                return False
-            self.mana_inimigo -= custo
-        return True
+    def _passo_replay(self):
+        self._replay_after = None
+        rep = self.replay
+        if rep is None:
+            return
+        jogada = len(self.motor.acoes)  # o motor regrava o que executa
+        if jogada >= len(rep) or self.motor.game_over:
+            self._log("🎞️ Fim do replay.")
+            return
+        replay.aplicar(self.motor, rep.acoes[jogada])
+        self._processar_eventos()
+        self._replay_after = self.root.after(self._intervalo_replay(), self._passo_replay)
 
-    def _contabiliza_turno_player(self):
-        # conta turno sempre que sua vez passa (ação ou impedimento)
-        self.turnos += 1
-        # Regeneração leve de mana no fim do turno do jogador
-        self.mana_jogador = min(100, self.mana_jogador + 6)
+    def _cancelar_passo_replay(self):
+        if self._replay_after is not None:
+            self.root.after_cancel(self._replay_after)
+            self._replay_after = None
 
-    def turno_jogador(self, tipo):
-        if self.game_over:
-            return
-
-        # Checa status no INÍCIO do turno do jogador
-        if self._aplicar_status("player"):
-            self._log("🧊 Você está impedido de agir neste turno!")
-            self._contabiliza_turno_player()
-            self._apos_acao_jogador(passou=True)
-            return
-
-        dados = self._dados_feitico(tipo)
-        if not self._consumir_mana("player", dados["mana"]):
-            self._log("⚠️ Mana insuficiente! Use uma poção ou DEFENDER enquanto regenera mana.")
-            _beep_fail(self.sound_enabled)
-            return
-
-        self._log(f"Você lançou {dados['emoji']} {dados['nome']} ...")
-        self._animar_tiro(130, 90, 720, 90)
-
-        acerto = random.randint(1, 100)
-        if acerto <= dados["chance"]:
-            dano = dados["dano"]
-            if self._critico():
-                dano = int(dano * 1.6)
-                self._log("💥 Acerto CRÍTICO!")
-            if self.defesa_inimigo:
-                dano = int(dano * 0.5)
-                self.defesa_inimigo = False
-                self._log("🛡️ O inimigo estava defendendo! Dano reduzido.")
-            self.vida_inimigo -= dano
-            self._float_text(745, 60, f"-{dano}", self.fg)
-            self._shake(self.sprite_enemy)
-            self._flash_sprite(self.sprite_enemy)
-            self.acertos_player += 1
-            _beep_ok(self.sound_enabled)
-
-            # Aplica status
-            if dados["status"] and random.randint(1,100) <= dados["status_chance"]:
-                self.status_enemy[dados["status"]] += 1 if dados["status"] != "queimadura" else 2
-                self._log(f"✨ Efeito aplicado: {dados['status'].capitalize()}!")
+    def _parar_replay(self):
+        self._cancelar_passo_replay()
+        self.replay = None
 
-        else:
-            self._log("❌ Você errou o feitiço!")
-            _beep_fail(self.sound_enabled)
+    def _set_botoes_state(self, state):
+        for b in self.botoes_acao:
+            b.config(state=state)
 
-        self.vida_inimigo = max(0, self.vida_inimigo)
+    def _atualizar_textos(self):  # reservado para futuras labels dinâmicas
+        pass
+
+    # ---------- Eventos do motor ----------
+    def _processar_eventos(self):
+        # Traduz os eventos do motor em log, animações e sons
+        for ev in self.motor.drenar_eventos():
+            tipo = ev[0]
+            if tipo == "log":
+                self._log(ev[1])
+            elif tipo == "tiro":
+                if ev[1] == "player":
+                    self._animar_tiro(130, 90, 720, 90)
+                else:
+                    self._animar_tiro(720, 90, 130, 90)
+            elif tipo == "dano":
+                x, sprite = self._alvos[ev[1]]
+                self._float_text(x, 60, f"-{ev[2]}", self.fg)
+                self._shake(sprite)
+                self._flash_sprite(sprite)
+            elif tipo == "dano_status":
+                x, sprite = self._alvos[ev[1]]
+                self._float_text(x, 55, f"-{ev[2]} {ev[3]}", self.danger)
+                self._flash_sprite(sprite)
+            elif tipo == "defesa":
+                cor = "#7cff9d" if ev[1] == "player" else "#ffb4c7"
+                self._flash_sprite(self._alvos[ev[1]][1], color_temp=cor)
+            elif tipo == "cura":
+                self._flash_sprite(self._alvos[ev[1]][1], color_temp="#7cff9d")
+            elif tipo == "som":
+                if ev[1] == "ok":
+                    self._beep("ok")
+                else:
+                    self._beep("fail")
+            elif tipo == "fim":
+                self._encerrar(ev[1])
         self._atualizar_barras()
+        self._atualizar_dica()
+        self._autosalvar()
 
-        if self._verifica_fim():
-            return
+    # ---------- Animações ----------
+    # Todas passam pelo agendador (animacao.py): um único timer por quadro
+    def _animar_tiro(self, origem_x, origem_y, destino_x, destino_y, steps=20):
+        self.anim.tiro(origem_x, origem_y, destino_x, destino_y, duracao_ms=steps * VELOCIDADE_PADRAO_MS)
 
-        self._contabiliza_turno_player()
-        self._apos_acao_jogador()
+    def _flash_sprite(self, target, color_temp="#ffffff"):
+        self.anim.piscar(target, color_temp)
 
-    def _apos_acao_jogador(self, passou=False):
-        self._atualizar_barras()
-        self._set_botoes_state("disabled")
-        self.root.after(650, self.turno_inimigo)
+    def _shake(self, target, distance=6, times=6):
+        # Tremor lateral
+        self.anim.tremer(target, distance, times)
 
-    def defender(self):
-        if self.game_over:
+    def _float_text(self, x, y, text, color="#EAF0FF"):
+        self.anim.texto(x, y, text, color)
+
+    # ---------- Entrada ----------
+    def _tecla(self, e, acao):
+        # Segurar a tecla não repete a ação. A repetição automática chega como
+        # KeyPress sem KeyRelease (Windows/macOS) ou como KeyRelease + KeyPress
+        # com o mesmo horário (X11)
+        tecla = e.keysym
+        repetida = tecla in self._teclas_presas or self._ultima_soltura == (tecla, e.time)
+        self._teclas_presas.add(tecla)
+        if not repetida:
+            self._pedir_acao(acao)
+
+    def _soltar_tecla(self, e):
+        self._teclas_presas.discard(e.keysym)
+        self._ultima_soltura = (e.keysym, e.time)
+
+    def _pedir_acao(self, acao):
+        # Decide pela fase do motor, não pelo estado dos botões: na vez do
+        # jogador a ação roda já (mesmo quadro); na vez do inimigo fica
+        # pendente (só uma; um novo pedido substitui o anterior) e roda assim
+        # que o inimigo jogar
+        if self.motor.game_over or self.replay is not None:
             return
-        if self._aplicar_status("player"):
-            self._log("🧊 Você não conseguiu se defender — status impeditivo.")
-            self._contabiliza_turno_player()
-            self._apos_acao_jogador(passou=True)
+        if self.remoto is not None:
+            self._pedir_acao_remota(acao)
             return
-        self.defesa_ativa = True
-        self._log("🛡️ Você assume posição DEFENSIVA! (metade do dano no próximo golpe)")
-        self._flash_sprite(self.sprite_player, color_temp="#7cff9d")
-        self._contabiliza_turno_player()
-        self._apos_acao_jogador()
-
-    def usar_pocao(self):
-        if self.game_over:
+        if self.motor.fase == "jogador":
+            self._acao_jogador(acao)
+        elif self.motor.fase == "inimigo":
+            self._acao_pendente = acao
+
+    # ---------- Partida online ----------
+    def _jogar_online(self):
+        dificuldade = self.var_dificuldade.get() or "Normal"
+        if dificuldade not in DIFICULDADES_IA_EMBUTIDA:
+            messagebox.showinfo("Jogar Online", f"{dificuldade} não está disponível no servidor.")
             return
+        texto = simpledialog.askstring("Jogar Online", "Servidor (host:porta ou caminho do socket Unix):",
+                                       parent=self.root, initialvalue=self._endereco_online)
+        if not texto:
+            return
+        pvp = messagebox.askyesno("Jogar Online", "Jogar contra outra pessoa?\n(Não = contra a IA do servidor)")
+        try:
+            cliente = ClientePartidas(texto)
+        except OSError as e:
+            messagebox.showerror("Jogar Online", f"Sem conexão com {texto}:\n{e}")
+            return
+        self._desconectar()
+        self._parar_replay()
+        self.anim.cancelar_tudo()
+        self._cancelar_inimigo()
+        self._endereco_online = texto
+        self.remoto = cliente
+        self.dificuldade = dificuldade
+        self.motor = EspelhoMotor(dificuldade)
+        self._atualizar_botoes_feiticos()
+        self._set_botoes_state("disabled")
+        self._log_limpar()
+        self._log(f"🌐 Conectado a {texto} ({'contra outra pessoa' if pvp else 'contra a IA'}, {dificuldade}).")
+        self._build_menu()
+        cliente.entrar("pvp" if pvp else "ia", dificuldade)
+        self._receber_remoto()
 
-        if self._aplicar_status("player"):
-            self._log("🧊 Você perdeu a chance de usar a poção neste turno.")
-            self._contabiliza_turno_player()
-            self._apos_acao_jogador(passou=True)
+    def _desconectar(self):
+        # Fecha a conexão e volta a um motor local (o chamador começa a partida)
+        if self.remoto is None:
             return
+        if self._remoto_after is not None:
+            self.root.after_cancel(self._remoto_after)
+            self._remoto_after = None
+        self.remoto.fechar()
+        self.remoto = None
+        self._lado_remoto = None
+        self._remoto_fila.clear()
+        self._remoto_enviada = False
+        self.motor = MotorBatalha(self.dificuldade)
+        self._build_menu()
 
-        if self.pocoes <= 0:
-            self._log("⚠️ Você não tem mais poções! Perdeu a vez.")
+    def _receber_remoto(self):
+        # Mensagens chegam pela thread do cliente; aqui, no laço da interface,
+        # são mostradas em ordem. A jogada do adversário espera a mesma pausa
+        # que o turno do inimigo tem na partida local
+        self._remoto_after = None
+        if self.remoto is None:
+            return
+        fila = self._remoto_fila
+        fila.extend(self.remoto.recebidas())
+        while fila:
+            msg = fila[0]
+            if msg is None:
+                self._novo_jogo()
+                messagebox.showinfo("Jogar Online", "A conexão com o servidor foi encerrada.")
+                return
+            if msg["tipo"] == "jogada" and msg["quem"] != self._lado_remoto \
+                    and time.perf_counter() < self._remoto_pausa:
+                break
+            fila.popleft()
+            self._tratar_remoto(msg)
+        self._remoto_after = self.root.after(15, self._receber_remoto)
+
+    def _tratar_remoto(self, msg):
+        tipo = msg["tipo"]
+        if tipo == "aguardando":
+            self._log("⏳ Aguardando um adversário...")
+        elif tipo == "inicio":
+            self._lado_remoto = msg["lado"]
+            self.motor.reiniciar(msg["dificuldade"])
+            self.motor.atualizar(msg["estado"])
+            lado = "o feiticeiro da esquerda" if msg["lado"] == "player" else "o inimigo (à direita)"
+            self._log(f"🌐 Partida {msg['partida']} começou: você controla {lado}.")
+            self._atualizar_barras()
+            self._liberar_vez()
+        elif tipo == "jogada":
+            if msg["quem"] == self._lado_remoto:
+                self._remoto_enviada = False
+                self._remoto_pausa = time.perf_counter() + 0.65
+            self.motor.atualizar(msg["estado"], msg["eventos"])
+            self._processar_eventos()
+            self._liberar_vez()
+        elif tipo == "fim":
+            self._set_botoes_state("disabled")
+            if msg["motivo"] == "abandono":
+                self._log("🏳️ O adversário saiu da partida.")
+            elif msg["motivo"] == "limite_turnos":
+                self._log("⌛ Limite de turnos: partida sem vencedor.")
+        elif tipo == "erro":
+            self._remoto_enviada = False
+            self._log(f"⚠️ Servidor: {msg['mensagem']}")
+            self._liberar_vez()
+
+    def _minha_vez(self):
+        m = self.motor
+        return self._lado_remoto is not None and not m.game_over and m.fase == VEZ[self._lado_remoto]
+
+    def _liberar_vez(self):
+        if not self._minha_vez():
             self._set_botoes_state("disabled")
-            self._contabiliza_turno_player()
-            self.root.after(650, self.turno_inimigo)
             return
+        self._set_botoes_state("normal")
+        if self._lado_remoto == "enemy":  # poção só existe para o jogador
+            self.btn_pocao.config(state="disabled")
+        acao, self._acao_pendente = self._acao_pendente, None
+        if acao is not None:
+            self._pedir_acao_remota(acao)
+
+    def _pedir_acao_remota(self, acao):
+        # Mesma regra da partida local: fora da vez, uma ação fica pendente
+        if self._minha_vez() and not self._remoto_enviada:
+            self._remoto_enviada = True
+            self._set_botoes_state("disabled")
+            try:
+                self.remoto.agir(acao)
+            except OSError:
+                self._remoto_enviada = False  # a thread leitora avisa o fim da conexão
+        elif not self.motor.game_over and self._lado_remoto is not None:
+            self._acao_pendente = acao
 
-        self.pocoes -= 1
-        cura = 25
-        vida_antes = self.vida_jogador
-        self.vida_jogador = min(100, self.vida_jogador + cura)
-        ganho = self.vida_jogador - vida_antes
-
-        self._log(f"🧪 Você usou uma poção e recuperou {ganho} de vida!")
-        self._flash_sprite(self.sprite_player, color_temp="#7cff9d")
-        _beep_ok(self.sound_enabled)
-
-        self._atualizar_barras()
+    # ---------- Turnos ----------
+    def _acao_jogador(self, acao):
+        passou = self.motor.executar(acao)
+        self._processar_eventos()
+        if passou and not self.motor.game_over:
+            self._agendar_inimigo()
 
-        if self._verifica_fim():
-            return
+    def _agendar_inimigo(self):
+        self._set_botoes_state("disabled")
+        if self.oponente is not None:
+            # busca começa já, em paralelo com a pausa entre turnos
+            self._jogada_inimigo = self.oponente.pensar(self.motor)
+        self._inimigo_after = self.root.after(650, self.turno_inimigo)
+
+    def _cancelar_inimigo(self):
+        # Nova partida, partida carregada ou replay: o turno agendado e a
+        # ação pendente eram da partida anterior
+        if self._inimigo_after is not None:
+            self.root.after_cancel(self._inimigo_after)
+            self._inimigo_after = None
+        self._jogada_inimigo = None
+        self._acao_pendente = None
 
-        self._contabiliza_turno_player()
-        self._apos_acao_jogador(passou=True)
+    def turno_jogador(self, tipo):
+        self._pedir_acao(tipo)
 
-    def _escolha_ia(self):
-        # IA simples com prioridade baseada em estado e mana
-        options = ["fogo", "raio", "meteoros"]
-        weights = [1, 1, 1]
-        if self.vida_jogador < 35:
-            weights = [1, 1, 2]
-        if self.mana_inimigo < 25:
-            weights = [1, 2, 0.5]
-        if self.defesa_ativa:
-            weights = [1, 2.5, 0.7]
+    def defender(self):
+        self._pedir_acao("defender")
 
-        total = sum(weights)
-        pick = random.uniform(0, total)
-        upto = 0
-        for opt, w in zip(options, weights):
-            if upto + w >= pick:
-                return opt
-            upto += w
-        return random.choice(options)
+    def usar_pocao(self):
+        self._pedir_acao("pocao")
 
     def turno_inimigo(self):
-        if self.game_over:
-            return
-
-        # Status do inimigo no INÍCIO do turno dele
-        if self._aplicar_status("enemy"):
-            self._log("🧊 Inimigo está impedido de agir neste turno!")
-            self._final_turno_inimigo()
-            return
-
-        # Chance do inimigo se defender se estiver com pouca vida
-        if self.vida_inimigo <= 25 and random.random() < 0.35:
-            self.defesa_inimigo = True
-            self._log("🛡️ Inimigo está DEFENDENDO!")
-            self._flash_sprite(self.sprite_enemy, color_temp="#ffb4c7")
-            self._final_turno_inimigo()
-            return
-
-        # Escolha e mana check
-        tipo = self._escolha_ia()
-        dados = self._dados_feitico(tipo)
-
-        # Se sem mana, recupera mana e passa o turno
-        if not self._consumir_mana("enemy", dados["mana"]):
-            self._log("💤 Inimigo está canalizando mana... (+10)")
-            self.mana_inimigo = min(100, self.mana_inimigo + 10)
-            self._final_turno_inimigo()
-            return
-
-        self._log(f"Inimigo lançou {dados['emoji']} {dados['nome']} ...")
-        self._animar_tiro(720, 90, 130, 90)
-
-        acc_mod = self.enemy_acc_mod
-        acerto = random.randint(1, 100)
-        if acerto <= max(5, min(95, dados["chance"] + acc_mod)):
-            dano = dados["dano"]
-            if self._critico():
-                dano = int(dano * 1.6)
-                self._log("💥 Inimigo acertou um CRÍTICO!")
-            if self.defesa_ativa:
-                dano = int(dano * 0.5)
-                self.defesa_ativa = False
-                self._log("🛡️ Sua defesa reduziu o dano pela metade!")
-            self.vida_jogador -= dano
-            self._float_text(105, 60, f"-{dano}", self.fg)
-            self._shake(self.sprite_player)
-            self._flash_sprite(self.sprite_player)
-            self.acertos_enemy += 1
-            _beep_fail(self.sound_enabled)
-
-            # Aplica status
-            if dados["status"] and random.randint(1,100) <= dados["status_chance"]:
-                self.status_player[dados["status"]] += 1 if dados["status"] != "queimadura" else 2
-                self._log(f"✨ Efeito aplicado em você: {dados['status'].capitalize()}!")
-        else:
-            self._log("🙌 O inimigo errou o feitiço!")
-            _beep_ok(self.sound_enabled)
-
-        self.vida_jogador = max(0, self.vida_jogador)
-        self._atualizar_barras()
-
-        if self._verifica_fim():
+        self._inimigo_after = None
+        if self.replay is not None:
+            return
+        tipo = None
+        if self._jogada_inimigo is not None:
+            if not self._jogada_inimigo.done():
+                # ainda pensando: consulta de novo sem bloquear o mainloop
+                self._inimigo_after = self.root.after(15, self.turno_inimigo)
+                return
+            try:
+                tipo = self._jogada_inimigo.result()
+            except Exception as e:  # busca falhou: este turno fica com a IA embutida
+                self._log(f"⚠️ O oponente não conseguiu decidir ({type(e).__name__}); jogada da IA padrão.")
+            self._jogada_inimigo = None
+        if not self.motor.turno_inimigo(tipo):
+            return
+        self._processar_eventos()
+        if self.motor.game_over:
+            self._acao_pendente = None
             return
-
-        self._final_turno_inimigo()
-
-    def _final_turno_inimigo(self):
-        # Regeneração leve de mana no fim do turno do inimigo
-        self.mana_inimigo = min(100, self.mana_inimigo + 6)
-        self._atualizar_barras()
         self._set_botoes_state("normal")
-
-    def _verifica_fim(self):
-        if self.vida_inimigo <= 0:
-            self.vida_inimigo = 0
-            self._atualizar_barras()
-            self._log("\n🎉 Você venceu a batalha!")
-            self._encerrar("Você venceu!")
-            return True
-        if self.vida_jogador <= 0:
-            self.vida_jogador = 0
-            self._atualizar_barras()
-            self._log("\n💀 Você foi derrotado pelo inimigo!")
-            self._encerrar("Você perdeu!")
-            return True
-        return False
+        acao, self._acao_pendente = self._acao_pendente, None
+        if acao is not None:
+            self._pedir_acao(acao)
 
     def _encerrar(self, titulo):
-        self.game_over = True
+        m = self.motor
         self._set_botoes_state("disabled")
+        self._registrar_partida()
+        self._progresso_partida()
         # Estatísticas básicas
-        total_turnos = self.turnos
+        total_turnos = m.turnos
         try:
-            acc = round((self.acertos_player / max(1, total_turnos)) * 100, 1)
+            acc = round((m.acertos_player / max(1, total_turnos)) * 100, 1)
         except Exception:
             acc = 0.0
         self.root.after(250, lambda: messagebox.showinfo(
             "Fim de Jogo",
             f"{titulo}\n\nTurnos (você): {total_turnos}\n"
-            f"Acertos (você): {self.acertos_player}\n"
-            f"Acertos (inimigo): {self.acertos_enemy}\n"
+            f"Acertos (você): {m.acertos_player}\n"
+            f"Acertos (inimigo): {m.acertos_enemy}\n"
             f"Precisão estimada: {acc}%"
         ))
 
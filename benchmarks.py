@@ -0,0 +1,383 @@
+# Batalha dos Feiticeiros — Benchmarks
+# Medidas dos caminhos quentes (motor, IA, simuladores, gerador de senhas,
+# servidor de partidas e animação Tk), sem dependências além das do próprio
+# projeto:
+# - cada benchmark executa n operações; o runner faz um aquecimento e
+#   `rodadas` repetições e guarda mediana e melhor taxa (operações/s)
+# - cada execução é salva em JSON (resultados_benchmark/AAAAMMDD-HHMMSS.json)
+#   com versão do Python, plataforma e commit
+# - --comparar BASE NOVO mostra a variação de cada benchmark e sai com
+#   código 1 se algum ficou mais lento que o limite (%) ou se algum da base
+#   foi pulado ou não rodou em NOVO
+# - o teste de quadros por segundo da animação precisa de display; sem um
+#   (servidor de CI) rode sob Xvfb, senão ele é pulado
+#
+# Execução:
+#   python benchmarks.py
+#   python benchmarks.py --filtro motor --rodadas 10
+#   xvfb-run -a python benchmarks.py --filtro tk
+#   python benchmarks.py --comparar resultados_benchmark/antes.json resultados_benchmark/depois.json --limite 10
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+PASTA_RESULTADOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resultados_benchmark")
+RODADAS = 5
+LIMITE_REGRESSAO = 10.0  # % mais lento que a base
+
+BENCHMARKS = {}  # nome -> (função(n), n, unidade)
+
+
+class Pular(Exception):
+    """O benchmark não pode rodar neste ambiente (falta display, numpy...)."""
+
+
+def benchmark(nome, n, unidade="op"):
+    # Registra f(n). Se f devolver (operações, segundos), a medida é essa
+    # (benchmarks que cronometram só uma parte do que fazem)
+    def registrar(f):
+        BENCHMARKS[nome] = (f, n, unidade)
+        return f
+    return registrar
+
+
+# ---------- Motor ----------
+@benchmark("motor.resolver_feitico", 200000, "feitiço")
+def _resolver_feitico(n):
+    from motor_batalha import REGISTRO, MotorBatalha
+    m = MotorBatalha("Normal", 1, eventos=False)
+    ids = REGISTRO.ids
+    k = len(ids)
+    for i in range(n):
+        m.fase = "jogador"
+        m.mana_jogador = 100
+        m.vida_inimigo = 1000
+        m.turno_jogador(ids[i % k])
+
+
+@benchmark("motor.aplicar_status", 500000, "tique")
+def _aplicar_status(n):
+    from motor_batalha import EFEITOS, MotorBatalha
+    m = MotorBatalha("Normal", 1, eventos=False)
+    status = m.status_player
+    ativos = range(len(EFEITOS))
+    for _ in range(n):
+        for i in ativos:
+            status[i] = 2
+        m.vida_jogador = 100
+        m._aplicar_status("player")
+
+
+@benchmark("motor.escolha_ia", 500000, "escolha")
+def _escolha_ia(n):
+    from motor_batalha import MotorBatalha
+    m = MotorBatalha("Normal", 1, eventos=False)
+    escolher = m._escolha_ia
+    for _ in range(n):
+        escolher()
+
+
+@benchmark("motor.partida_completa", 5000, "partida")
+def _partida_completa(n):
+    from motor_batalha import simular
+    simular(n, "Normal", 0)
+
+
+# ---------- IA e simuladores ----------
+@benchmark("mcts.iteracoes", 1000, "iteração")
+def _mcts(n):
+    # n = orçamento em ms de uma busca a partir do início da partida
+    from motor_batalha import MotorBatalha
+    from oponente_mcts import OponenteMCTS
+    m = MotorBatalha("Especialista", 1, eventos=False)
+    m.defender()
+    op = OponenteMCTS(n, semente=1)
+    try:
+        inicio = time.perf_counter()
+        op.escolher(m)
+        return op.iteracoes, time.perf_counter() - inicio
+    finally:
+        op.encerrar()
+
+
+@benchmark("vetorizado.partidas", 50000, "partida")
+def _vetorizado(n):
+    try:
+        import simulador_vetorizado
+    except ImportError as e:
+        raise Pular(f"sem numpy ({e})")
+    simulador_vetorizado.simular_dificuldade("Normal", n, 0)
+
+
+@benchmark("rl.passos", 4096 * 120, "passo")
+def _rl_passos(n):
+    # passos do ambiente de RL (4096 partidas por step, ações válidas ao acaso)
+    try:
+        import numpy as np
+        from ambiente_rl import AmbienteBatalhas
+    except ImportError as e:
+        raise Pular(f"sem numpy ({e})")
+    lote = 4096
+    amb = AmbienteBatalhas(lote, semente=0)
+    _, info = amb.reset()
+    rng = np.random.default_rng(0)
+    inicio = time.perf_counter()
+    for _ in range(max(1, n // lote)):
+        sorteio = rng.random((lote, amb.n_acoes))
+        sorteio[~info["mascara"]] = -1
+        info = amb.step(sorteio.argmax(axis=1))[4]
+    return max(1, n // lote) * lote, time.perf_counter() - inicio
+
+
+@benchmark("progressao.elenco", 1000000, "feiticeiro")
+def _progressao_elenco(n):
+    # tabelas de dano e custo de um elenco inteiro (progressao.tabelas_lote)
+    try:
+        import numpy as np
+        from progressao import MAGIA_MAXIMA, NIVEL_MAXIMO, tabelas_lote
+    except ImportError as e:
+        raise Pular(f"sem numpy ({e})")
+    rng = np.random.default_rng(0)
+    magias = rng.integers(1, MAGIA_MAXIMA + 1, n)
+    niveis = rng.integers(1, NIVEL_MAXIMO + 1, n)
+    inicio = time.perf_counter()
+    tabelas_lote(magias, niveis)
+    return n, time.perf_counter() - inicio
+
+
+# ---------- Senhas ----------
+@benchmark("senha.gerar_bytes", 200000, "senha")
+def _gerar_bytes(n):
+    import gerador_senha
+    gerador_senha.gerar_bytes(n, 16, gerador_senha.alfabeto())
+
+
+@benchmark("senha.politica", 20000, "senha")
+def _politica(n):
+    from politica_senha import PoliticaSenha
+    p = PoliticaSenha(minimos={"numeros": 2, "simbolos": 1}, excluir_ambiguos=True)
+    p.gerar_bytes(n, 16)
+
+
+@benchmark("senha.bloqueio", 100000, "consulta")
+def _bloqueio(n):
+    # consultas escalares no filtro em mmap (lista de 10 mil senhas)
+    import tempfile
+    import bloqueio_senhas
+    try:
+        import numpy  # noqa: F401 (só para construir o filtro)
+    except ImportError as e:
+        raise Pular(f"sem numpy ({e})")
+    with tempfile.TemporaryDirectory() as pasta:
+        lista_txt = os.path.join(pasta, "lista.txt")
+        with open(lista_txt, "w") as f:
+            f.writelines(f"senha{i}\n" for i in range(10000))
+        caminho = os.path.join(pasta, "lista.bloom")
+        bloqueio_senhas.construir(lista_txt, caminho)
+        lista = bloqueio_senhas.ListaBloqueio(caminho)
+        consultas = [f"teste{i}" for i in range(n)]
+        inicio = time.perf_counter()
+        for s in consultas:
+            s in lista
+        duracao = time.perf_counter() - inicio
+        lista.fechar()
+    return n, duracao
+
+
+@benchmark("senha.unicas", 200000, "senha")
+def _unicas(n):
+    import gerador_senha
+    from bloqueio_senhas import FiltroSenhas
+    try:
+        filtro = FiltroSenhas(unicas=True, capacidade=n)
+    except ImportError as e:
+        raise Pular(f"sem numpy ({e})")
+    gerador_senha.gerar_bytes(n, 16, gerador_senha.alfabeto(), filtro)
+
+
+# ---------- Servidor ----------
+@benchmark("servidor.partidas", 2000, "partida")
+def _servidor_partidas(n):
+    # Servidor e 200 clientes no mesmo laço de eventos, por socket Unix
+    import asyncio
+    import socket
+    import tempfile
+    if not hasattr(socket, "AF_UNIX"):
+        raise Pular("sem sockets Unix nesta plataforma")
+    from carga_partidas import gerar_carga
+    with tempfile.TemporaryDirectory() as pasta:
+        r = asyncio.run(gerar_carga(os.path.join(pasta, "servidor.sock"), n, 200, local=True))
+    return r["partidas"], r["segundos"]
+
+
+# ---------- Interface ----------
+@benchmark("tk.animacao_fps", 3000, "quadro")
+def _animacao_fps(n):
+    # n = duração em ms; tiros, textos, tremores e piscadas sem parar,
+    # como numa troca rápida de golpes. Mede quadros entregues por segundo
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception as e:  # sem tkinter ou sem display
+        raise Pular(f"sem display para o Tk ({e}); rode sob xvfb-run")
+    from animacao import AgendadorAnimacoes
+    try:
+        root.geometry("880x660")
+        canvas = tk.Canvas(root, width=880, height=260, bg="#0a0d20", highlightthickness=0)
+        canvas.pack()
+        jogador = canvas.create_rectangle(100, 60, 160, 140, fill="#6C7CFF")
+        inimigo = canvas.create_rectangle(690, 60, 750, 140, fill="#FF5C80")
+        anim = AgendadorAnimacoes(root, canvas)
+        anim.registrar_sprite(jogador)
+        anim.registrar_sprite(inimigo)
+        root.update()
+
+        golpes = [0]
+
+        def golpe():
+            golpes[0] += 1
+            x_origem, x_alvo, alvo = (130, 720, inimigo) if golpes[0] % 2 else (720, 130, jogador)
+            anim.tiro(x_origem, 90, x_alvo, 90)
+            anim.texto(x_alvo, 60, f"-{golpes[0] % 40}", "#EAF0FF")
+            anim.tremer(alvo)
+            anim.piscar(alvo)
+            root.after(120, golpe)
+
+        golpe()
+        quadros = anim.quadros
+        inicio = time.perf_counter()
+        root.after(n, root.quit)
+        root.mainloop()
+        return anim.quadros - quadros, time.perf_counter() - inicio
+    finally:
+        root.destroy()
+
+
+# ---------- Runner ----------
+def medir(nome, rodadas=RODADAS):
+    f, n, unidade = BENCHMARKS[nome]
+    f(max(1, n // 20))  # aquecimento (imports, caches)
+    taxas = []
+    for _ in range(rodadas):
+        inicio = time.perf_counter()
+        r = f(n)
+        duracao = time.perf_counter() - inicio
+        ops = n
+        if r is not None:
+            ops, duracao = r
+        taxas.append(ops / max(duracao, 1e-12))
+    return {"unidade": unidade, "n": n, "rodadas": rodadas,
+            "ops_por_s": statistics.median(taxas), "melhor_ops_por_s": max(taxas)}
+
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def rodar(filtro=None, rodadas=RODADAS, saida=print):
+    resultados, pulados = {}, {}
+    for nome in BENCHMARKS:
+        if filtro and filtro not in nome:
+            continue
+        try:
+            r = resultados[nome] = medir(nome, rodadas)
+        except Pular as e:
+            pulados[nome] = str(e)
+            saida(f"{nome:<26} pulado: {e}")
+            continue
+        saida(f"{nome:<26} {r['ops_por_s']:>14,.0f} {r['unidade']}/s  (melhor {r['melhor_ops_por_s']:,.0f})")
+    return {
+        "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "processadores": os.cpu_count(),
+        "resultados": resultados,
+        "pulados": pulados,
+    }
+
+
+def comparar(base, novo, limite=LIMITE_REGRESSAO):
+    """Linhas (nome, taxa base, taxa nova, variação %, situação) e a lista de regressões."""
+    linhas, regressoes = [], []
+    for nome, r in novo["resultados"].items():
+        b = base["resultados"].get(nome)
+        if b is None:
+            linhas.append((nome, None, r["ops_por_s"], None, "novo"))
+            continue
+        variacao = 100 * (r["ops_por_s"] / b["ops_por_s"] - 1)
+        if variacao < -limite:
+            situacao = "REGRESSÃO"
+            regressoes.append(nome)
+        elif variacao > limite:
+            situacao = "melhora"
+        else:
+            situacao = "ok"
+        linhas.append((nome, b["ops_por_s"], r["ops_por_s"], variacao, situacao))
+    # os que só existem na base também contam: sem medida não há como comparar
+    for nome, b in base["resultados"].items():
+        if nome not in novo["resultados"]:
+            situacao = "PULADO" if nome in novo.get("pulados", {}) else "AUSENTE"
+            linhas.append((nome, b["ops_por_s"], None, None, situacao))
+            regressoes.append(nome)
+    return linhas, regressoes
+
+
+def _ler(caminho):
+    with open(caminho, encoding="utf-8") as f:
+        return json.load(f)
+
+
+# ---------- Main ----------
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Benchmarks da Batalha dos Feiticeiros e do gerador de senhas.")
+    parser.add_argument("--filtro", help="roda só os benchmarks cujo nome contém este texto")
+    parser.add_argument("--rodadas", type=int, default=RODADAS)
+    parser.add_argument("--saida", help="arquivo JSON (padrão: resultados_benchmark/<data>.json)")
+    parser.add_argument("--listar", action="store_true")
+    parser.add_argument("--comparar", nargs=2, metavar=("BASE", "NOVO"))
+    parser.add_argument("--limite", type=float, default=LIMITE_REGRESSAO, help="%% de lentidão tolerada")
+    args = parser.parse_args(argv)
+
+    if args.listar:
+        for nome, (_, n, unidade) in BENCHMARKS.items():
+            print(f"{nome:<26} n={n:,} ({unidade})")
+        return 0
+
+    if args.comparar:
+        try:
+            base, novo = (_ler(c) for c in args.comparar)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+        linhas, regressoes = comparar(base, novo, args.limite)
+        print(f"{'Benchmark':<26}{'Base':>14}{'Novo':>14}{'Variação':>10}")
+        for nome, b, r, variacao, situacao in linhas:
+            print(f"{nome:<26}{'-' if b is None else f'{b:,.0f}':>14}{'-' if r is None else f'{r:,.0f}':>14}"
+                  f"{'' if variacao is None else f'{variacao:+.1f}%':>10}  {situacao}")
+        if regressoes:
+            print(f"\n{len(regressoes)} regressão(ões) (mais lentos que {args.limite:g}%, pulados ou ausentes): "
+                  f"{', '.join(regressoes)}")
+            return 1
+        return 0
+
+    resultado = rodar(args.filtro, args.rodadas)
+    caminho = args.saida or os.path.join(PASTA_RESULTADOS, time.strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(resultado, f, indent=2, ensure_ascii=False)
+    print(f"\nResultados: {caminho}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
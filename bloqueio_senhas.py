@@ -0,0 +1,363 @@
+# Gerador de Senhas — Lista de Bloqueio (filtro de Bloom) e Unicidade
+# - construir(): transforma uma lista local de senhas vazadas/comuns (uma
+#   por linha, como rockyou.txt) num filtro de Bloom em disco: ~29 bits por
+#   senha com 1 falso positivo em um milhão, sem guardar as senhas
+# - ListaBloqueio: o filtro mapeado em memória (mmap); abrir não lê os
+#   dados e cada consulta lê k bytes, qualquer que seja o tamanho da lista.
+#   Sem falsos negativos: senha da lista é sempre recusada; um falso
+#   positivo só faz o gerador sortear outra
+# - VerificadorUnicidade: filtro de Bloom em blocos de 64 bits na memória
+#   (~2 bytes por senha) que garante lotes sem repetição; dezenas de
+#   milhões de senhas cabem em dezenas de MB, em vez de GB num set
+# - FiltroSenhas: os dois juntos, aplicados a blocos de senhas do
+#   gerador_senha.py (uma por linha, todas do mesmo tamanho)
+#
+# Hash: FNV-1a de 64 bits com o finalizador do MurmurHash3, calculado por
+# coluna em NumPy para blocos inteiros e em Python puro para uma senha.
+#
+# Requer (apenas para construir e filtrar blocos): numpy
+#
+# Execução:
+#   python bloqueio_senhas.py --construir rockyou.txt --saida tabelas/comuns.bloom
+#   python bloqueio_senhas.py --filtro tabelas/comuns.bloom --consultar 123456 'S3nh@Forte!'
+#   python gerador_senha.py -n 20000000 --tamanho 10 --bloqueio tabelas/comuns.bloom --unicas --saida senhas.txt
+
+import math
+import mmap
+import os
+import struct
+import time
+
+VERSAO = 1
+MAGICO = b"BFBLQ\x00"
+_CABECALHO = struct.Struct("<6sBBQQ")  # mágico, versão, k, m (bits), senhas
+TAXA_FALSOS = 1e-6
+BITS_POR_SENHA_UNICIDADE = 16  # ~1 falso positivo em 600: só custa um novo sorteio
+LOTE_CONSTRUCAO = 1 << 20  # senhas por passada do construtor
+
+_MASCARA = (1 << 64) - 1
+_FNV_BASE = 0xCBF29CE484222325
+_FNV_PRIMO = 0x100000001B3
+_MIX1 = 0xFF51AFD7ED558CCD
+_MIX2 = 0xC4CEB9FE1A85EC53
+_OURO = 0x9E3779B97F4A7C15
+
+
+# ---------- Hash ----------
+def _misturar(h):
+    h ^= h >> 33
+    h = (h * _MIX1) & _MASCARA
+    h ^= h >> 33
+    h = (h * _MIX2) & _MASCARA
+    return h ^ (h >> 33)
+
+
+def hashes(dados):
+    # (h1, h2) de uma senha em bytes; h2 ímpar (passo do hash duplo)
+    h = _FNV_BASE
+    for b in dados:
+        h = ((h ^ b) * _FNV_PRIMO) & _MASCARA
+    h1 = _misturar(h)
+    return h1, _misturar(h1 ^ _OURO) | 1
+
+
+def _misturar_lote(h, np):
+    h ^= h >> np.uint64(33)
+    h *= np.uint64(_MIX1)
+    h ^= h >> np.uint64(33)
+    h *= np.uint64(_MIX2)
+    h ^= h >> np.uint64(33)
+    return h
+
+
+def hashes_lote(matriz):
+    """(h1, h2) de cada linha de uma matriz uint8 (senhas, tamanho): mesmos valores de hashes()."""
+    import numpy as np
+    h = np.full(len(matriz), _FNV_BASE, dtype=np.uint64)
+    primo = np.uint64(_FNV_PRIMO)
+    for coluna in matriz.T:
+        h ^= coluna
+        h *= primo
+    h1 = _misturar_lote(h, np)
+    h2 = _misturar_lote(h1 ^ np.uint64(_OURO), np) | np.uint64(1)
+    return h1, h2
+
+
+def _posicoes_lote(h1, h2, k, m, np):
+    # hash duplo (Kirsch-Mitzenmacher): h1 + i*h2 mod 2^64 mod m, como em __contains__
+    i = np.arange(k, dtype=np.uint64)
+    return (h1[:, None] + i[None, :] * h2[:, None]) % np.uint64(m)
+
+
+def dimensionar(n, taxa_falsos=TAXA_FALSOS):
+    # (bits, hashes) ótimos para n senhas; bits em múltiplos de 64
+    n = max(1, n)
+    m = math.ceil(-n * math.log(taxa_falsos) / math.log(2) ** 2)
+    m += -m % 64
+    return m, max(1, min(32, round(m / n * math.log(2))))
+
+
+def _linhas(caminho):
+    # senhas da lista, sem o fim de linha; linhas vazias são ignoradas
+    with open(caminho, "rb") as f:
+        for linha in f:
+            linha = linha.rstrip(b"\r\n")
+            if linha:
+                yield linha
+
+
+# ---------- Construção ----------
+def construir(caminho_lista, caminho_saida, taxa_falsos=TAXA_FALSOS, progresso=None):
+    """
+    Duas passadas pela lista: a primeira conta as senhas (tamanho do
+    filtro), a segunda liga os bits em lotes, agrupando as senhas por
+    tamanho para o hash por coluna. Devolve (senhas, bits, k).
+    """
+    import numpy as np
+    n = sum(1 for _ in _linhas(caminho_lista))
+    m, k = dimensionar(n, taxa_falsos)
+    bits = np.zeros(m // 8, dtype=np.uint8)
+
+    def gravar(grupos):
+        for tamanho, senhas in grupos.items():
+            matriz = np.frombuffer(b"".join(senhas), dtype=np.uint8).reshape(len(senhas), tamanho)
+            pos = _posicoes_lote(*hashes_lote(matriz), k, m, np).ravel()
+            np.bitwise_or.at(bits, pos >> np.uint64(3), np.left_shift(1, pos & np.uint64(7)).astype(np.uint8))
+
+    grupos, lidas = {}, 0
+    for senha in _linhas(caminho_lista):
+        grupos.setdefault(len(senha), []).append(senha)
+        lidas += 1
+        if lidas % LOTE_CONSTRUCAO == 0:
+            gravar(grupos)
+            grupos = {}
+            if progresso:
+                progresso(lidas, n)
+    gravar(grupos)
+
+    os.makedirs(os.path.dirname(os.path.abspath(caminho_saida)), exist_ok=True)
+    tmp = caminho_saida + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_CABECALHO.pack(MAGICO, VERSAO, k, m, n))
+        f.write(bits.tobytes())
+    os.replace(tmp, caminho_saida)
+    return n, m, k
+
+
+# ---------- Consulta (sem NumPy) ----------
+class ListaBloqueio:
+    """
+    Filtro gerado por construir(), mapeado em memória. `senha in lista`
+    custa um hash e até k leituras de byte.
+    """
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._arquivo = open(caminho, "rb")
+        try:
+            self._mm = mmap.mmap(self._arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # arquivo vazio
+            self._arquivo.close()
+            raise ValueError(f"arquivo não é uma lista de bloqueio: {caminho}")
+        if len(self._mm) < _CABECALHO.size or self._mm[:len(MAGICO)] != MAGICO:
+            self.fechar()
+            raise ValueError(f"arquivo não é uma lista de bloqueio: {caminho}")
+        _, versao, self.k, self.m, self.n = _CABECALHO.unpack_from(self._mm, 0)
+        if versao != VERSAO:
+            self.fechar()
+            raise ValueError(f"versão de lista de bloqueio não suportada: {versao}")
+        if len(self._mm) != _CABECALHO.size + self.m // 8:
+            self.fechar()
+            raise ValueError(f"lista de bloqueio truncada: {caminho}")
+
+    def __reduce__(self):
+        # processos do gerador paralelo reabrem o arquivo (o mmap não é copiado)
+        return (ListaBloqueio, (self.caminho,))
+
+    def __contains__(self, senha):
+        if isinstance(senha, str):
+            senha = senha.encode("utf-8")
+        h1, h2 = hashes(senha)
+        mm, m, inicio = self._mm, self.m, _CABECALHO.size
+        for i in range(self.k):
+            p = ((h1 + i * h2) & _MASCARA) % m
+            if not mm[inicio + (p >> 3)] >> (p & 7) & 1:
+                return False
+        return True
+
+    def contem_lote(self, matriz, h1=None, h2=None):
+        # bool por linha da matriz uint8 (senhas do mesmo tamanho)
+        import numpy as np
+        if h1 is None:
+            h1, h2 = hashes_lote(matriz)
+        bits = np.frombuffer(self._mm, dtype=np.uint8, offset=_CABECALHO.size)
+        pos = _posicoes_lote(h1, h2, self.k, self.m, np)
+        return ((bits[pos >> np.uint64(3)] >> (pos & np.uint64(7)).astype(np.uint8)) & 1).all(axis=1)
+
+    def taxa_falsos(self):
+        # estimativa para a ocupação real do filtro
+        return (1 - math.exp(-self.k * self.n / self.m)) ** self.k
+
+    def fechar(self):
+        self._mm.close()
+        self._arquivo.close()
+
+
+# ---------- Unicidade ----------
+class VerificadorUnicidade:
+    """
+    Filtro de Bloom em blocos: cada senha liga k bits de uma única palavra
+    de 64 bits (uma leitura por consulta). Sem falsos negativos, então uma
+    senha nunca passa duas vezes; um falso positivo descarta uma senha
+    inédita, que o gerador repõe.
+    """
+
+    def __init__(self, capacidade, bits_por_senha=BITS_POR_SENHA_UNICIDADE):
+        import numpy as np
+        self.palavras = np.zeros(max(1, math.ceil(capacidade * bits_por_senha / 64)), dtype=np.uint64)
+        self.k = max(1, min(10, round(bits_por_senha * math.log(2))))
+        self.vistas = 0
+
+    def novas(self, matriz, h1=None, h2=None, limite=None):
+        """
+        Marca como vistas e devolve (bool por linha) as senhas inéditas da
+        matriz; com `limite`, só as primeiras `limite` inéditas.
+        """
+        import numpy as np
+        if h1 is None:
+            h1, h2 = hashes_lote(matriz)
+        n = len(h1)
+        # repetidas dentro do próprio bloco: só a primeira conta
+        _, primeiras = np.unique(h1, return_index=True)
+        nova = np.zeros(n, dtype=bool)
+        nova[primeiras] = True
+        palavra = h1 % np.uint64(len(self.palavras))
+        mascara = np.zeros(n, dtype=np.uint64)
+        for i in range(self.k):
+            # 6 bits de h2 por posição na palavra (o bit 0 de h2 é sempre 1)
+            mascara |= np.left_shift(np.uint64(1), (h2 >> np.uint64(6 * i + 1)) & np.uint64(63))
+        nova &= (self.palavras[palavra] & mascara) != mascara
+        if limite is not None:
+            nova[np.flatnonzero(nova)[limite:]] = False  # as demais continuam livres
+        np.bitwise_or.at(self.palavras, palavra[nova], mascara[nova])
+        self.vistas += int(nova.sum())
+        return nova
+
+    @property
+    def bytes_memoria(self):
+        return self.palavras.nbytes
+
+
+def taxa_falsos_unicidade(bits_por_senha=BITS_POR_SENHA_UNICIDADE):
+    # Falsos positivos do VerificadorUnicidade cheio: carga de Poisson por
+    # palavra de 64 bits, k bits por senha na mesma palavra
+    k = max(1, min(10, round(bits_por_senha * math.log(2))))
+    carga = 64 / bits_por_senha
+    taxa, termo = 0.0, math.exp(-carga)
+    for j in range(200):
+        taxa += termo * (1 - (63 / 64) ** (k * j)) ** k
+        termo *= carga / (j + 1)
+    return taxa
+
+
+def limite_unicas(total, bits_por_senha=BITS_POR_SENHA_UNICIDADE):
+    """
+    Quantas senhas únicas dá para pedir entre `total` possíveis: as últimas
+    inéditas podem cair em falsos positivos do verificador e nunca passar,
+    então fica de fora uma margem do dobro da taxa de falsos.
+    """
+    return max(0, total - math.ceil(2 * total * taxa_falsos_unicidade(bits_por_senha)) - 1)
+
+
+class FiltroSenhas:
+    """
+    Filtro dos blocos do gerador_senha.py: tira as senhas da lista de
+    bloqueio e, com unicas=True, as já geradas. `capacidade` = senhas
+    esperadas no total (dimensiona o verificador de unicidade).
+    """
+
+    def __init__(self, bloqueio=None, unicas=False, capacidade=0):
+        if isinstance(bloqueio, str):
+            bloqueio = ListaBloqueio(bloqueio)
+        self.bloqueio = bloqueio
+        self.unicidade = VerificadorUnicidade(capacidade) if unicas else None
+        self.recusadas = 0
+
+    def __contains__(self, senha):
+        # só a lista de bloqueio (senha avulsa, sem NumPy)
+        return self.bloqueio is not None and senha in self.bloqueio
+
+    def filtrar(self, bloco, tamanho, limite=None):
+        """
+        Bloco de linhas `tamanho` + b"\\n" -> as linhas aceitas, na mesma
+        ordem; com `limite`, só as primeiras `limite` aceitas (as seguintes
+        não contam como vistas nem como recusadas).
+        """
+        import numpy as np
+        if not bloco or (self.bloqueio is None and self.unicidade is None):
+            return bloco if limite is None else bloco[:limite * (tamanho + 1)]
+        linhas = np.frombuffer(bloco, dtype=np.uint8).reshape(-1, tamanho + 1)
+        h1, h2 = hashes_lote(linhas[:, :tamanho])
+        aceita = np.ones(len(linhas), dtype=bool)
+        if self.bloqueio is not None:
+            aceita &= ~self.bloqueio.contem_lote(None, h1, h2)
+        if self.unicidade is not None:
+            # só as aceitas entram no verificador (e contam como vistas)
+            idx = np.flatnonzero(aceita)
+            aceita[idx] = self.unicidade.novas(None, h1[idx], h2[idx], limite)
+        ultima = len(linhas)
+        if limite is not None:
+            usadas = np.flatnonzero(aceita)
+            if len(usadas) >= limite:  # linhas depois da última aceita ficam sem uso
+                ultima = int(usadas[limite - 1]) + 1 if limite else 0
+                aceita[ultima:] = False
+        recusadas = ultima - int(aceita.sum())
+        self.recusadas += recusadas
+        if not recusadas and ultima == len(linhas):
+            return bloco
+        return linhas[aceita].tobytes()
+
+
+# ---------- Main ----------
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Lista de bloqueio de senhas (filtro de Bloom em disco).")
+    parser.add_argument("--construir", metavar="LISTA", help="lista de senhas, uma por linha")
+    parser.add_argument("--saida", help="arquivo do filtro gerado por --construir")
+    parser.add_argument("--falsos", type=float, default=TAXA_FALSOS, help="taxa de falsos positivos")
+    parser.add_argument("--filtro", help="filtro existente (para --consultar)")
+    parser.add_argument("--consultar", nargs="*", default=[], metavar="SENHA")
+    args = parser.parse_args(argv)
+
+    if args.construir:
+        if not args.saida:
+            parser.error("--construir precisa de --saida")
+        if not 0 < args.falsos < 1:
+            parser.error("--falsos precisa estar entre 0 e 1")
+        inicio = time.perf_counter()
+        try:
+            n, m, k = construir(args.construir, args.saida, args.falsos,
+                                progresso=lambda lidas, total: print(f"  {lidas:,} / {total:,}", flush=True))
+        except OSError as e:
+            parser.error(str(e))
+        print(f"{n:,} senhas -> {args.saida}: {m // 8 / 1e6:,.1f} MB, k={k}, {m / max(n, 1):.1f} bits por senha "
+              f"({time.perf_counter() - inicio:.1f}s)")
+        args.filtro = args.filtro or args.saida
+
+    if args.consultar:
+        if not args.filtro:
+            parser.error("--consultar precisa de --filtro (ou --construir)")
+        try:
+            lista = ListaBloqueio(args.filtro)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+        for senha in args.consultar:
+            print(f"{'BLOQUEADA' if senha in lista else 'ok':<10} {senha}")
+        print(f"({lista.n:,} senhas no filtro, ~{lista.taxa_falsos():.1e} de falsos positivos)")
+        lista.fechar()
+    elif not args.construir:
+        parser.error("use --construir ou --consultar")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+# Batalha dos Feiticeiros — Gerador de Carga do Servidor de Partidas
+# Abre `conexoes` clientes asyncio contra o servidor_partidas.py; cada um
+# joga partidas seguidas (uma política de politicas.py lendo o EspelhoMotor)
+# até completar `partidas`. No modo pvp os clientes são pareados pelo
+# servidor e jogam um contra o outro.
+# Mede do lado do cliente partidas/s e o tempo de ida e volta de cada ação
+# (envio -> jogada publicada) e, no fim, pede as métricas do servidor.
+#
+# --local sobe o servidor no mesmo processo (mesmo laço de eventos): prático
+# para um teste rápido, mas cliente e servidor dividem a CPU; para medir o
+# servidor, rode-o em outro processo.
+#
+# Execução:
+#   python carga_partidas.py --local --partidas 5000 --conexoes 500
+#   python carga_partidas.py --endereco 127.0.0.1:8765 --partidas 20000 --conexoes 1000 --modo pvp
+
+import asyncio
+import json
+import random
+import sys
+import time
+
+from cliente_partidas import EspelhoMotor, endereco
+from instrumentacao import Serie
+from motor_batalha import DIFICULDADES_IA_EMBUTIDA
+from politicas import POLITICAS, ia_padrao
+from servidor_partidas import HOST, PORTA, TAMANHO_LINHA, VEZ, ServidorPartidas, linha, servir
+
+
+class Carga:
+    def __init__(self, partidas, modo, dificuldade, politica):
+        # pvp: cada partida ocupa duas entradas (uma por lado)
+        self.entradas = partidas * (2 if modo == "pvp" else 1)
+        self.modo = modo
+        self.dificuldade = dificuldade
+        self.politica = POLITICAS[politica]
+        self.terminadas = 0
+        self.vitorias = {"player": 0, "enemy": 0, None: 0}
+        self.acoes = 0
+        self.erros = 0
+        self.ida_e_volta = Serie()
+
+    def pedir(self):
+        if self.entradas <= 0:
+            return False
+        self.entradas -= 1
+        return True
+
+    def escolher(self, espelho, lado, rng):
+        acao = self.politica(espelho, lado, rng)
+        if acao is None:  # "ia" do lado inimigo: o servidor só aceita ações explícitas
+            acao = ia_padrao(espelho, lado, rng)
+        return acao
+
+
+async def _abrir(texto):
+    tipo, alvo = endereco(texto)
+    if tipo == "tcp":
+        return await asyncio.open_connection(*alvo, limit=TAMANHO_LINHA)
+    return await asyncio.open_unix_connection(alvo, limit=TAMANHO_LINHA)
+
+
+async def _cliente(texto, carga, semente):
+    rng = random.Random(semente)
+    reader, writer = await _abrir(texto)
+    espelho = EspelhoMotor(carga.dificuldade)
+    try:
+        while carga.pedir():
+            writer.write(linha({"op": "entrar", "modo": carga.modo, "dificuldade": carga.dificuldade}))
+            lado = enviada = None
+            while True:
+                dados = await reader.readline()
+                if not dados:
+                    return
+                msg = json.loads(dados)
+                tipo = msg["tipo"]
+                if tipo == "inicio":
+                    lado = msg["lado"]
+                    espelho.reiniciar(msg["dificuldade"])
+                    espelho.atualizar(msg["estado"])
+                elif tipo == "jogada":
+                    if enviada is not None and msg["quem"] == lado:
+                        carga.ida_e_volta.adicionar(time.perf_counter() - enviada)
+                        enviada = None
+                    espelho.atualizar(msg["estado"])
+                elif tipo == "fim":
+                    if lado == "player":  # uma contagem por partida, também no pvp
+                        carga.terminadas += 1
+                        carga.vitorias[msg["vencedor"]] += 1
+                    break
+                elif tipo == "erro":
+                    carga.erros += 1
+                    return
+                if lado is not None and tipo != "aguardando" and espelho.fase == VEZ[lado] and not espelho.game_over:
+                    enviada = time.perf_counter()
+                    writer.write(linha({"op": "acao", "acao": carga.escolher(espelho, lado, rng)}))
+                    carga.acoes += 1
+                    await writer.drain()
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def _metricas_servidor(texto):
+    reader, writer = await _abrir(texto)
+    try:
+        writer.write(linha({"op": "metricas"}))
+        return json.loads(await reader.readline())
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def gerar_carga(texto, partidas, conexoes, modo="ia", dificuldade="Normal", politica="aleatoria",
+                      semente=0, local=False):
+    tarefa_servidor = servidor_local = None
+    if local:
+        pronto = asyncio.Event()
+        tipo, alvo = endereco(texto)
+        host, porta, unix = (*alvo, None) if tipo == "tcp" else (HOST, PORTA, alvo)
+        servidor_local = ServidorPartidas()
+        tarefa_servidor = asyncio.create_task(servir(servidor_local, host, porta, unix, pronto=pronto))
+        await pronto.wait()
+    carga = Carga(partidas, modo, dificuldade, politica)
+    inicio = time.perf_counter()
+    try:
+        resultados = await asyncio.gather(*(_cliente(texto, carga, semente + i) for i in range(conexoes)),
+                                          return_exceptions=True)
+        duracao = time.perf_counter() - inicio
+        falhas = [r for r in resultados if isinstance(r, BaseException)]
+        servidor = await _metricas_servidor(texto)
+    finally:
+        if tarefa_servidor is not None:
+            # deixa o servidor ver o fim de cada conexão antes de pará-lo
+            for _ in range(100):
+                if not servidor_local.conexoes:
+                    break
+                await asyncio.sleep(0.01)
+            tarefa_servidor.cancel()
+    p50, p95, p99 = carga.ida_e_volta.percentis(50, 95, 99)
+    return {
+        "partidas": carga.terminadas,
+        "segundos": duracao,
+        "partidas_por_s": carga.terminadas / max(duracao, 1e-9),
+        "acoes_por_s": carga.acoes / max(duracao, 1e-9),
+        "ida_e_volta_ms": {"p50": 1000 * p50, "p95": 1000 * p95, "p99": 1000 * p99,
+                           "max": 1000 * carga.ida_e_volta.maximo},
+        "vitorias": carga.vitorias,
+        "erros": carga.erros,
+        "falhas": [repr(f) for f in falhas[:5]],
+        "n_falhas": len(falhas),
+        "servidor": servidor,
+    }
+
+
+# ---------- Main ----------
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Gerador de carga para o servidor de partidas.")
+    parser.add_argument("--endereco", default=f"{HOST}:{PORTA}", help="host:porta ou caminho do socket Unix")
+    parser.add_argument("--partidas", type=int, default=5000)
+    parser.add_argument("--conexoes", type=int, default=500, help="clientes simultâneos")
+    parser.add_argument("--modo", default="ia", choices=("ia", "pvp"))
+    parser.add_argument("--dificuldade", default="Normal", choices=DIFICULDADES_IA_EMBUTIDA)
+    parser.add_argument("--politica", default="aleatoria", choices=list(POLITICAS))
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--local", action="store_true", help="sobe o servidor neste processo")
+    args = parser.parse_args(argv)
+    if args.modo == "pvp" and args.conexoes < 2:
+        parser.error("o modo pvp precisa de pelo menos 2 conexões")
+
+    try:
+        r = asyncio.run(gerar_carga(args.endereco, args.partidas, args.conexoes, args.modo, args.dificuldade,
+                                    args.politica, args.semente, args.local))
+    except OSError as e:
+        parser.error(f"sem conexão com {args.endereco}: {e}")
+    lat = r["ida_e_volta_ms"]
+    print(f"{r['partidas']:,} partidas em {r['segundos']:.2f}s: {r['partidas_por_s']:,.0f} partidas/s, "
+          f"{r['acoes_por_s']:,.0f} ações/s ({args.conexoes} conexões, modo {args.modo})")
+    print(f"Ida e volta por ação: p50 {lat['p50']:.2f}  p95 {lat['p95']:.2f}  p99 {lat['p99']:.2f}  "
+          f"máx {lat['max']:.2f} ms")
+    v = r["vitorias"]
+    print(f"Vencedor: jogador {v['player']:,} | inimigo {v['enemy']:,} | sem vencedor {v[None]:,}")
+    s = r["servidor"]
+    print(f"Servidor: {s['partidas_terminadas']:,} terminadas, latência p50 {s['latencia_ms']['p50']:.3f} "
+          f"p99 {s['latencia_ms']['p99']:.3f} ms, {s['partidas_por_s_media']:,.0f} partidas/s desde o início")
+    if r["erros"] or r["n_falhas"]:
+        print(f"Erros do servidor: {r['erros']} | clientes que falharam: {r['n_falhas']} {r['falhas']}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
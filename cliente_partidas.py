@@ -0,0 +1,125 @@
+# Batalha dos Feiticeiros — Cliente do Servidor de Partidas
+# Peças para jogar numa partida do servidor_partidas.py:
+# - EspelhoMotor: o estado que o servidor publica, com os mesmos nomes de
+#   atributos do MotorBatalha (a interface, as políticas e o gerador de carga
+#   leem dele como leriam do motor); os eventos chegam prontos do servidor
+# - ClientePartidas: socket bloqueante + thread leitora; as mensagens ficam
+#   numa fila que a interface esvazia no seu próprio laço (root.after)
+# - abrir_conexao / endereco: "host:porta" ou caminho de socket Unix
+
+import json
+import queue
+import socket
+import threading
+from array import array
+
+from feiticos import EFEITOS
+from motor_batalha import DIFICULDADES
+from progressao import MAGIA_BASE, NIVEL_BASE, TABELA_BASE
+from servidor_partidas import CAMPOS_ESTADO, HOST, PORTA, linha
+
+
+def endereco(texto):
+    # "host:porta" -> ("tcp", (host, porta)); outro texto -> ("unix", caminho)
+    texto = (texto or "").strip() or f"{HOST}:{PORTA}"
+    host, sep, porta = texto.rpartition(":")
+    if sep and porta.isdigit() and "/" not in texto:
+        return "tcp", (host or HOST, int(porta))
+    return "unix", texto
+
+
+class EspelhoMotor:
+    """Cópia, só para leitura, do estado de uma partida que roda no servidor."""
+
+    def __init__(self, dificuldade="Normal"):
+        self.reiniciar(dificuldade)
+
+    def reiniciar(self, dificuldade):
+        self.dificuldade = dificuldade
+        self.enemy_acc_mod = DIFICULDADES[dificuldade]["enemy_acc_mod"]
+        self.semente = None  # fica no servidor
+        # o servidor joga com os feiticeiros de base (progressao.py)
+        self.feiticeiro_jogador = self.feiticeiro_inimigo = (MAGIA_BASE, NIVEL_BASE)
+        self.tabela_jogador = self.tabela_inimigo = TABELA_BASE
+        self.acoes = bytearray()
+        self.eventos = []
+        self.status_player = EFEITOS.novo_estado()
+        self.status_enemy = EFEITOS.novo_estado()
+        for c in CAMPOS_ESTADO:
+            setattr(self, c, None)
+        self.game_over = False
+
+    def atualizar(self, estado, eventos=()):
+        for c in CAMPOS_ESTADO:
+            setattr(self, c, estado[c])
+        self.status_player = array("h", estado["status_player"])
+        self.status_enemy = array("h", estado["status_enemy"])
+        self.eventos.extend(tuple(ev) for ev in eventos)
+
+    def drenar_eventos(self):
+        eventos = self.eventos
+        self.eventos = []
+        return eventos
+
+
+def abrir_conexao(texto, espera=5.0):
+    tipo, alvo = endereco(texto)
+    if tipo == "tcp":
+        s = socket.create_connection(alvo, timeout=espera)
+        s.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    else:
+        s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        s.settimeout(espera)
+        s.connect(alvo)
+    s.settimeout(None)
+    return s
+
+
+class ClientePartidas:
+    def __init__(self, texto_endereco):
+        self.endereco = texto_endereco
+        self._socket = abrir_conexao(texto_endereco)
+        self._arquivo = self._socket.makefile("rb")
+        self.mensagens = queue.Queue()  # dicts do servidor; None = conexão fechada
+        self._thread = threading.Thread(target=self._ler, name="cliente-partidas", daemon=True)
+        self._thread.start()
+
+    def _ler(self):
+        try:
+            for dados in self._arquivo:
+                try:
+                    self.mensagens.put(json.loads(dados))
+                except ValueError:
+                    continue
+        except OSError:
+            pass
+        self.mensagens.put(None)
+
+    def enviar(self, **msg):
+        self._socket.sendall(linha(msg))
+
+    def entrar(self, modo="ia", dificuldade="Normal"):
+        self.enviar(op="entrar", modo=modo, dificuldade=dificuldade)
+
+    def agir(self, acao):
+        self.enviar(op="acao", acao=acao)
+
+    def recebidas(self):
+        # Tudo o que já chegou, sem bloquear
+        saida = []
+        while True:
+            try:
+                saida.append(self.mensagens.get_nowait())
+            except queue.Empty:
+                return saida
+
+    def fechar(self):
+        try:
+            self.enviar(op="sair")
+        except OSError:
+            pass
+        try:
+            self._socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._socket.close()
@@ -0,0 +1,105 @@
+# Batalha dos Feiticeiros — Efeitos de Status
+# Efeitos são declarados como dados (seção "efeitos" de feiticos.json):
+#   dano_por_turno, cura_por_turno, pula_turno, reducao_dano (%)
+# O estado de cada combatente é um array pequeno de inteiros (turnos
+# restantes por efeito, na ordem da tabela). tique() aplica todos os
+# efeitos ativos numa única passada no início do turno de quem os carrega,
+# sem criar dicts; o simulador vetorizado usa as mesmas colunas em NumPy.
+
+from array import array
+from collections import namedtuple
+
+Efeito = namedtuple("Efeito", (
+    "indice", "id", "nome", "emoji", "dano_por_turno", "cura_por_turno", "pula_turno", "reducao_dano",
+))
+
+# Usados quando o arquivo de dados não declara efeitos (formato antigo)
+EFEITOS_PADRAO = [
+    {"id": "queimadura", "nome": "Queimadura", "emoji": "🔥", "dano_por_turno": 5},
+    {"id": "congelado", "nome": "Congelado", "emoji": "🧊", "pula_turno": True},
+    {"id": "atordoado", "nome": "Atordoado", "emoji": "💫", "pula_turno": True},
+]
+
+VIDA_MAXIMA = 100  # teto da cura (o mesmo da poção)
+
+
+class TabelaEfeitos:
+    """
+    por_indice: tupla de Efeito; indice: {id: posição no array de status}.
+    As colunas dano/cura/pula/reducao são tuplas paralelas (uma entrada por
+    efeito) para o laço de tique() e para os arrays do simulador.
+    """
+
+    def __init__(self, efeitos):
+        self.por_indice = tuple(efeitos)
+        self.indice = {e.id: e.indice for e in self.por_indice}
+        self.dano = tuple(e.dano_por_turno for e in self.por_indice)
+        self.cura = tuple(e.cura_por_turno for e in self.por_indice)
+        self.pula = tuple(e.pula_turno for e in self.por_indice)
+        self.reducao = tuple(e.reducao_dano for e in self.por_indice)
+        self._faixa = range(len(self.por_indice))
+        self._com_reducao = tuple(i for i in self._faixa if self.reducao[i])
+
+    def __len__(self):
+        return len(self.por_indice)
+
+    def __iter__(self):
+        return iter(self.por_indice)
+
+    def novo_estado(self):
+        return array("h", bytes(2 * len(self.por_indice)))
+
+    def tique(self, status):
+        """
+        Início do turno de quem carrega `status`: soma dano e cura de todos
+        os efeitos ativos, diz se o turno é perdido e desconta um turno de
+        cada efeito. Devolve (dano, cura, pula, índice do 1º efeito que
+        causou dano ou -1).
+        """
+        dano = cura = 0
+        pula = False
+        fonte = -1
+        for i in self._faixa:
+            if status[i]:
+                if self.dano[i]:
+                    dano += self.dano[i]
+                    if fonte < 0:
+                        fonte = i
+                cura += self.cura[i]
+                pula = pula or self.pula[i]
+                status[i] -= 1
+        return dano, cura, pula, fonte
+
+    def reducao_dano(self, status):
+        # maior redução (%) entre os efeitos ativos do alvo
+        r = 0
+        for i in self._com_reducao:
+            if status[i] and self.reducao[i] > r:
+                r = self.reducao[i]
+        return r
+
+
+def de_dados(lista, origem="<dados>"):
+    efeitos = []
+    for k, d in enumerate(lista or EFEITOS_PADRAO):
+        if "id" not in d:
+            raise ValueError(f"{origem}: efeito #{k} sem 'id'")
+        for c in ("dano_por_turno", "cura_por_turno", "reducao_dano"):
+            v = d.get(c, 0)
+            if not isinstance(v, int) or v < 0:
+                raise ValueError(f"{origem}: efeito '{d['id']}': {c} precisa ser inteiro >= 0")
+        if d.get("reducao_dano", 0) > 100:
+            raise ValueError(f"{origem}: efeito '{d['id']}': reducao_dano vai de 0 a 100")
+        efeitos.append(Efeito(
+            indice=k,
+            id=d["id"],
+            nome=d.get("nome", d["id"].capitalize()),
+            emoji=d.get("emoji", "✨"),
+            dano_por_turno=d.get("dano_por_turno", 0),
+            cura_por_turno=d.get("cura_por_turno", 0),
+            pula_turno=bool(d.get("pula_turno", False)),
+            reducao_dano=d.get("reducao_dano", 0),
+        ))
+    if len({e.id for e in efeitos}) != len(efeitos):
+        raise ValueError(f"{origem}: ids de efeito repetidos")
+    return TabelaEfeitos(efeitos)
@@ -0,0 +1,57 @@
+# Batalha dos Feiticeiros — Estado Observável
+# Camada entre o motor e os widgets de status:
+# - Cada campo (vida, mana, poções) guarda o último valor publicado e
+#   avisa só os widgets ligados a ele quando o valor muda
+# - Mudanças são acumuladas e aplicadas numa única atualização por volta
+#   do laço de eventos (after_idle), por mais que o campo mude antes disso
+# - O motor continua com atributos simples (sem custo nas simulações);
+#   sincronizar() lê os campos dele e publica só o que mudou
+
+CAMPOS_STATUS = ("vida_jogador", "vida_inimigo", "mana_jogador", "mana_inimigo", "pocoes")
+
+
+class EstadoObservavel:
+    def __init__(self, root, campos=CAMPOS_STATUS):
+        self.root = root
+        self.valores = dict.fromkeys(campos)
+        self.assinantes = {c: [] for c in campos}
+        self._sujos = set()
+        self._agendado = None
+        self.atualizacoes = 0  # contadores para perfilamento (em widgets)
+        self.evitadas = 0
+
+    def ligar(self, campo, funcao):
+        """funcao(valor) atualiza um widget; é chamada quando `campo` muda."""
+        self.assinantes[campo].append(funcao)
+        self._sujos.add(campo)
+        self._agendar()
+
+    def publicar(self, campo, valor):
+        if campo in self._sujos:
+            # já vai ser aplicado nesta volta: só troca o valor
+            self.valores[campo] = valor
+            self.evitadas += len(self.assinantes[campo])
+            return
+        if valor == self.valores[campo]:
+            self.evitadas += len(self.assinantes[campo])
+            return
+        self.valores[campo] = valor
+        self._sujos.add(campo)
+        self._agendar()
+
+    def sincronizar(self, origem):
+        for campo in self.valores:
+            self.publicar(campo, getattr(origem, campo))
+
+    def _agendar(self):
+        if self._agendado is None:
+            self._agendado = self.root.after_idle(self.descarregar)
+
+    def descarregar(self):
+        self._agendado = None
+        sujos, self._sujos = self._sujos, set()
+        for campo in sujos:
+            valor = self.valores[campo]
+            for funcao in self.assinantes[campo]:
+                funcao(valor)
+            self.atualizacoes += len(self.assinantes[campo])
@@ -0,0 +1,245 @@
+# Batalha dos Feiticeiros — Estatísticas
+# Toda partida terminada (na interface ou em simulação) vira uma linha numa
+# base SQLite local:
+# - inserções em lote: registrar() só acumula; gravar() faz um executemany
+#   numa única transação (automático a cada TAMANHO_LOTE partidas)
+# - índice (dificuldade, data, vencedor, turnos) cobre as consultas por
+#   período sem ler a tabela; outro índice em data
+# - tabelas de resumo (por dificuldade/origem e por feitiço/lado) somadas na
+#   mesma transação: o painel lê só os resumos, então abre em poucos ms
+#   mesmo com milhões de partidas
+# Os contadores por feitiço vêm do motor (lancamentos / acertos_feiticos)
+# e são guardados pelo id do feitiço, não pela posição no arquivo de dados.
+#
+# Base padrão: salvamentos/estatisticas.db (ou BATALHA_ESTATISTICAS=caminho)
+#
+# Execução:
+#   python estatisticas.py
+#   python estatisticas.py --simular 1000000 --dificuldade Difícil
+
+import os
+import sqlite3
+import time
+
+from motor_batalha import N_FEITICOS, REGISTRO
+
+BANCO = os.environ.get("BATALHA_ESTATISTICAS") or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "salvamentos", "estatisticas.db")
+TAMANHO_LOTE = 10000  # partidas por transação
+_VENCEDORES = {None: 0, "player": 1, "enemy": 2}
+_LADOS = (("jogador", 0), ("inimigo", N_FEITICOS))
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS partidas (
+    id INTEGER PRIMARY KEY,
+    data REAL NOT NULL,
+    dificuldade TEXT NOT NULL,
+    origem TEXT NOT NULL,
+    vencedor INTEGER NOT NULL,
+    turnos INTEGER NOT NULL,
+    acertos_jogador INTEGER NOT NULL,
+    acertos_inimigo INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS partidas_dificuldade_data ON partidas (dificuldade, data, vencedor, turnos);
+CREATE INDEX IF NOT EXISTS partidas_data ON partidas (data);
+CREATE TABLE IF NOT EXISTS resumo (
+    dificuldade TEXT NOT NULL,
+    origem TEXT NOT NULL,
+    partidas INTEGER NOT NULL,
+    vitorias INTEGER NOT NULL,
+    derrotas INTEGER NOT NULL,
+    turnos INTEGER NOT NULL,
+    acertos_jogador INTEGER NOT NULL,
+    acertos_inimigo INTEGER NOT NULL,
+    PRIMARY KEY (dificuldade, origem)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS resumo_feiticos (
+    dificuldade TEXT NOT NULL,
+    origem TEXT NOT NULL,
+    feitico TEXT NOT NULL,
+    lado TEXT NOT NULL,
+    lancamentos INTEGER NOT NULL,
+    acertos INTEGER NOT NULL,
+    PRIMARY KEY (dificuldade, origem, feitico, lado)
+) WITHOUT ROWID;
+"""
+
+
+class Estatisticas:
+    def __init__(self, caminho=BANCO, lote=TAMANHO_LOTE):
+        if caminho != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+        self.caminho = caminho
+        self.lote = lote
+        self.con = sqlite3.connect(caminho)
+        self.con.execute("PRAGMA journal_mode=WAL")
+        self.con.execute("PRAGMA synchronous=NORMAL")
+        self.con.executescript(_ESQUEMA)
+        self._linhas = []
+        self._resumo = {}  # (dificuldade, origem) -> [partidas, vitorias, derrotas, turnos, acertos_j, acertos_i]
+        self._feiticos = {}  # (dificuldade, origem) -> ([lançamentos], [acertos]) na ordem do motor
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+    # ---------- Escrita ----------
+    def registrar(self, motor, origem="jogo", data=None):
+        """Acumula a partida (terminada) de `motor`; grava a cada `lote` partidas."""
+        vencedor = _VENCEDORES[motor.vencedor]
+        chave = (motor.dificuldade, origem)
+        self._linhas.append((time.time() if data is None else data, motor.dificuldade, origem, vencedor,
+                             motor.turnos, motor.acertos_player, motor.acertos_enemy))
+        r = self._resumo.get(chave)
+        if r is None:
+            r = self._resumo[chave] = [0] * 6
+            self._feiticos[chave] = ([0] * (2 * N_FEITICOS), [0] * (2 * N_FEITICOS))
+        r[0] += 1
+        r[1] += vencedor == 1
+        r[2] += vencedor == 2
+        r[3] += motor.turnos
+        r[4] += motor.acertos_player
+        r[5] += motor.acertos_enemy
+        lancamentos, acertos = self._feiticos[chave]
+        for i, (n, a) in enumerate(zip(motor.lancamentos, motor.acertos_feiticos)):
+            if n:
+                lancamentos[i] += n
+                acertos[i] += a
+        if len(self._linhas) >= self.lote:
+            self.gravar()
+
+    def gravar(self):
+        # Uma transação: partidas novas + soma nos resumos (UPSERT)
+        if not self._linhas:
+            return 0
+        feiticos = []
+        for (dificuldade, origem), (lancamentos, acertos) in self._feiticos.items():
+            for lado, base in _LADOS:
+                for f in REGISTRO:
+                    n = lancamentos[base + f.indice]
+                    if n:
+                        feiticos.append((dificuldade, origem, f.id, lado, n, acertos[base + f.indice]))
+        with self.con:
+            self.con.executemany(
+                "INSERT INTO partidas (data, dificuldade, origem, vencedor, turnos, acertos_jogador, "
+                "acertos_inimigo) VALUES (?, ?, ?, ?, ?, ?, ?)", self._linhas)
+            self.con.executemany(
+                "INSERT INTO resumo VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT (dificuldade, origem) DO UPDATE SET "
+                "partidas = partidas + excluded.partidas, vitorias = vitorias + excluded.vitorias, "
+                "derrotas = derrotas + excluded.derrotas, turnos = turnos + excluded.turnos, "
+                "acertos_jogador = acertos_jogador + excluded.acertos_jogador, "
+                "acertos_inimigo = acertos_inimigo + excluded.acertos_inimigo",
+                [(*chave, *r) for chave, r in self._resumo.items()])
+            self.con.executemany(
+                "INSERT INTO resumo_feiticos VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (dificuldade, origem, feitico, lado) DO UPDATE SET "
+                "lancamentos = lancamentos + excluded.lancamentos, acertos = acertos + excluded.acertos",
+                feiticos)
+        n = len(self._linhas)
+        self._linhas = []
+        self._resumo.clear()
+        self._feiticos.clear()
+        return n
+
+    def fechar(self):
+        self.gravar()
+        self.con.close()
+
+    # ---------- Consultas ----------
+    def resumo(self, origem=None):
+        # Uma linha por (dificuldade, origem), lida da tabela de resumo
+        sql = "SELECT * FROM resumo" + (" WHERE origem = ?" if origem else "") + " ORDER BY dificuldade, origem"
+        return [_com_taxas(dict(zip(("dificuldade", "origem", "partidas", "vitorias", "derrotas", "turnos",
+                                     "acertos_jogador", "acertos_inimigo"), linha)))
+                for linha in self.con.execute(sql, (origem,) if origem else ())]
+
+    def resumo_feiticos(self, dificuldade=None, origem=None):
+        # {(feitico, lado): (lançamentos, acertos)} somando as dificuldades/origens pedidas
+        filtros, args = [], []
+        if dificuldade:
+            filtros.append("dificuldade = ?")
+            args.append(dificuldade)
+        if origem:
+            filtros.append("origem = ?")
+            args.append(origem)
+        sql = ("SELECT feitico, lado, SUM(lancamentos), SUM(acertos) FROM resumo_feiticos"
+               + (" WHERE " + " AND ".join(filtros) if filtros else "") + " GROUP BY feitico, lado")
+        return {(f, lado): (n, a) for f, lado, n, a in self.con.execute(sql, args)}
+
+    def periodo(self, desde, ate=None, dificuldade=None):
+        """
+        Partidas com data em [desde, ate), por dificuldade, direto da tabela
+        de partidas (usa só o índice de dificuldade e data).
+        """
+        ate = time.time() if ate is None else ate
+        dificuldades = [dificuldade] if dificuldade else [
+            d for (d,) in self.con.execute("SELECT DISTINCT dificuldade FROM resumo")]
+        resultado = []
+        for d in dificuldades:
+            partidas, vitorias, turnos = self.con.execute(
+                "SELECT COUNT(*), SUM(vencedor = 1), SUM(turnos) FROM partidas "
+                "WHERE dificuldade = ? AND data >= ? AND data < ?", (d, desde, ate)).fetchone()
+            if partidas:
+                resultado.append({"dificuldade": d, "partidas": partidas, "vitorias": vitorias,
+                                  "taxa_vitoria": vitorias / partidas, "turnos_medios": turnos / partidas})
+        return resultado
+
+
+def _com_taxas(r):
+    n = max(1, r["partidas"])
+    r["taxa_vitoria"] = r["vitorias"] / n
+    r["turnos_medios"] = r["turnos"] / n
+    return r
+
+
+# ---------- Main ----------
+def main(argv=None):
+    import argparse
+
+    from motor_batalha import DIFICULDADES_IA_EMBUTIDA, simular
+
+    parser = argparse.ArgumentParser(description="Estatísticas das partidas (SQLite).")
+    parser.add_argument("--banco", default=BANCO)
+    parser.add_argument("--simular", type=int, default=0, metavar="PARTIDAS",
+                        help="simula e registra partidas antes de mostrar o resumo")
+    parser.add_argument("--dificuldade", default="Normal", choices=DIFICULDADES_IA_EMBUTIDA)
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--dias", type=float, default=7, help="período da tabela de partidas recentes")
+    args = parser.parse_args(argv)
+
+    with Estatisticas(args.banco) as est:
+        if args.simular:
+            inicio = time.perf_counter()
+            simular(args.simular, args.dificuldade, args.semente, estatisticas=est)
+            est.gravar()
+            duracao = time.perf_counter() - inicio
+            print(f"{args.simular:,} partidas simuladas e registradas em {duracao:.2f}s")
+
+        inicio = time.perf_counter()
+        linhas = est.resumo()
+        feiticos = est.resumo_feiticos()
+        duracao = time.perf_counter() - inicio
+        recentes = est.periodo(time.time() - args.dias * 86400)
+
+        print(f"{'Dificuldade':<14}{'Origem':<12}{'Partidas':>12}{'Vitórias':>10}{'Turnos':>8}")
+        for r in linhas:
+            print(f"{r['dificuldade']:<14}{r['origem']:<12}{r['partidas']:>12,}"
+                  f"{100 * r['taxa_vitoria']:>9.1f}%{r['turnos_medios']:>8.2f}")
+        print(f"\nÚltimos {args.dias:g} dias:")
+        for r in recentes:
+            print(f"  {r['dificuldade']:<14}{r['partidas']:>12,}{100 * r['taxa_vitoria']:>9.1f}%"
+                  f"{r['turnos_medios']:>8.2f}")
+        print("\nAcerto por feitiço (jogador | inimigo):")
+        for f in REGISTRO:
+            partes = []
+            for lado, _ in _LADOS:
+                n, a = feiticos.get((f.id, lado), (0, 0))
+                partes.append(f"{n:>12,} lançados {100 * a / max(1, n):5.1f}%")
+            print(f"  {f.id:<10}" + " | ".join(partes))
+        print(f"\nResumos lidos em {1000 * duracao:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
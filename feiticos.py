@@ -0,0 +1,213 @@
+# Batalha dos Feiticeiros — Registro de Feitiços
+# Os feitiços vêm de um arquivo de dados (feiticos.json), lido uma vez na
+# importação. Cada feitiço vira um registro imutável (namedtuple) com um
+# índice inteiro; motor, simuladores, IA, botões, atalhos e tooltips leem
+# tudo daqui. Novo feitiço = nova entrada no JSON, sem mudar código.
+# Os status que os feitiços aplicam são declarados na seção "efeitos"
+# do mesmo arquivo (ver efeitos.py). Uma seção opcional "dificuldades"
+# ajusta os números iniciais de cada dificuldade do motor (arquivos gerados
+# pelo afinador_balanceamento.py trazem as duas coisas).
+#
+# Outro arquivo de dados pode ser usado com BATALHA_FEITICOS=caminho.json
+#
+# Execução (valida e lista o arquivo):
+#   python feiticos.py [caminho.json]
+
+import hashlib
+import json
+import os
+from collections import namedtuple
+
+import efeitos as _efeitos
+
+ARQUIVO_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "feiticos.json")
+VERSAO = 1  # campo "versao" do arquivo de dados (ausente = esta)
+
+# Quem recebe o status de um feitiço
+ALVOS_STATUS = ("oponente", "proprio")
+
+# Situações da IA do inimigo, em ordem de prioridade crescente (a última
+# que valer decide os pesos): ver MotorBatalha._escolha_ia
+REGRAS_IA = ("padrao", "jogador_fraco", "sem_mana", "jogador_defende")
+
+# Teclas já usadas pela interface
+TECLAS_RESERVADAS = ("p", "d")
+
+# Cada ação de um replay ocupa um byte (ver motor_batalha.codificar_acao)
+MAX_FEITICOS = 120
+
+# Campos que a seção "dificuldades" pode ajustar (motor_batalha.DIFICULDADES)
+CAMPOS_DIFICULDADE = ("vida", "mana", "vida_inimigo", "mana_inimigo", "enemy_acc_mod")
+
+Feitico = namedtuple("Feitico", (
+    "indice", "id", "nome", "rotulo", "emoji", "tecla", "dano", "chance", "mana",
+    "status", "status_chance", "status_turnos", "status_alvo", "descricao", "pesos_ia",
+    "efeito",  # índice do status no array de efeitos (-1 = nenhum)
+))
+
+FEITICO_NULO = Feitico(-1, "", "Feitiço", "Feitiço", "✨", "", 0, 0, 0, None, 0, 0, "oponente", "",
+                       (0,) * len(REGRAS_IA), -1)
+
+
+class RegistroFeiticos:
+    """
+    por_indice: tupla de Feitico (ordem do arquivo)
+    por_id: {id: Feitico}
+    pesos_ia: {regra: tupla com o peso de cada feitiço, na ordem de por_indice}
+    efeitos: efeitos.TabelaEfeitos com os status que os feitiços aplicam
+    dificuldades: {dificuldade: {campo: valor}} com os ajustes do arquivo
+    impressao: 8 bytes que mudam quando muda alguma regra (replays gravados
+    com outro arquivo de feitiços não batem)
+    """
+
+    def __init__(self, feiticos, efeitos, dificuldades=None):
+        self.efeitos = efeitos
+        self.dificuldades = dificuldades or {}
+        self.por_indice = tuple(feiticos)
+        self.por_id = {f.id: f for f in self.por_indice}
+        self.ids = tuple(self.por_id)
+        self.pesos_ia = {r: tuple(f.pesos_ia[k] for f in self.por_indice) for k, r in enumerate(REGRAS_IA)}
+        regras = ([(f.id, f.dano, f.chance, f.mana, f.efeito, f.status_chance, f.status_turnos,
+                    f.status_alvo, f.pesos_ia) for f in self.por_indice],
+                  [(e.id, e.dano_por_turno, e.cura_por_turno, e.pula_turno, e.reducao_dano) for e in efeitos])
+        if self.dificuldades:  # sem ajustes, a impressão é a mesma de antes da seção existir
+            regras += (sorted((d, sorted(a.items())) for d, a in self.dificuldades.items()),)
+        self.impressao = hashlib.blake2b(repr(regras).encode(), digest_size=8).digest()
+
+    def __len__(self):
+        return len(self.por_indice)
+
+    def __iter__(self):
+        return iter(self.por_indice)
+
+    # ---------- Textos da interface ----------
+    @staticmethod
+    def texto_botao(f):
+        return f"{f.emoji} {f.rotulo}\n({f.dano} dano, {f.chance}% acerto, {f.mana} mana)"
+
+    def texto_dica(self, f):
+        # a descrição pode citar os campos do feitiço e os do efeito que ele aplica
+        campos = f._asdict()
+        if f.efeito >= 0:
+            e = self.efeitos.por_indice[f.efeito]
+            campos.update(efeito_nome=e.nome, dano_por_turno=e.dano_por_turno, cura_por_turno=e.cura_por_turno,
+                          reducao_dano=e.reducao_dano)
+        return f.descricao.format(**campos)
+
+
+def _erro(origem, msg):
+    raise ValueError(f"{origem}: {msg}")
+
+
+def _registro(d, indice, origem, efeitos):
+    campos = ("id", "nome", "dano", "chance", "mana")
+    for c in campos:
+        if c not in d:
+            _erro(origem, f"feitiço #{indice} sem o campo '{c}'")
+    fid = d["id"]
+    for c in ("dano", "chance", "mana", "status_chance", "status_turnos"):
+        v = d.get(c, 0)
+        if not isinstance(v, int) or v < 0:
+            _erro(origem, f"'{fid}': {c} precisa ser inteiro >= 0")
+    if d["chance"] > 100 or d.get("status_chance", 0) > 100:
+        _erro(origem, f"'{fid}': chances vão de 0 a 100")
+    status = d.get("status")
+    if status is not None and status not in efeitos.indice:
+        _erro(origem, f"'{fid}': status desconhecido '{status}' (declarados: {', '.join(efeitos.indice)})")
+    alvo = d.get("status_alvo", "oponente")
+    if alvo not in ALVOS_STATUS:
+        _erro(origem, f"'{fid}': status_alvo precisa ser {' ou '.join(ALVOS_STATUS)}")
+    pesos = d.get("pesos_ia", {})
+    if not isinstance(pesos, dict) or set(pesos) - set(REGRAS_IA):
+        _erro(origem, f"'{fid}': pesos_ia aceita só {', '.join(REGRAS_IA)}")
+    return Feitico(
+        indice=indice,
+        id=fid,
+        nome=d["nome"],
+        rotulo=d.get("rotulo", d["nome"]),
+        emoji=d.get("emoji", "✨"),
+        tecla=d.get("tecla", ""),
+        dano=d["dano"],
+        chance=d["chance"],
+        mana=d["mana"],
+        status=status,
+        status_chance=d.get("status_chance", 0) if status else 0,
+        status_turnos=d.get("status_turnos", 1) if status else 0,
+        status_alvo=alvo,
+        descricao=d.get("descricao", ""),
+        pesos_ia=tuple(float(pesos.get(r, 1)) for r in REGRAS_IA),
+        efeito=efeitos.indice[status] if status else -1,
+    )
+
+
+def _dificuldades(dados, origem):
+    if dados is None:
+        return {}
+    if not isinstance(dados, dict):
+        _erro(origem, "'dificuldades' precisa ser um objeto {nome: {campo: valor}}")
+    saida = {}
+    for nome, ajuste in dados.items():
+        if not isinstance(ajuste, dict) or set(ajuste) - set(CAMPOS_DIFICULDADE):
+            _erro(origem, f"dificuldade '{nome}': campos aceitos são {', '.join(CAMPOS_DIFICULDADE)}")
+        for c, v in ajuste.items():
+            # enemy_acc_mod pode ser negativo; vida e mana, não
+            if not isinstance(v, int) or (c != "enemy_acc_mod" and v <= 0):
+                _erro(origem, f"dificuldade '{nome}': {c} precisa ser inteiro (> 0, exceto enemy_acc_mod)")
+        saida[nome] = dict(ajuste)
+    return saida
+
+
+def carregar(caminho=None):
+    caminho = caminho or os.environ.get("BATALHA_FEITICOS") or ARQUIVO_PADRAO
+    with open(caminho, encoding="utf-8") as f:
+        dados = json.load(f)
+    return de_dados(dados, caminho)
+
+
+def de_dados(dados, origem="<dados>"):
+    lista = dados.get("feiticos") if isinstance(dados, dict) else None
+    versao = dados.get("versao", VERSAO) if isinstance(dados, dict) else VERSAO
+    if versao != VERSAO or isinstance(versao, bool):
+        _erro(origem, f"versão {versao!r} do arquivo de feitiços não suportada (esperada {VERSAO})")
+    if not lista:
+        _erro(origem, "nenhum feitiço em 'feiticos'")
+    if len(lista) > MAX_FEITICOS:
+        _erro(origem, f"no máximo {MAX_FEITICOS} feitiços")
+    efeitos = _efeitos.de_dados(dados.get("efeitos"), origem)
+    feiticos = [_registro(d, k, origem, efeitos) for k, d in enumerate(lista)]
+    ids = [f.id for f in feiticos]
+    if len(set(ids)) != len(ids):
+        _erro(origem, "ids repetidos")
+    if {"defender", "pocao"} & set(ids):
+        _erro(origem, "'defender' e 'pocao' são ações reservadas")
+    teclas = [f.tecla for f in feiticos if f.tecla]
+    if len(set(teclas)) != len(teclas) or set(teclas) & set(TECLAS_RESERVADAS):
+        _erro(origem, f"teclas repetidas ou reservadas ({', '.join(TECLAS_RESERVADAS)})")
+    return RegistroFeiticos(feiticos, efeitos, _dificuldades(dados.get("dificuldades"), origem))
+
+
+REGISTRO = carregar()
+FEITICOS = REGISTRO.por_id  # {id: Feitico}, na ordem do arquivo
+EFEITOS = REGISTRO.efeitos
+
+
+# ---------- Main ----------
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Valida e lista um arquivo de feitiços.")
+    parser.add_argument("caminho", nargs="?", default=None)
+    args = parser.parse_args(argv)
+    registro = carregar(args.caminho)
+    for e in registro.efeitos:
+        print(f"efeito {e.indice:2d} {e.id:<12} {e.emoji} dano/turno {e.dano_por_turno}  cura/turno "
+              f"{e.cura_por_turno}  pula {'sim' if e.pula_turno else 'não'}  redução {e.reducao_dano}%")
+    for f in registro:
+        status = f"{f.status} {f.status_chance}% x{f.status_turnos} ({f.status_alvo})" if f.status else "-"
+        print(f"{f.indice:2d} {f.id:<10} {f.emoji} {f.nome:<20} dano {f.dano:3d}  acerto {f.chance:3d}%  "
+              f"mana {f.mana:3d}  status {status}  tecla {f.tecla or '-'}")
+    for d, ajuste in registro.dificuldades.items():
+        print(f"dificuldade {d}: " + "  ".join(f"{c} {v}" for c, v in ajuste.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,33 +1,326 @@
-import random
+# Gerador de Senhas
+# Importável como biblioteca; as perguntas interativas ficaram no main.
+# - Geração em lote: secrets.token_bytes em blocos grandes, cada byte vira
+#   um caractere do alfabeto por bytes.translate; bytes que causariam viés
+#   (>= maior múltiplo do tamanho do alfabeto) são descartados na mesma
+#   chamada (rejeição), então todas as posições são uniformes
+# - Saída em blocos (uma senha por linha) para stdout ou arquivo
+# - Modo paralelo (--processos): o arquivo é pré-alocado e cada processo
+#   escreve seus fragmentos direto no deslocamento deles (toda linha tem
+#   tamanho + 1 bytes); cada processo tira bytes do CSPRNG do sistema
+#   (os.urandom) por conta própria, sem estado compartilhado
+# - Com regras (--min-*, --sem-ambiguos, --sem-repeticao) a geração passa
+#   por PoliticaSenha (politica_senha.py), que já constrói senhas válidas
+# - --bloqueio recusa senhas de uma lista de vazadas/comuns (filtro de Bloom
+#   em disco, bloqueio_senhas.py) e --unicas garante um lote sem repetição
+#   com ~2 bytes de memória por senha; as recusadas são sorteadas de novo
+#
+# Execução:
+#   python gerador_senha.py -n 5 --tamanho 12
+#   python gerador_senha.py -n 10000000 --tamanho 16 --saida senhas.txt
+#   python gerador_senha.py -n 50000000 --tamanho 16 --saida senhas.txt --processos 8
+#   python gerador_senha.py -n 1000 --min-numeros 2 --min-simbolos 1 --sem-ambiguos --entropia
+#   python gerador_senha.py -n 20000000 --tamanho 10 --bloqueio tabelas/comuns.bloom --unicas --saida senhas.txt
+#   python gerador_senha.py --interativo
+
+import math
+import os
+import secrets
 import string
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from bloqueio_senhas import FiltroSenhas, ListaBloqueio, limite_unicas
+from politica_senha import AMBIGUOS, PoliticaSenha
+
+SIMBOLOS = "!@#$%&*"
+TAMANHO_LOTE = 65536  # senhas por bloco de saída
+TAMANHO_FRAGMENTO = 1000000  # senhas por tarefa no modo paralelo
+TENTATIVAS_FILTRO = 50  # voltas seguidas sem nenhuma senha aceita pelo filtro
+SORTEIO_MINIMO_FILTRO = 1024  # senhas sorteadas por volta, mesmo faltando poucas
+
+
+# ---------- Alfabeto ----------
+def alfabeto(maiusculas=True, numeros=True, simbolos=True, conjunto_simbolos=SIMBOLOS):
+    caracteres = string.ascii_lowercase
+    if maiusculas:
+        caracteres += string.ascii_uppercase
+    if numeros:
+        caracteres += string.digits
+    if simbolos:
+        caracteres += conjunto_simbolos
+    return caracteres
+
+
+def _tabela(caracteres):
+    # (tabela de tradução, bytes rejeitados, fração aceita)
+    if not caracteres or len(set(caracteres)) != len(caracteres):
+        raise ValueError("o alfabeto precisa ter caracteres distintos")
+    if len(caracteres) > 256 or not caracteres.isascii():
+        raise ValueError("o alfabeto precisa ter até 256 caracteres ASCII")
+    n = len(caracteres)
+    limite = 256 - 256 % n
+    tabela = bytes(ord(caracteres[b % n]) for b in range(limite)) + bytes(256 - limite)
+    return tabela, bytes(range(limite, 256)), limite / 256
+
+
+# ---------- Geração em lote ----------
+def gerar_bytes(quantidade, tamanho, caracteres, filtro=None):
+    """
+    `quantidade` senhas de `tamanho` caracteres, uma por linha, como bytes
+    ASCII (cada linha termina em b"\\n"). `caracteres` é o alfabeto ou uma
+    PoliticaSenha. `filtro`: bloqueio_senhas.FiltroSenhas (as recusadas
+    são repostas por novos sorteios).
+    """
+    if filtro is not None:
+        return _gerar_filtradas(quantidade, tamanho, caracteres, filtro)
+    if isinstance(caracteres, PoliticaSenha):
+        return caracteres.gerar_bytes(quantidade, tamanho)
+    tabela, rejeitados, aceitos = _tabela(caracteres)
+    if tamanho == 0:
+        return b"\n" * quantidade
+    total = quantidade * tamanho
+    partes = []
+    obtidos = 0
+    while obtidos < total:
+        falta = total - obtidos
+        # pede um pouco a mais que o esperado para quase nunca precisar de outra volta
+        pedido = math.ceil(falta / aceitos * 1.02) + 64
+        bloco = secrets.token_bytes(pedido).translate(tabela, rejeitados)
+        partes.append(bloco)
+        obtidos += len(bloco)
+    corpo = b"".join(partes)[:total]
+    return b"".join([corpo[i:i + tamanho] + b"\n" for i in range(0, total, tamanho)])
+
+
+def _gerar_filtradas(quantidade, tamanho, caracteres, filtro):
+    # Sorteia, filtra e repõe as recusadas até completar `quantidade`
+    partes, faltam, vazias = [], quantidade, 0
+    while faltam:
+        # perto do fim, sorteios maiores acham as poucas combinações livres
+        sorteio = gerar_bytes(max(faltam, SORTEIO_MINIMO_FILTRO), tamanho, caracteres)
+        bloco = filtro.filtrar(sorteio, tamanho, faltam)
+        aceitas = len(bloco) // (tamanho + 1)
+        vazias = 0 if aceitas else vazias + 1
+        if vazias >= TENTATIVAS_FILTRO:
+            raise ValueError("o filtro recusou todas as senhas sorteadas: faltam combinações fora da "
+                             "lista de bloqueio ou ainda não geradas")
+        partes.append(bloco)
+        faltam -= aceitas
+    return b"".join(partes)
+
+
+def gerar_em_blocos(quantidade, tamanho, caracteres, lote=TAMANHO_LOTE, filtro=None):
+    # Gera blocos de bytes com até `lote` senhas cada (memória constante)
+    for inicio in range(0, quantidade, lote):
+        yield gerar_bytes(min(lote, quantidade - inicio), tamanho, caracteres, filtro)
+
+
+def escrever_senhas(destino, quantidade, tamanho, caracteres, lote=TAMANHO_LOTE, filtro=None):
+    """Escreve as senhas em `destino` (arquivo binário) e devolve os bytes escritos."""
+    escritos = 0
+    for bloco in gerar_em_blocos(quantidade, tamanho, caracteres, lote, filtro):
+        destino.write(bloco)
+        escritos += len(bloco)
+    return escritos
+
+
+def senhas(quantidade, tamanho=12, caracteres=None, lote=TAMANHO_LOTE, filtro=None):
+    # Iterador de str, para uso como biblioteca
+    caracteres = caracteres or alfabeto()
+    for bloco in gerar_em_blocos(quantidade, tamanho, caracteres, lote, filtro):
+        yield from bloco.decode("ascii").splitlines()
+
+
+# ---------- Paralelo ----------
+def _escrever_em(fd, dados, deslocamento):
+    if hasattr(os, "pwrite"):
+        mv = memoryview(dados)
+        while mv:
+            n = os.pwrite(fd, mv, deslocamento)
+            mv = mv[n:]
+            deslocamento += n
+    else:  # Windows: sem pwrite, cada processo tem seu próprio descritor
+        os.lseek(fd, deslocamento, os.SEEK_SET)
+        os.write(fd, dados)
+
 
-def gerar_senha(tamanho=8, simbolos=True):
+def _gerar_fragmento(tarefa):
+    caminho, inicio, quantidade, tamanho, caracteres, lote, filtro = tarefa
+    fd = os.open(caminho, os.O_WRONLY | getattr(os, "O_BINARY", 0))
+    try:
+        deslocamento = inicio * (tamanho + 1)
+        for bloco in gerar_em_blocos(quantidade, tamanho, caracteres, lote, filtro):
+            _escrever_em(fd, bloco, deslocamento)
+            deslocamento += len(bloco)
+    finally:
+        os.close(fd)
+    return quantidade
+
+
+def gerar_paralelo(caminho, quantidade, tamanho, caracteres, processos=None,
+                   fragmento=TAMANHO_FRAGMENTO, lote=TAMANHO_LOTE, filtro=None):
+    """
+    Escreve `quantidade` senhas em `caminho` usando um pool de processos.
+    Devolve o total de bytes do arquivo. O filtro só pode ter a lista de
+    bloqueio (cada processo reabre o mmap); unicidade pede um verificador
+    só, que os processos não compartilham.
+    """
+    # valida antes de abrir o pool
+    if filtro is not None and filtro.unicidade is not None:
+        raise ValueError("senhas únicas não funcionam no modo paralelo")
+    if isinstance(caracteres, PoliticaSenha):
+        if quantidade and not caracteres.total(tamanho):
+            raise ValueError(f"nenhuma senha de {tamanho} caracteres cumpre a política")
+    else:
+        _tabela(caracteres)
+    total = quantidade * (tamanho + 1)
+    with open(caminho, "wb") as f:
+        f.truncate(total)  # pré-aloca: cada fragmento já tem seu lugar
+    tarefas = [(caminho, inicio, min(fragmento, quantidade - inicio), tamanho, caracteres, lote, filtro)
+               for inicio in range(0, quantidade, fragmento)]
+    processos = processos or os.cpu_count() or 1
+    if processos == 1:
+        for t in tarefas:
+            _gerar_fragmento(t)
+    else:
+        with ProcessPoolExecutor(max_workers=processos) as pool:
+            for _ in pool.map(_gerar_fragmento, tarefas, chunksize=1):
+                pass
+    return total
+
+
+# ---------- API original ----------
+_LISTAS_BLOQUEIO = {}  # caminho -> ListaBloqueio aberta (gerar_senha)
+
+
+def gerar_senha(tamanho=8, simbolos=True, bloqueio=None):
+    # bloqueio: bloqueio_senhas.ListaBloqueio (ou o caminho do filtro, aberto
+    # uma vez e reaproveitado nas chamadas seguintes)
     caracteres = string.ascii_letters + string.digits
     if simbolos:
-        caracteres += "!@#$%&*"
-    senha = ''.join(random.choice(caracteres) for _ in range(tamanho))
-    return senha
-
-print(gerar_senha(tamanho=12, simbolos=True))
-
-usar_maiusculas = input("Usar letras maiúsculas? (s/n) ").lower() == "s"
-usar_numeros = input("Usar números? (s/n) ").lower() == "s"
-usar_simbolos = input("Usar símbolos? (s/n) ").lower() == "s"
-
-caracteres = string.ascii_lowercase
-if usar_maiusculas:
-    caracteres += string.ascii_uppercase
-if usar_numeros:
-    caracteres += string.digits
-if usar_simbolos:
-    caracteres += string.punctuation
-
-def gerar_multiplas_senhas(qtd=5, tamanho=8, simbolos=True):
-    senhas = []
-    for _ in range(qtd):
-        senhas.append(gerar_senha(tamanho, simbolos))
-    return senhas
-
-qtd = int(input("Quantas senhas gerar? "))
-for s in gerar_multiplas_senhas(qtd, tamanho=12, simbolos=True):
-    print(s)
+        caracteres += SIMBOLOS
+    if isinstance(bloqueio, str):
+        if bloqueio not in _LISTAS_BLOQUEIO:
+            _LISTAS_BLOQUEIO[bloqueio] = ListaBloqueio(bloqueio)
+        bloqueio = _LISTAS_BLOQUEIO[bloqueio]
+    for _ in range(TENTATIVAS_FILTRO):
+        senha = "".join(secrets.choice(caracteres) for _ in range(tamanho))
+        if bloqueio is None or senha not in bloqueio:
+            return senha
+    raise ValueError("a lista de bloqueio recusou todas as senhas sorteadas")
+
+
+def gerar_multiplas_senhas(qtd=5, tamanho=8, simbolos=True, bloqueio=None, unicas=False):
+    filtro = FiltroSenhas(bloqueio, unicas, qtd) if bloqueio is not None or unicas else None
+    return list(senhas(qtd, tamanho, alfabeto(simbolos=simbolos), filtro=filtro))
+
+
+# ---------- Main ----------
+def _classes(caracteres):
+    # Separa um alfabeto montado por alfabeto() nas classes da política
+    grupos = {"minusculas": string.ascii_lowercase, "maiusculas": string.ascii_uppercase,
+              "numeros": string.digits}
+    classes = {nome: "".join(c for c in caracteres if c in chars) for nome, chars in grupos.items()}
+    classes["simbolos"] = "".join(c for c in caracteres if not c.isalnum())
+    return {nome: chars for nome, chars in classes.items() if chars}
+
+
+def _perguntar():
+    # Fluxo interativo antigo
+    usar_maiusculas = input("Usar letras maiúsculas? (s/n) ").lower() == "s"
+    usar_numeros = input("Usar números? (s/n) ").lower() == "s"
+    usar_simbolos = input("Usar símbolos? (s/n) ").lower() == "s"
+    qtd = int(input("Quantas senhas gerar? "))
+    caracteres = alfabeto(usar_maiusculas, usar_numeros, usar_simbolos, string.punctuation)
+    return qtd, caracteres
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Gera senhas aleatórias (secrets) em lote.")
+    parser.add_argument("-n", "--quantidade", type=int, default=5)
+    parser.add_argument("--tamanho", type=int, default=12)
+    parser.add_argument("--sem-maiusculas", action="store_true")
+    parser.add_argument("--sem-numeros", action="store_true")
+    parser.add_argument("--sem-simbolos", action="store_true")
+    parser.add_argument("--todos-simbolos", action="store_true",
+                        help=f"usa toda a pontuação ASCII em vez de {SIMBOLOS}")
+    parser.add_argument("--min-maiusculas", type=int, default=0)
+    parser.add_argument("--min-minusculas", type=int, default=0)
+    parser.add_argument("--min-numeros", type=int, default=0)
+    parser.add_argument("--min-simbolos", type=int, default=0)
+    parser.add_argument("--sem-ambiguos", action="store_true", help=f"remove {AMBIGUOS}")
+    parser.add_argument("--sem-repeticao", action="store_true", help="sem caracteres repetidos na senha")
+    parser.add_argument("--entropia", action="store_true", help="mostra a entropia da configuração")
+    parser.add_argument("--bloqueio", metavar="FILTRO", help="recusa senhas deste filtro (bloqueio_senhas.py)")
+    parser.add_argument("--unicas", action="store_true", help="nenhuma senha repetida no lote")
+    parser.add_argument("--saida", default="-", help="arquivo de saída ('-' = stdout)")
+    parser.add_argument("--lote", type=int, default=TAMANHO_LOTE, help="senhas por bloco escrito")
+    parser.add_argument("--processos", type=int, default=None,
+                        help="gera em paralelo (exige --saida); 0 = todos os núcleos")
+    parser.add_argument("--interativo", action="store_true", help="pergunta as opções como antes")
+    args = parser.parse_args(argv)
+
+    if args.interativo:
+        quantidade, caracteres = _perguntar()
+    else:
+        quantidade = args.quantidade
+        caracteres = alfabeto(not args.sem_maiusculas, not args.sem_numeros, not args.sem_simbolos,
+                              string.punctuation if args.todos_simbolos else SIMBOLOS)
+    if quantidade < 0 or args.tamanho < 0 or args.lote < 1:
+        parser.error("quantidade, tamanho e lote precisam ser positivos")
+
+    minimos = {"minusculas": args.min_minusculas, "maiusculas": args.min_maiusculas,
+               "numeros": args.min_numeros, "simbolos": args.min_simbolos}
+    try:
+        politica = PoliticaSenha(_classes(caracteres), minimos, args.sem_ambiguos, args.sem_repeticao)
+    except ValueError as e:
+        parser.error(str(e))
+    if any(minimos.values()) or args.sem_ambiguos or args.sem_repeticao:
+        if not politica.total(args.tamanho):
+            parser.error(f"nenhuma senha de {args.tamanho} caracteres cumpre a política")
+        caracteres = politica
+    if args.entropia:
+        print(f"{politica.descrever(args.tamanho)}: {politica.entropia(args.tamanho):.2f} bits por senha",
+              file=sys.stderr)
+
+    if args.processos is not None and args.saida == "-":
+        parser.error("--processos precisa de --saida (os fragmentos são escritos no arquivo)")
+    if args.unicas and args.processos is not None:
+        parser.error("--unicas não funciona com --processos (um único verificador de repetição)")
+    if args.unicas and quantidade > limite_unicas(politica.total(args.tamanho)):
+        parser.error(f"há {politica.total(args.tamanho):,} senhas possíveis com essa configuração; com --unicas "
+                     f"dá para pedir até {limite_unicas(politica.total(args.tamanho)):,} (margem do filtro de unicidade)")
+    filtro = None
+    if args.bloqueio or args.unicas:
+        try:
+            filtro = FiltroSenhas(args.bloqueio, args.unicas, quantidade)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+
+    inicio = time.perf_counter()
+    try:
+        if args.saida == "-":
+            escrever_senhas(sys.stdout.buffer, quantidade, args.tamanho, caracteres, args.lote, filtro)
+            sys.stdout.flush()
+            return
+        if args.processos is not None:
+            escritos = gerar_paralelo(args.saida, quantidade, args.tamanho, caracteres,
+                                      args.processos or None, lote=args.lote, filtro=filtro)
+        else:
+            with open(args.saida, "wb") as f:
+                escritos = escrever_senhas(f, quantidade, args.tamanho, caracteres, args.lote, filtro)
+    except ValueError as e:  # o filtro recusou tudo (lista de bloqueio cobre o espaço de senhas)
+        parser.error(str(e))
+    duracao = max(time.perf_counter() - inicio, 1e-9)
+    print(f"{quantidade:,} senhas em {duracao:.2f}s "
+          f"({quantidade / duracao:,.0f} senhas/s, {escritos / duracao / 1e6:,.1f} MB/s) -> {args.saida}",
+          file=sys.stderr)
+    if filtro is not None and args.processos is None:  # no paralelo a contagem fica nos processos
+        print(f"Filtro: {filtro.recusadas:,} senhas recusadas e sorteadas de novo", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
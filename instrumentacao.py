@@ -0,0 +1,278 @@
+# Batalha dos Feiticeiros — Instrumentação
+# Camada opcional de medição da interface (desligada = custo zero):
+# - instalar(obj, nomes) troca métodos da instância por versões que medem
+#   a duração de cada chamada (turnos, barras, log, descargas...)
+# - o agendador de animações informa cada passo de animação, as escritas
+#   no canvas e o intervalo entre quadros (animacao.py, atributo medidor)
+# - um batimento a cada INTERVALO_BATIMENTO_MS mede o atraso do laço de
+#   eventos (quanto o after chegou depois do previsto)
+# - percentis p50/p95/p99 sobre as últimas AMOSTRAS medidas de cada nome,
+#   num painel sobreposto ao canvas (F3 na interface)
+# - perfil em disco: cProfile (.prof, para pstats/snakeviz) e pilhas
+#   amostradas da thread da interface no formato "colapsado" (.folded, uma
+#   pilha por linha: "a;b;c contagem"), aceito por flamegraph.pl e speedscope
+#
+# Na interface: menu Opções ou BATALHA_PERFIL=1 para já abrir medindo.
+#
+# Execução (resumo de um perfil gravado):
+#   python instrumentacao.py perfis/perfil-20250101-120000.prof
+
+import cProfile
+import json
+import math
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+
+AMOSTRAS = 2048  # por nome
+INTERVALO_BATIMENTO_MS = 50
+INTERVALO_PAINEL_MS = 500
+INTERVALO_AMOSTRAGEM = 0.002  # s entre amostras de pilha
+PASTA_PERFIS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "perfis")
+
+
+class Serie:
+    __slots__ = ("valores", "chamadas", "total", "maximo")
+
+    def __init__(self):
+        self.valores = deque(maxlen=AMOSTRAS)
+        self.chamadas = 0
+        self.total = 0.0
+        self.maximo = 0.0
+
+    def adicionar(self, valor):
+        self.valores.append(valor)
+        self.chamadas += 1
+        self.total += valor
+        if valor > self.maximo:
+            self.maximo = valor
+
+    def percentis(self, *ps):
+        ordenados = sorted(self.valores)
+        if not ordenados:
+            return (0.0,) * len(ps)
+        # posto mais próximo: o menor valor com pelo menos p% das amostras <= ele
+        n = len(ordenados)
+        return tuple(ordenados[min(n - 1, max(0, math.ceil(p * n / 100) - 1))] for p in ps)
+
+
+class Instrumentacao:
+    def __init__(self, root):
+        self.root = root
+        self.series = {}
+        self._instalados = []  # (objeto, nome)
+        self._batimento = None
+        self._previsto = None
+        self._perfil = None
+        self._amostrador = None
+
+    # ---------- Medidas ----------
+    def registrar(self, nome, segundos):
+        s = self.series.get(nome)
+        if s is None:
+            s = self.series[nome] = Serie()
+        s.adicionar(segundos)
+
+    def envolver(self, nome, funcao):
+        registrar = self.registrar
+        relogio = time.perf_counter
+
+        def medida(*args, **kwargs):
+            inicio = relogio()
+            try:
+                return funcao(*args, **kwargs)
+            finally:
+                registrar(nome, relogio() - inicio)
+        medida.__wrapped__ = funcao
+        return medida
+
+    def instalar(self, objeto, nomes, prefixo=""):
+        # Só na instância: desinstalar() volta aos métodos da classe
+        for nome in nomes:
+            setattr(objeto, nome, self.envolver(prefixo + nome, getattr(objeto, nome)))
+            self._instalados.append((objeto, nome))
+
+    @property
+    def instalada(self):
+        return bool(self._instalados)
+
+    def desinstalar(self):
+        for objeto, nome in self._instalados:
+            objeto.__dict__.pop(nome, None)
+        self._instalados.clear()
+
+    def zerar(self):
+        self.series.clear()
+
+    # ---------- Atraso do laço de eventos ----------
+    def iniciar_batimento(self):
+        if self._batimento is None:
+            self._previsto = time.perf_counter() + INTERVALO_BATIMENTO_MS / 1000
+            self._batimento = self.root.after(INTERVALO_BATIMENTO_MS, self._bater)
+
+    def _bater(self):
+        agora = time.perf_counter()
+        self.registrar("laco.atraso", max(0.0, agora - self._previsto))
+        self._previsto = agora + INTERVALO_BATIMENTO_MS / 1000
+        self._batimento = self.root.after(INTERVALO_BATIMENTO_MS, self._bater)
+
+    def parar_batimento(self):
+        if self._batimento is not None:
+            self.root.after_cancel(self._batimento)
+            self._batimento = None
+
+    # ---------- Relatório ----------
+    def resumo(self):
+        # {nome: {chamadas, total_ms, p50_ms, p95_ms, p99_ms, max_ms}}
+        r = {}
+        for nome, s in self.series.items():
+            p50, p95, p99 = s.percentis(50, 95, 99)
+            r[nome] = {"chamadas": s.chamadas, "total_ms": 1000 * s.total, "p50_ms": 1000 * p50,
+                       "p95_ms": 1000 * p95, "p99_ms": 1000 * p99, "max_ms": 1000 * s.maximo}
+        return r
+
+    def linhas(self, maximo=8):
+        r = self.resumo()
+        saida = []
+        q = r.get("quadro")
+        if q:
+            fps = 1000 / q["p50_ms"] if q["p50_ms"] else 0
+            saida.append(f"quadro   p50 {q['p50_ms']:5.1f}  p95 {q['p95_ms']:5.1f}  p99 {q['p99_ms']:5.1f} ms"
+                         f"  ({fps:.0f} fps)")
+        a = r.get("laco.atraso")
+        if a:
+            saida.append(f"atraso   p50 {a['p50_ms']:5.1f}  p95 {a['p95_ms']:5.1f}  máx {a['max_ms']:5.1f} ms")
+        outros = sorted((n for n in r if n not in ("quadro", "laco.atraso")),
+                        key=lambda n: r[n]["total_ms"], reverse=True)
+        for nome in outros[:maximo]:
+            x = r[nome]
+            saida.append(f"{nome[:22]:<22} {x['chamadas']:>6}x  p50 {x['p50_ms']:6.2f}  p95 {x['p95_ms']:6.2f}"
+                         f"  máx {x['max_ms']:6.2f}")
+        return saida
+
+    # ---------- Perfil em disco ----------
+    @property
+    def gravando(self):
+        return self._perfil is not None
+
+    def iniciar_perfil(self):
+        # Chamar na thread da interface: o cProfile mede a thread que o liga
+        if self._perfil is not None:
+            return
+        self._perfil = cProfile.Profile()
+        self._amostrador = AmostradorPilhas(threading.get_ident())
+        self._amostrador.start()
+        self._perfil.enable()
+
+    def parar_perfil(self, pasta=PASTA_PERFIS):
+        """Grava .prof, .folded e .json (percentis); devolve os caminhos."""
+        if self._perfil is None:
+            return ()
+        self._perfil.disable()
+        self._amostrador.parar()
+        os.makedirs(pasta, exist_ok=True)
+        base = os.path.join(pasta, time.strftime("perfil-%Y%m%d-%H%M%S"))
+        caminhos = (base + ".prof", base + ".folded", base + ".json")
+        self._perfil.dump_stats(caminhos[0])
+        with open(caminhos[1], "w", encoding="utf-8") as f:
+            for pilha, n in self._amostrador.pilhas.most_common():
+                f.write(f"{pilha} {n}\n")
+        with open(caminhos[2], "w", encoding="utf-8") as f:
+            json.dump(self.resumo(), f, indent=2, ensure_ascii=False)
+        self._perfil = self._amostrador = None
+        return caminhos
+
+
+class AmostradorPilhas(threading.Thread):
+    """Amostra a pilha de outra thread (a da interface) em intervalos fixos."""
+
+    def __init__(self, alvo, intervalo=INTERVALO_AMOSTRAGEM):
+        super().__init__(name="amostrador", daemon=True)
+        self.alvo = alvo
+        self.intervalo = intervalo
+        self.pilhas = Counter()
+        self._parar = threading.Event()
+
+    def run(self):
+        nomes = {}  # code -> nome do quadro
+        while not self._parar.wait(self.intervalo):
+            quadro = sys._current_frames().get(self.alvo)
+            partes = []
+            while quadro is not None:
+                code = quadro.f_code
+                nome = nomes.get(code)
+                if nome is None:
+                    nome = nomes[code] = (f"{code.co_name} ({os.path.basename(code.co_filename)}:"
+                                          f"{code.co_firstlineno})").replace(";", ":")
+                partes.append(nome)
+                quadro = quadro.f_back
+            if partes:
+                self.pilhas[";".join(reversed(partes))] += 1
+
+    def parar(self):
+        self._parar.set()
+        self.join(1.0)
+
+
+class PainelDesempenho:
+    """Texto sobreposto ao canvas com os números da instrumentação."""
+
+    def __init__(self, root, canvas, instrumentacao, fonte=("Courier", 8)):
+        self.root = root
+        self.canvas = canvas
+        self.instrumentacao = instrumentacao
+        self.visivel = False
+        self._after = None
+        self._fundo = canvas.create_rectangle(0, 0, 0, 0, fill="#000000", outline="", state="hidden")
+        self._texto = canvas.create_text(6, 4, anchor="nw", text="", fill="#9CFFB0", font=fonte,
+                                         state="hidden")
+
+    def mostrar(self):
+        self.visivel = True
+        self.canvas.itemconfigure(self._fundo, state="normal")
+        self.canvas.itemconfigure(self._texto, state="normal")
+        self.atualizar()
+
+    def ocultar(self):
+        self.visivel = False
+        if self._after is not None:
+            self.root.after_cancel(self._after)
+            self._after = None
+        self.canvas.itemconfigure(self._fundo, state="hidden")
+        self.canvas.itemconfigure(self._texto, state="hidden")
+
+    def atualizar(self):
+        self._after = None
+        if not self.visivel:
+            return
+        # medir o próprio painel também (é uma escrita no canvas a cada meio segundo)
+        inicio = time.perf_counter()
+        texto = "\n".join(self.instrumentacao.linhas()) or "medindo..."
+        self.canvas.itemconfigure(self._texto, text=texto)
+        x0, y0, x1, y1 = self.canvas.bbox(self._texto) or (0, 0, 0, 0)
+        self.canvas.coords(self._fundo, x0 - 4, y0 - 2, x1 + 4, y1 + 2)
+        self.canvas.tag_raise(self._fundo)
+        self.canvas.tag_raise(self._texto)
+        self.instrumentacao.registrar("painel", time.perf_counter() - inicio)
+        self._after = self.root.after(INTERVALO_PAINEL_MS, self.atualizar)
+
+
+# ---------- Main ----------
+def main(argv=None):
+    import argparse
+    import pstats
+    parser = argparse.ArgumentParser(description="Resumo de um perfil gravado pela interface.")
+    parser.add_argument("caminho", help="arquivo .prof")
+    parser.add_argument("-n", type=int, default=25, help="funções listadas")
+    parser.add_argument("--ordem", default="cumulative", help="tottime, cumulative, calls...")
+    args = parser.parse_args(argv)
+    try:
+        pstats.Stats(args.caminho).strip_dirs().sort_stats(args.ordem).print_stats(args.n)
+    except (OSError, TypeError, ValueError) as e:
+        parser.error(str(e))
+
+
+if __name__ == "__main__":
+    main()
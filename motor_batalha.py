@@ -0,0 +1,605 @@
+# Batalha dos Feiticeiros — Motor de Regras (sem interface)
+# Todas as regras de combate, independentes do Tkinter:
+# - RNG próprio com semente (random.Random), sem usar o RNG global
+# - Fluxo de eventos (log, tiros, dano, sons, fim) consumido pela interface
+# - Eventos desligáveis para simulações em massa
+# - Feitiços vêm do registro de dados (feiticos.py / feiticos.json)
+# - Status são arrays de turnos restantes por efeito (efeitos.py)
+# - Cada ação feita na vez certa vai para motor.acoes (1 byte): semente + ações
+#   reproduzem a partida inteira (replay.py)
+# - Contadores de lançamentos e acertos por feitiço (estatisticas.py)
+# - Cada lado tem um feiticeiro (magia, nível) que escala dano e custo dos
+#   feitiços (progressao.py); o padrão reproduz os números do registro e o
+#   golpe só indexa a tabela do nível
+#
+# Execução (simulação em massa, sem janela):
+#   python motor_batalha.py --partidas 10000 --dificuldade Normal
+# A taxa impressa (partidas/s) depende da máquina: de 5 a 6 mil partidas/s
+# num núcleo de um servidor comum.
+
+import copy
+import random
+import time
+from array import array
+
+from efeitos import VIDA_MAXIMA
+from feiticos import EFEITOS, FEITICO_NULO, FEITICOS, REGISTRO
+from progressao import MAGIA_BASE, NIVEL_BASE, tabela
+
+# ---------- Dados ----------
+DIFICULDADES = {
+    "Fácil":   {"vida": 110, "mana": 110, "vida_inimigo": 90,  "mana_inimigo": 100, "enemy_acc_mod": -5},
+    "Normal":  {"vida": 100, "mana": 100, "vida_inimigo": 100, "mana_inimigo": 100, "enemy_acc_mod": 0},
+    "Difícil": {"vida": 90,  "mana": 100, "vida_inimigo": 120, "mana_inimigo": 100, "enemy_acc_mod": +8},
+    # Mesmos números do Normal; o inimigo é o MCTS de oponente_mcts.py
+    "Especialista": {"vida": 100, "mana": 100, "vida_inimigo": 100, "mana_inimigo": 100, "enemy_acc_mod": 0, "ia": "mcts"},
+    # Idem; o inimigo é a política treinada (ambiente_rl.py / politica_treinada.py)
+    "Treinada": {"vida": 100, "mana": 100, "vida_inimigo": 100, "mana_inimigo": 100, "enemy_acc_mod": 0, "ia": "politica"},
+}
+
+
+# Números de fábrica, antes dos ajustes do arquivo de feitiços
+PRESETS = {d: dict(cfg) for d, cfg in DIFICULDADES.items()}
+
+
+def teto_inicial(dificuldade, campo):
+    """
+    Maior vida ou mana inicial aceita para `campo` ("vida", "mana",
+    "vida_inimigo", "mana_inimigo"): o teto do jogo (100; o motor, o
+    solucionador e as barras da interface param nele) ou o número de
+    fábrica, quando ele já começa acima (Fácil e Difícil).
+    """
+    return max(100, PRESETS[dificuldade][campo])
+
+
+def _ajustar_dificuldades(dificuldades, ajustes):
+    # Seção "dificuldades" do arquivo de feitiços (ex.: afinador_balanceamento.py)
+    for nome, ajuste in ajustes.items():
+        if nome not in dificuldades:
+            raise ValueError(f"arquivo de feitiços ajusta uma dificuldade desconhecida: {nome}")
+        for campo, valor in ajuste.items():
+            if campo != "enemy_acc_mod" and valor > teto_inicial(nome, campo):
+                raise ValueError(f"arquivo de feitiços: {nome}.{campo} = {valor} passa do teto "
+                                 f"{teto_inicial(nome, campo)}")
+        dificuldades[nome].update(ajuste)
+
+
+_ajustar_dificuldades(DIFICULDADES, REGISTRO.dificuldades)
+
+# Dificuldades em que o inimigo usa a IA embutida (_escolha_ia)
+DIFICULDADES_IA_EMBUTIDA = tuple(d for d, cfg in DIFICULDADES.items() if cfg.get("ia") is None)
+
+ACOES_JOGADOR = REGISTRO.ids + ("defender", "pocao")
+ACOES_INIMIGO = REGISTRO.ids + ("defender",)
+
+# Códigos do registro de ações (um byte): jogador 0..0x7E (índice em
+# ACOES_JOGADOR), inimigo 0x80 | índice em ACOES_INIMIGO; 0xFF = inimigo
+# decidido pela IA embutida (os sorteios dela vêm do RNG do motor)
+CODIGO_IA = 0xFF
+_CODIGO_FEITICO_NULO_JOGADOR = 0x7F  # tipo que não está no registro
+_CODIGO_FEITICO_NULO_INIMIGO = 0xFE
+_CODIGOS_JOGADOR = {a: i for i, a in enumerate(ACOES_JOGADOR)}
+_CODIGOS_INIMIGO = {a: 0x80 | i for i, a in enumerate(ACOES_INIMIGO)}
+
+# Contadores por feitiço: posição f.indice (jogador) e N_FEITICOS + f.indice (inimigo)
+N_FEITICOS = len(REGISTRO)
+_CONTADORES_ZERADOS = bytes(4 * 2 * N_FEITICOS)
+
+
+def codificar_acao(quem, acao):
+    if quem == "player":
+        return _CODIGOS_JOGADOR.get(acao, _CODIGO_FEITICO_NULO_JOGADOR)
+    if acao is None:
+        return CODIGO_IA
+    return _CODIGOS_INIMIGO.get(acao, _CODIGO_FEITICO_NULO_INIMIGO)
+
+
+def decodificar_acao(codigo):
+    # -> ("player"/"enemy", ação); ação None = IA embutida, "" = feitiço nulo
+    if codigo < 0x80:
+        return "player", ACOES_JOGADOR[codigo] if codigo < len(ACOES_JOGADOR) else ""
+    if codigo == CODIGO_IA:
+        return "enemy", None
+    codigo &= 0x7F
+    return "enemy", ACOES_INIMIGO[codigo] if codigo < len(ACOES_INIMIGO) else ""
+
+
+# ---------- Motor ----------
+class MotorBatalha:
+    """
+    Estado e regras de uma batalha. Não conhece a interface: cada ação
+    acrescenta eventos em self.eventos, que a interface drena e anima.
+
+    Fases: "jogador" -> "inimigo" -> "jogador" ... -> "fim"
+    """
+
+    def __init__(self, dificuldade="Normal", semente=None, eventos=True, feiticeiro_jogador=None,
+                 feiticeiro_inimigo=None):
+        self.registrar_eventos = eventos
+        self.eventos = []
+        self.rng = random.Random()
+        self.novo_jogo(dificuldade, semente, feiticeiro_jogador, feiticeiro_inimigo)
+
+    def novo_jogo(self, dificuldade="Normal", semente=None, feiticeiro_jogador=None, feiticeiro_inimigo=None):
+        # feiticeiro_*: (magia, nível) de cada lado; None = o de base
+        if dificuldade not in DIFICULDADES:
+            dificuldade = "Normal"
+        if semente is None:
+            semente = random.randrange(2**32)
+        self.feiticeiro_jogador = tuple(feiticeiro_jogador or (MAGIA_BASE, NIVEL_BASE))
+        self.feiticeiro_inimigo = tuple(feiticeiro_inimigo or (MAGIA_BASE, NIVEL_BASE))
+        # dano e custo por Feitico.indice (progressao.TabelaNivel)
+        self.tabela_jogador = tabela(*self.feiticeiro_jogador)
+        self.tabela_inimigo = tabela(*self.feiticeiro_inimigo)
+        self.dificuldade = dificuldade
+        self.semente = semente
+        self.rng.seed(semente)
+
+        cfg = DIFICULDADES[dificuldade]
+        self.enemy_acc_mod = cfg["enemy_acc_mod"]
+        self.vida_jogador = cfg["vida"]
+        self.vida_inimigo = cfg["vida_inimigo"]
+        self.mana_jogador = cfg["mana"]
+        self.mana_inimigo = cfg["mana_inimigo"]
+        self.pocoes = 3
+        self.defesa_ativa = False
+        self.defesa_inimigo = False
+        self.status_player = EFEITOS.novo_estado()  # turnos restantes, um por efeito
+        self.status_enemy = EFEITOS.novo_estado()
+        self.turnos = 0
+        self.acertos_player = 0
+        self.acertos_enemy = 0
+        self.lancamentos = array("I", _CONTADORES_ZERADOS)  # por feitiço e lado
+        self.acertos_feiticos = array("I", _CONTADORES_ZERADOS)
+        self.game_over = False
+        self.vencedor = None
+        self.fase = "jogador"
+        # só cresce: um código por ação feita na vez certa (inclusive as
+        # recusadas por mana, que já aplicaram os status do turno)
+        self.acoes = bytearray()
+        self.eventos.clear()
+
+    def clonar(self, semente=None):
+        # Cópia independente e silenciosa (simulações, busca). semente=None
+        # mantém a sequência do RNG; uma busca deve passar outra semente
+        # para não "ver" os sorteios reais da partida.
+        c = copy.copy(self)
+        c.status_player = self.status_player[:]
+        c.status_enemy = self.status_enemy[:]
+        c.acoes = self.acoes[:]
+        c.lancamentos = self.lancamentos[:]
+        c.acertos_feiticos = self.acertos_feiticos[:]
+        c.registrar_eventos = False
+        c.eventos = []
+        c.rng = random.Random()
+        if semente is None:
+            c.rng.setstate(self.rng.getstate())
+        else:
+            c.rng.seed(semente)
+        return c
+
+    def chave(self):
+        # Estado de jogo como tupla (sem turnos/acertos e sem RNG)
+        return (self.vida_jogador, self.vida_inimigo, self.mana_jogador, self.mana_inimigo,
+                self.pocoes, self.defesa_ativa, self.defesa_inimigo, self.fase,
+                *self.status_player, *self.status_enemy)
+
+    # ---------- Eventos ----------
+    def _emitir(self, *evento):
+        if self.registrar_eventos:
+            self.eventos.append(evento)
+
+    def _log(self, texto):
+        if self.registrar_eventos:
+            self.eventos.append(("log", texto))
+
+    def drenar_eventos(self):
+        eventos = self.eventos
+        self.eventos = []
+        return eventos
+
+    # ---------- Regras ----------
+    def _dados_feitico(self, tipo):
+        return FEITICOS.get(tipo, FEITICO_NULO)
+
+    def _aplicar_status(self, quem):
+        # retorna True se ação deve ser pulada (efeito com pula_turno).
+        # Todos os efeitos ativos numa passada só (EFEITOS.tique)
+        status = self.status_enemy if quem == "enemy" else self.status_player
+        dano, cura, pula, fonte = EFEITOS.tique(status)
+        if dano:
+            if quem == "enemy":
+                self.vida_inimigo -= dano
+            else:
+                self.vida_jogador -= dano
+            self._emitir("dano_status", quem, dano, EFEITOS.por_indice[fonte].emoji)
+        if cura:
+            if quem == "enemy":
+                antes = self.vida_inimigo
+                self.vida_inimigo = max(antes, min(VIDA_MAXIMA, antes + cura))
+                ganho = self.vida_inimigo - antes
+            else:
+                antes = self.vida_jogador
+                self.vida_jogador = max(antes, min(VIDA_MAXIMA, antes + cura))
+                ganho = self.vida_jogador - antes
+            if ganho:
+                self._emitir("cura", quem, ganho)
+        return pula
+
+    def _aplicar_efeito(self, dados, quem, alvo):
+        # status do feitiço `dados` lançado por `quem` sobre `alvo` ("player"/"enemy")
+        status = self.status_enemy if alvo == "enemy" else self.status_player
+        status[dados.efeito] += dados.status_turnos
+        nome = EFEITOS.por_indice[dados.efeito].nome
+        if alvo == "player" and quem == "enemy":
+            self._log(f"✨ Efeito aplicado em você: {nome}!")
+        elif alvo == "enemy" and quem == "enemy":
+            self._log(f"✨ Inimigo ganhou: {nome}!")
+        else:
+            self._log(f"✨ Efeito aplicado: {nome}!")
+
+    def _reduzir_por_efeitos(self, dano, status):
+        # efeitos como Escudo reduzem o dano recebido (em %)
+        r = EFEITOS.reducao_dano(status)
+        if r:
+            dano = dano * (100 - r) // 100
+            self._log(f"🔰 Um efeito absorveu {r}% do dano.")
+        return dano
+
+    def _critico(self):
+        # 12% de chance de crítico (x1.6)
+        return self.rng.random() < 0.12
+
+    def _consumir_mana(self, de_quem, custo):
+        if de_quem == "player":
+            if self.mana_jogador < custo:
+                return False
+            self.mana_jogador -= custo
+        else:
+            if self.mana_inimigo < custo:
+                return False
+            self.mana_inimigo -= custo
+        return True
+
+    def _contabiliza_turno_player(self):
+        # conta turno sempre que sua vez passa (ação ou impedimento)
+        self.turnos += 1
+        # Regeneração leve de mana no fim do turno do jogador
+        self.mana_jogador = min(100, self.mana_jogador + 6)
+        self.fase = "inimigo"
+
+    def _verifica_fim(self):
+        if self.vida_inimigo <= 0:
+            self.vida_inimigo = 0
+            self._log("\n🎉 Você venceu a batalha!")
+            self._encerrar("player", "Você venceu!")
+            return True
+        if self.vida_jogador <= 0:
+            self.vida_jogador = 0
+            self._log("\n💀 Você foi derrotado pelo inimigo!")
+            self._encerrar("enemy", "Você perdeu!")
+            return True
+        return False
+
+    def _encerrar(self, vencedor, titulo):
+        self.game_over = True
+        self.vencedor = vencedor
+        self.fase = "fim"
+        self._emitir("fim", titulo)
+
+    # ---------- Ações do jogador ----------
+    # Cada ação retorna True se a vez passou para o inimigo (ou o jogo acabou),
+    # False se foi recusada (fora da vez, mana insuficiente).
+    def executar(self, acao):
+        if acao == "defender":
+            return self.defender()
+        if acao == "pocao":
+            return self.usar_pocao()
+        return self.turno_jogador(acao)
+
+    def turno_jogador(self, tipo):
+        if self.fase != "jogador":
+            return False
+        # Sem mana o feitiço é recusado antes de tudo: nada é gravado e os
+        # status não correm (a vez continua com o jogador)
+        dados = self._dados_feitico(tipo)
+        custo = self.tabela_jogador.mana[dados.indice]
+        if self.mana_jogador < custo:
+            self._log("⚠️ Mana insuficiente! Use uma poção ou DEFENDER enquanto regenera mana.")
+            self._emitir("som", "fail")
+            return False
+        self.acoes.append(_CODIGOS_JOGADOR.get(tipo, _CODIGO_FEITICO_NULO_JOGADOR))
+
+        # Checa status no INÍCIO do turno do jogador
+        pula = self._aplicar_status("player")
+        if self._verifica_fim():  # queimadura pode encerrar a batalha
+            return True
+        if pula:
+            self._log("🧊 Você está impedido de agir neste turno!")
+            self._contabiliza_turno_player()
+            return True
+
+        self._consumir_mana("player", custo)
+
+        self._log(f"Você lançou {dados.emoji} {dados.nome} ...")
+        self._emitir("tiro", "player")
+        conta = dados.indice >= 0
+        if conta:
+            self.lancamentos[dados.indice] += 1
+
+        # sorteio em [0, 100): acerta com probabilidade chance/100
+        rng = self.rng
+        if rng.random() * 100 < dados.chance:
+            dano = self.tabela_jogador.dano[dados.indice]
+            if self._critico():
+                dano = int(dano * 1.6)
+                self._log("💥 Acerto CRÍTICO!")
+            if self.defesa_inimigo:
+                dano = int(dano * 0.5)
+                self.defesa_inimigo = False
+                self._log("🛡️ O inimigo estava defendendo! Dano reduzido.")
+            dano = self._reduzir_por_efeitos(dano, self.status_enemy)
+            self.vida_inimigo -= dano
+            self._emitir("dano", "enemy", dano)
+            self.acertos_player += 1
+            if conta:
+                self.acertos_feiticos[dados.indice] += 1
+            self._emitir("som", "ok")
+
+            # Aplica status
+            if dados.status_alvo == "oponente" and dados.status and rng.random() * 100 < dados.status_chance:
+                self._aplicar_efeito(dados, "player", "enemy")
+
+        else:
+            self._log("❌ Você errou o feitiço!")
+            self._emitir("som", "fail")
+
+        # Status em si mesmo (escudo, regeneração): independe do acerto
+        if dados.status_alvo == "proprio" and dados.status and rng.random() * 100 < dados.status_chance:
+            self._aplicar_efeito(dados, "player", "player")
+
+        self.vida_inimigo = max(0, self.vida_inimigo)
+
+        if self._verifica_fim():
+            return True
+
+        self._contabiliza_turno_player()
+        return True
+
+    def defender(self):
+        if self.fase != "jogador":
+            return False
+        self.acoes.append(_CODIGOS_JOGADOR["defender"])
+        pula = self._aplicar_status("player")
+        if self._verifica_fim():  # queimadura pode encerrar a batalha
+            return True
+        if pula:
+            self._log("🧊 Você não conseguiu se defender — status impeditivo.")
+            self._contabiliza_turno_player()
+            return True
+        self.defesa_ativa = True
+        self._log("🛡️ Você assume posição DEFENSIVA! (metade do dano no próximo golpe)")
+        self._emitir("defesa", "player")
+        self._contabiliza_turno_player()
+        return True
+
+    def usar_pocao(self):
+        if self.fase != "jogador":
+            return False
+        self.acoes.append(_CODIGOS_JOGADOR["pocao"])
+
+        pula = self._aplicar_status("player")
+        if self._verifica_fim():  # queimadura pode encerrar a batalha
+            return True
+        if pula:
+            self._log("🧊 Você perdeu a chance de usar a poção neste turno.")
+            self._contabiliza_turno_player()
+            return True
+
+        if self.pocoes <= 0:
+            self._log("⚠️ Você não tem mais poções! Perdeu a vez.")
+            self._contabiliza_turno_player()
+            return True
+
+        self.pocoes -= 1
+        cura = 25
+        vida_antes = self.vida_jogador
+        self.vida_jogador = min(100, self.vida_jogador + cura)
+        ganho = self.vida_jogador - vida_antes
+
+        self._log(f"🧪 Você usou uma poção e recuperou {ganho} de vida!")
+        self._emitir("cura", "player", ganho)
+        self._emitir("som", "ok")
+
+        if self._verifica_fim():
+            return True
+
+        self._contabiliza_turno_player()
+        return True
+
+    # ---------- Turno do inimigo ----------
+    def _escolha_ia(self):
+        # IA simples com prioridade baseada em estado e mana; os pesos de
+        # cada situação vêm do registro de feitiços (pesos_ia)
+        options = REGISTRO.ids
+        regra = "padrao"
+        if self.vida_jogador < 35:
+            regra = "jogador_fraco"
+        if self.mana_inimigo < 25:
+            regra = "sem_mana"
+        if self.defesa_ativa:
+            regra = "jogador_defende"
+        weights = REGISTRO.pesos_ia[regra]
+
+        total = sum(weights)
+        pick = self.rng.uniform(0, total)
+        upto = 0
+        for opt, w in zip(options, weights):
+            if upto + w >= pick:
+                return opt
+            upto += w
+        return self.rng.choice(options)
+
+    def turno_inimigo(self, tipo=None):
+        # tipo=None: a IA embutida decide; senão um feitiço ou "defender"
+        # escolhido por uma política externa (torneios, MCTS, rede)
+        if self.fase != "inimigo":
+            return False
+        self.acoes.append(codificar_acao("enemy", tipo))
+
+        # Status do inimigo no INÍCIO do turno dele
+        pula = self._aplicar_status("enemy")
+        if self._verifica_fim():  # queimadura pode encerrar a batalha
+            return True
+        if pula:
+            self._log("🧊 Inimigo está impedido de agir neste turno!")
+            self._final_turno_inimigo()
+            return True
+
+        # Chance do inimigo se defender se estiver com pouca vida
+        rng = self.rng
+        if tipo is None:
+            if self.vida_inimigo <= 25 and rng.random() < 0.35:
+                tipo = "defender"
+            else:
+                tipo = self._escolha_ia()
+
+        if tipo == "defender":
+            self.defesa_inimigo = True
+            self._log("🛡️ Inimigo está DEFENDENDO!")
+            self._emitir("defesa", "enemy")
+            self._final_turno_inimigo()
+            return True
+
+        # Mana check
+        dados = self._dados_feitico(tipo)
+
+        # Se sem mana, recupera mana e passa o turno
+        if not self._consumir_mana("enemy", self.tabela_inimigo.mana[dados.indice]):
+            self._log("💤 Inimigo está canalizando mana... (+10)")
+            self.mana_inimigo = min(100, self.mana_inimigo + 10)
+            self._final_turno_inimigo()
+            return True
+
+        self._log(f"Inimigo lançou {dados.emoji} {dados.nome} ...")
+        self._emitir("tiro", "enemy")
+        conta = dados.indice >= 0
+        if conta:
+            self.lancamentos[N_FEITICOS + dados.indice] += 1
+
+        acc_mod = self.enemy_acc_mod
+        if rng.random() * 100 < max(5, min(95, dados.chance + acc_mod)):
+            dano = self.tabela_inimigo.dano[dados.indice]
+            if self._critico():
+                dano = int(dano * 1.6)
+                self._log("💥 Inimigo acertou um CRÍTICO!")
+            if self.defesa_ativa:
+                dano = int(dano * 0.5)
+                self.defesa_ativa = False
+                self._log("🛡️ Sua defesa reduziu o dano pela metade!")
+            dano = self._reduzir_por_efeitos(dano, self.status_player)
+            self.vida_jogador -= dano
+            self._emitir("dano", "player", dano)
+            self.acertos_enemy += 1
+            if conta:
+                self.acertos_feiticos[N_FEITICOS + dados.indice] += 1
+            self._emitir("som", "fail")
+
+            # Aplica status
+            if dados.status_alvo == "oponente" and dados.status and rng.random() * 100 < dados.status_chance:
+                self._aplicar_efeito(dados, "enemy", "player")
+        else:
+            self._log("🙌 O inimigo errou o feitiço!")
+            self._emitir("som", "ok")
+
+        if dados.status_alvo == "proprio" and dados.status and rng.random() * 100 < dados.status_chance:
+            self._aplicar_efeito(dados, "enemy", "enemy")
+
+        self.vida_jogador = max(0, self.vida_jogador)
+
+        if self._verifica_fim():
+            return True
+
+        self._final_turno_inimigo()
+        return True
+
+    def _final_turno_inimigo(self):
+        # Regeneração leve de mana no fim do turno do inimigo
+        self.mana_inimigo = min(100, self.mana_inimigo + 6)
+        self.fase = "jogador"
+
+
+# ---------- Políticas do jogador (simulação) ----------
+def politica_aleatoria(motor, rng):
+    # Feitiço acessível ao acaso; defende quando não há mana, bebe poção com vida baixa
+    if motor.vida_jogador <= 40 and motor.pocoes > 0 and rng.random() < 0.5:
+        return "pocao"
+    custos = motor.tabela_jogador.mana
+    opcoes = [t for t, d in FEITICOS.items() if custos[d.indice] <= motor.mana_jogador]
+    if not opcoes:
+        return "defender"
+    return rng.choice(opcoes)
+
+
+def jogar_partida(motor, politica=politica_aleatoria, rng=None, limite_turnos=500, politica_inimigo=None):
+    """
+    Joga uma partida completa sem interface. Retorna o vencedor
+    ("player"/"enemy") ou None se atingir o limite de turnos.
+    politica_inimigo(motor, rng) -> feitiço/"defender"/None (None = IA embutida).
+    """
+    if rng is None:
+        rng = random.Random(motor.semente ^ 0x5EED)
+    while not motor.game_over and motor.turnos < limite_turnos:
+        if not motor.executar(politica(motor, rng)):
+            motor.defender()
+        if motor.fase == "inimigo":
+            motor.turno_inimigo(politica_inimigo(motor, rng) if politica_inimigo else None)
+    return motor.vencedor
+
+
+def simular(partidas, dificuldade="Normal", semente=0, politica=politica_aleatoria, estatisticas=None):
+    # Partidas independentes e reproduzíveis: semente da partida i = semente + i
+    # estatisticas: estatisticas.Estatisticas que registra cada partida
+    vitorias = 0
+    turnos = 0
+    motor = MotorBatalha(dificuldade, semente, eventos=False)
+    for i in range(partidas):
+        motor.novo_jogo(dificuldade, semente + i)
+        if jogar_partida(motor, politica) == "player":
+            vitorias += 1
+        turnos += motor.turnos
+        if estatisticas is not None:
+            estatisticas.registrar(motor, "simulacao")
+    return {"partidas": partidas, "vitorias": vitorias, "turnos": turnos}
+
+
+# ---------- Main ----------
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Simulação em massa da Batalha dos Feiticeiros (sem interface).")
+    parser.add_argument("--partidas", type=int, default=10000)
+    parser.add_argument("--dificuldade", default="Normal", choices=DIFICULDADES_IA_EMBUTIDA)
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--estatisticas", nargs="?", const="", default=None, metavar="BANCO",
+                        help="registra as partidas na base de estatísticas (estatisticas.py)")
+    args = parser.parse_args(argv)
+
+    est = None
+    if args.estatisticas is not None:
+        from estatisticas import BANCO, Estatisticas
+        est = Estatisticas(args.estatisticas or BANCO)
+    inicio = time.perf_counter()
+    r = simular(args.partidas, args.dificuldade, args.semente, estatisticas=est)
+    if est is not None:
+        est.fechar()
+    duracao = time.perf_counter() - inicio
+
+    n = max(1, r["partidas"])
+    print(f"Dificuldade: {args.dificuldade}")
+    print(f"Partidas: {r['partidas']} | Vitórias do jogador: {r['vitorias']} ({100 * r['vitorias'] / n:.1f}%)")
+    print(f"Turnos médios: {r['turnos'] / n:.2f}")
+    print(f"Tempo: {duracao:.2f}s ({r['partidas'] / max(duracao, 1e-9):,.0f} partidas/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+# Batalha dos Feiticeiros — Oponente MCTS (dificuldade "Especialista")
+# Busca em árvore Monte Carlo (UCT) sobre as regras sem interface de
+# motor_batalha.py, com orçamento de tempo por turno:
+# - Nós são estados do início do turno do inimigo (tabela de transposição),
+#   então a árvore é reaproveitada entre turnos e entre ramos que se cruzam
+# - O jogador é modelado pela política gulosa; fora da árvore os dois lados
+#   seguem políticas rápidas até o fim da partida
+# - Cada simulação usa uma semente nova: a busca nunca enxerga os sorteios
+#   reais da partida
+# - pensar() roda numa thread; a interface só consulta o Future via root.after.
+#   Cada busca guarda a árvore em que começou e tem o próprio RNG, então
+#   reiniciar() na thread da interface não mexe numa busca em andamento
+
+import math
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from motor_batalha import FEITICOS
+from politicas import gulosa, ia_padrao
+
+EXPLORACAO = 1.2
+LIMITE_NOS = 200000
+
+
+class _No:
+    __slots__ = ("visitas", "n", "w")
+
+    def __init__(self, acoes):
+        self.visitas = 0
+        self.n = dict.fromkeys(acoes, 0)
+        self.w = dict.fromkeys(acoes, 0.0)
+
+
+def acoes_inimigo(motor):
+    # Feitiços acessíveis, defender e (se houver) um feitiço caro = canalizar mana
+    acoes = []
+    canalizar = None
+    custos = motor.tabela_inimigo.mana
+    for tipo, d in FEITICOS.items():
+        if custos[d.indice] <= motor.mana_inimigo:
+            acoes.append(tipo)
+        elif canalizar is None:
+            canalizar = tipo
+    acoes.append("defender")
+    if canalizar:
+        acoes.append(canalizar)
+    return acoes
+
+
+class OponenteMCTS:
+    def __init__(self, orcamento_ms=400, semente=None, limite_turnos=60):
+        # limite_turnos: turnos simulados além do atual em cada iteração
+        self.orcamento_ms = orcamento_ms
+        self.limite_turnos = limite_turnos
+        self.rng = random.Random(semente)
+        self.arvore = {}
+        self.iteracoes = 0  # da última busca
+        self._executor = None
+
+    def reiniciar(self):
+        # Nova partida: a árvore antiga não ajuda (e ocupa memória). Troca o
+        # dicionário em vez de esvaziá-lo: uma busca ainda rodando na thread
+        # termina na árvore velha, que depois é descartada
+        self.arvore = {}
+
+    # ---------- Busca ----------
+    def escolher(self, motor, orcamento_ms=None, rng=None):
+        """
+        Melhor ação do inimigo para o estado atual (motor na fase "inimigo").
+        Não altera `motor`.
+        """
+        if len(self.arvore) > LIMITE_NOS:
+            self.arvore = {}
+        arvore = self.arvore
+        rng = rng or self.rng
+        prazo = time.perf_counter() + (orcamento_ms or self.orcamento_ms) / 1000
+        raiz = motor.chave()
+        fim = motor.turnos + self.limite_turnos  # horizonte contado a partir de agora
+        iteracoes = 0
+        while True:
+            self._iteracao(motor.clonar(rng.getrandbits(64)), arvore, rng, fim)
+            iteracoes += 1
+            if time.perf_counter() >= prazo:
+                break
+        self.iteracoes = iteracoes
+        no = arvore.get(raiz)
+        if no is None:
+            # a raiz não foi expandida (partida já no fim): uma jogada válida qualquer
+            return ia_padrao(motor, "enemy", rng)
+        # ação mais visitada (mais robusta que a de maior média)
+        return max(no.n, key=no.n.get)
+
+    def _iteracao(self, sim, arvore, rng, fim):
+        caminho = []
+        expandiu = False
+        while not sim.game_over and sim.turnos < fim:
+            if sim.fase == "jogador":
+                if not sim.executar(gulosa(sim, "player", rng)):
+                    sim.defender()
+                continue
+            if expandiu:
+                # fora da árvore: política rápida
+                sim.turno_inimigo(ia_padrao(sim, "enemy", rng))
+                continue
+            chave = sim.chave()
+            no = arvore.get(chave)
+            if no is None:
+                no = arvore[chave] = _No(acoes_inimigo(sim))
+                expandiu = True
+            acao = self._ucb(no)
+            caminho.append((no, acao))
+            sim.turno_inimigo(acao)
+
+        if sim.vencedor == "enemy":
+            recompensa = 1.0
+        elif sim.vencedor == "player":
+            recompensa = 0.0
+        else:
+            # limite de turnos: avalia pela vida relativa
+            total = sim.vida_jogador + sim.vida_inimigo
+            recompensa = sim.vida_inimigo / total if total else 0.5
+        for no, acao in caminho:
+            no.visitas += 1
+            no.n[acao] += 1
+            no.w[acao] += recompensa
+
+    def _ucb(self, no):
+        log_n = math.log(no.visitas + 1)
+        melhor, valor = None, -1.0
+        for acao, n in no.n.items():
+            if n == 0:
+                return acao
+            v = no.w[acao] / n + EXPLORACAO * math.sqrt(log_n / n)
+            if v > valor:
+                melhor, valor = acao, v
+        return melhor
+
+    # ---------- Fora da thread da interface ----------
+    def pensar(self, motor):
+        """
+        Inicia a busca numa thread e devolve um Future com a ação.
+        A busca trabalha numa cópia; o motor da interface não é tocado.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mcts")
+        # a semente sai do RNG aqui, na thread de quem chama
+        rng = random.Random(self.rng.getrandbits(64))
+        return self._executor.submit(self.escolher, motor.clonar(), None, rng)
+
+    def encerrar(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# ---------- Main ----------
+def main(argv=None):
+    # Mede o MCTS contra a política gulosa do jogador, sem interface
+    import argparse
+    from motor_batalha import MotorBatalha, jogar_partida
+    from politicas import para_jogador
+
+    parser = argparse.ArgumentParser(description="Avalia o oponente MCTS sem interface.")
+    parser.add_argument("--partidas", type=int, default=50)
+    parser.add_argument("--orcamento-ms", type=int, default=100)
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    oponente = OponenteMCTS(args.orcamento_ms, semente=args.semente)
+    motor = MotorBatalha("Especialista", eventos=False)
+    derrotas = iteracoes = jogadas = 0
+    for i in range(args.partidas):
+        motor.novo_jogo("Especialista", args.semente + i)
+        oponente.reiniciar()
+
+        def politica_inimigo(m, rng):
+            nonlocal iteracoes, jogadas
+            acao = oponente.escolher(m)
+            iteracoes += oponente.iteracoes
+            jogadas += 1
+            return acao
+
+        if jogar_partida(motor, para_jogador(gulosa), politica_inimigo=politica_inimigo) == "enemy":
+            derrotas += 1
+    print(f"MCTS ({args.orcamento_ms} ms/turno) venceu {derrotas}/{args.partidas} "
+          f"({100 * derrotas / max(1, args.partidas):.1f}%) contra a política gulosa; "
+          f"{iteracoes / max(1, jogadas):,.0f} simulações por turno")
+
+
+if __name__ == "__main__":
+    main()
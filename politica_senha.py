@@ -0,0 +1,241 @@
+# Gerador de Senhas — Políticas
+# Senhas que cumprem uma política já na construção (sem gerar-e-rejeitar):
+# - mínimo de caracteres por classe, exclusão de caracteres ambíguos e
+#   opção de não repetir caracteres
+# - a política conta exatamente quantas senhas válidas existem (função
+#   geradora exponencial por classe); a entropia é log2 desse total
+# - cada senha sorteia primeiro quantos caracteres de cada classe terá, com
+#   peso igual ao número de senhas válidas com essa composição, depois os
+#   caracteres de cada classe e por fim embaralha as posições; o resultado
+#   é uniforme sobre todas as senhas válidas e o custo não depende de quão
+#   restritiva é a política
+#
+# Execução:
+#   python politica_senha.py --tamanho 12 --min-numeros 2 --min-simbolos 1 --sem-ambiguos
+
+import bisect
+import math
+import os
+import random
+import string
+from math import comb
+
+AMBIGUOS = "Il1|O0o"
+CLASSES = {
+    "minusculas": string.ascii_lowercase,
+    "maiusculas": string.ascii_uppercase,
+    "numeros": string.digits,
+    "simbolos": "!@#$%&*",
+}
+
+
+_sr = random.SystemRandom()  # para os sorteios com inteiros grandes (composição)
+_fonte = {"pid": None, "bytes": None}
+
+
+def _bytes_urandom():
+    while True:
+        yield from os.urandom(65536)
+
+
+def _bytes():
+    # Bytes do CSPRNG do sistema, lidos em blocos. Um fluxo por processo:
+    # filhos do pool (fork) nunca reaproveitam o buffer do pai
+    pid = os.getpid()
+    if _fonte["pid"] != pid:
+        _fonte["pid"] = pid
+        _fonte["bytes"] = _bytes_urandom()
+    return _fonte["bytes"]
+
+
+def _abaixo(n, fluxo):
+    # inteiro uniforme em [0, n), n <= 256, por rejeição sobre um byte
+    limite = 256 - 256 % n
+    b = next(fluxo)
+    while b >= limite:
+        b = next(fluxo)
+    return b % n
+
+
+def _embaralhar(lista, fluxo, ate=0):
+    # Fisher-Yates; com `ate` > 0 só embaralha o fim (amostra sem reposição)
+    for i in range(len(lista) - 1, ate - 1 if ate else 0, -1):
+        j = _abaixo(i + 1, fluxo) if i < 256 else _sr.randrange(i + 1)
+        lista[i], lista[j] = lista[j], lista[i]
+
+
+class PoliticaSenha:
+    """
+    classes: {nome: caracteres} (disjuntas); classes ausentes não são usadas.
+    minimos: {nome: quantidade mínima}.
+    """
+
+    def __init__(self, classes=None, minimos=None, excluir_ambiguos=False, sem_repeticao=False,
+                 excluir=""):
+        classes = dict(CLASSES if classes is None else classes)
+        removidos = set(excluir) | (set(AMBIGUOS) if excluir_ambiguos else set())
+        self.classes = {}
+        for nome, chars in classes.items():
+            chars = "".join(c for c in dict.fromkeys(chars) if c not in removidos)
+            if chars:
+                self.classes[nome] = chars
+        vistos = set()
+        for chars in self.classes.values():
+            if vistos & set(chars):
+                raise ValueError("as classes de caracteres precisam ser disjuntas")
+            vistos |= set(chars)
+        self.minimos = dict(minimos or {})
+        for nome, minimo in self.minimos.items():
+            if isinstance(minimo, bool) or not isinstance(minimo, int) or minimo < 0:
+                raise ValueError(f"o mínimo de {nome} precisa ser um inteiro não negativo: {minimo!r}")
+            if minimo and nome not in self.classes:
+                raise ValueError(f"classe sem caracteres disponíveis: {nome}")
+        self.sem_repeticao = sem_repeticao
+        self._nomes = list(self.classes)
+        self._tabelas = {}  # tamanho -> tabelas de contagem
+
+    def __reduce__(self):
+        # para o modo paralelo: recria sem as tabelas (refeitas no processo)
+        return (_recriar, (self.classes, self.minimos, self.sem_repeticao))
+
+    @property
+    def alfabeto(self):
+        return "".join(self.classes.values())
+
+    # ---------- Contagem ----------
+    def _formas(self, n, k):
+        # sequências de k caracteres de uma classe com n caracteres
+        if self.sem_repeticao:
+            return math.perm(n, k)
+        return n ** k
+
+    def _preparar(self, tamanho):
+        """
+        prefixo[i][j]: senhas de j posições usando só as i primeiras classes
+        (com os mínimos delas cumpridos). É a convolução das funções
+        geradoras exponenciais; comb(j, k) escolhe as posições da classe i.
+        """
+        tabelas = self._tabelas.get(tamanho)
+        if tabelas is not None:
+            return tabelas
+        prefixo = [[1] + [0] * tamanho]
+        for nome in self._nomes:
+            n = len(self.classes[nome])
+            minimo = self.minimos.get(nome, 0)
+            maximo = min(tamanho, n) if self.sem_repeticao else tamanho
+            anterior = prefixo[-1]
+            atual = [0] * (tamanho + 1)
+            for j in range(tamanho + 1):
+                if anterior[j]:
+                    for k in range(minimo, min(maximo, tamanho - j) + 1):
+                        atual[j + k] += anterior[j] * comb(j + k, k) * self._formas(n, k)
+            prefixo.append(atual)
+        tabelas = self._tabelas[tamanho] = (prefixo, {})
+        return tabelas
+
+    def total(self, tamanho):
+        """Número exato de senhas de `tamanho` caracteres que cumprem a política."""
+        return self._preparar(tamanho)[0][-1][tamanho]
+
+    def entropia(self, tamanho):
+        # bits, supondo sorteio uniforme entre as senhas válidas
+        total = self.total(tamanho)
+        return math.log2(total) if total else 0.0
+
+    def _cumulativos(self, tamanho, i, j):
+        # pesos acumulados de k (quantidade da classe i) dado j posições para as classes 0..i
+        prefixo, cache = self._preparar(tamanho)
+        chave = (i, j)
+        if chave not in cache:
+            n = len(self.classes[self._nomes[i]])
+            minimo = self.minimos.get(self._nomes[i], 0)
+            ks, acumulado, soma = [], [], 0
+            for k in range(minimo, j + 1):
+                if self.sem_repeticao and k > n:
+                    break
+                p = prefixo[i][j - k] * comb(j, k) * self._formas(n, k)
+                if p:
+                    soma += p
+                    ks.append(k)
+                    acumulado.append(soma)
+            cache[chave] = (ks, acumulado)
+        return cache[chave]
+
+    # ---------- Geração ----------
+    def gerar(self, tamanho):
+        if not self.total(tamanho):
+            raise ValueError(f"nenhuma senha de {tamanho} caracteres cumpre a política")
+        # composição: da última classe para a primeira
+        quantidades = [0] * len(self._nomes)
+        j = tamanho
+        for i in range(len(self._nomes) - 1, -1, -1):
+            ks, acumulado = self._cumulativos(tamanho, i, j)
+            r = _sr.randrange(acumulado[-1])
+            k = ks[bisect.bisect_right(acumulado, r)]
+            quantidades[i] = k
+            j -= k
+        fluxo = _bytes()
+        chars = []
+        for nome, k in zip(self._nomes, quantidades):
+            if not k:
+                continue
+            pool = self.classes[nome]
+            n = len(pool)
+            if self.sem_repeticao:
+                # os k últimos de um Fisher-Yates parcial
+                escolha = list(pool)
+                _embaralhar(escolha, fluxo, ate=n - k)
+                chars += escolha[n - k:]
+            else:
+                chars += [pool[_abaixo(n, fluxo)] for _ in range(k)]
+        _embaralhar(chars, fluxo)
+        return "".join(chars)
+
+    def gerar_bytes(self, quantidade, tamanho):
+        # Mesmo formato de gerador_senha.gerar_bytes: uma senha por linha, ASCII
+        if not self.alfabeto.isascii():
+            raise ValueError("o alfabeto precisa ser ASCII")
+        return "".join(self.gerar(tamanho) + "\n" for _ in range(quantidade)).encode("ascii")
+
+    def descrever(self, tamanho):
+        partes = [f"{nome} ({len(chars)})" + (f" ≥{self.minimos[nome]}" if self.minimos.get(nome) else "")
+                  for nome, chars in self.classes.items()]
+        return (f"{tamanho} caracteres de {', '.join(partes)}"
+                + ("; sem repetição" if self.sem_repeticao else ""))
+
+
+def _recriar(classes, minimos, sem_repeticao):
+    return PoliticaSenha(classes, minimos, sem_repeticao=sem_repeticao)
+
+
+# ---------- Main ----------
+def main(argv=None):
+    # Mostra a entropia de uma política e algumas senhas de exemplo
+    import argparse
+    parser = argparse.ArgumentParser(description="Entropia e exemplos de uma política de senha.")
+    parser.add_argument("--tamanho", type=int, default=12)
+    for nome in CLASSES:
+        parser.add_argument(f"--min-{nome}", type=int, default=0)
+    parser.add_argument("--sem-ambiguos", action="store_true", help=f"remove {AMBIGUOS}")
+    parser.add_argument("--sem-repeticao", action="store_true")
+    parser.add_argument("-n", "--quantidade", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    minimos = {nome: getattr(args, f"min_{nome}") for nome in CLASSES}
+    try:
+        politica = PoliticaSenha(minimos=minimos, excluir_ambiguos=args.sem_ambiguos,
+                                 sem_repeticao=args.sem_repeticao)
+    except ValueError as e:
+        parser.error(str(e))
+    bits = politica.entropia(args.tamanho)
+    livre = args.tamanho * math.log2(len(politica.alfabeto))
+    print(f"Política: {politica.descrever(args.tamanho)}")
+    print(f"Senhas válidas: ~2^{bits:.2f} — entropia {bits:.2f} bits "
+          f"(sem restrições: {livre:.2f} bits)")
+    if politica.total(args.tamanho):
+        for _ in range(args.quantidade):
+            print(politica.gerar(args.tamanho))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# Batalha dos Feiticeiros — Política Treinada (inimigo)
+# Inferência da política que o ambiente_rl.py treina, em Python puro (a
+# interface não precisa de numpy):
+# - observacao(motor): vetor de tamanho fixo do ponto de vista do inimigo,
+#   os mesmos números que ambiente_rl.observar() monta para o lote inteiro
+# - mascara(motor): quais ações são válidas agora (feitiço sem mana não é;
+#   custos da tabela do feiticeiro inimigo, progressao.py)
+# - PoliticaLinear: um peso por (ação, campo da observação); escolhe a
+#   ação válida de maior valor. Arquivo JSON com as regras (impressão do
+#   registro de feitiços) para não carregar pesos treinados com outras
+# - OponentePolitica: a mesma interface do OponenteMCTS (pensar/reiniciar/
+#   encerrar), para a dificuldade "Treinada"
+#
+# Execução (treino):
+#   python ambiente_rl.py --treinar --saida tabelas/politica_treinada.json
+
+import json
+import os
+from concurrent.futures import Future
+
+from motor_batalha import EFEITOS, FEITICOS, REGISTRO
+
+CAMINHO_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tabelas", "politica_treinada.json")
+VERSAO = 1
+
+# ---------- Observação e ações ----------
+# Escalas: vida e mana /100, poções /3, turnos de status /5
+OBSERVACAO = (("vida_propria", "vida_oponente", "mana_propria", "mana_oponente", "pocoes_oponente",
+               "defesa_propria", "defesa_oponente")
+              + tuple(f"status_proprio.{e}" for e in EFEITOS.indice)
+              + tuple(f"status_oponente.{e}" for e in EFEITOS.indice)
+              + ("constante",))
+
+# Feitiços (ordem do registro), defender e canalizar: pedir o feitiço mais
+# caro sem mana para ele (o motor converte em +10 de mana)
+ACOES = REGISTRO.ids + ("defender", "canalizar")
+DEFENDER = len(REGISTRO)
+CANALIZAR = DEFENDER + 1
+FEITICO_CANALIZAR = max(REGISTRO.ids, key=lambda t: FEITICOS[t].mana)
+CUSTOS = tuple(FEITICOS[t].mana for t in REGISTRO.ids)
+CUSTO_CANALIZAR = FEITICOS[FEITICO_CANALIZAR].mana
+
+
+def observacao(motor):
+    return ([motor.vida_inimigo / 100, motor.vida_jogador / 100, motor.mana_inimigo / 100,
+             motor.mana_jogador / 100, motor.pocoes / 3, float(motor.defesa_inimigo), float(motor.defesa_ativa)]
+            + [t / 5 for t in motor.status_enemy]
+            + [t / 5 for t in motor.status_player]
+            + [1.0])
+
+
+def mascara(motor):
+    mana = motor.mana_inimigo
+    custos = motor.tabela_inimigo.mana
+    return [custos[i] <= mana for i in range(len(CUSTOS))] + [True, mana < custos[FEITICOS[FEITICO_CANALIZAR].indice]]
+
+
+def para_motor(acao):
+    # índice em ACOES -> argumento de motor.turno_inimigo
+    if acao == CANALIZAR:
+        return FEITICO_CANALIZAR
+    return ACOES[acao]
+
+
+# ---------- Política ----------
+class PoliticaLinear:
+    def __init__(self, pesos, info=None):
+        # pesos: uma linha por ação em ACOES, uma coluna por campo de OBSERVACAO
+        if len(pesos) != len(ACOES) or any(len(linha) != len(OBSERVACAO) for linha in pesos):
+            raise ValueError(f"pesos devem ser {len(ACOES)}x{len(OBSERVACAO)}")
+        self.pesos = [[float(x) for x in linha] for linha in pesos]
+        self.info = info or {}
+
+    def valores(self, obs):
+        return [sum(p * o for p, o in zip(linha, obs)) for linha in self.pesos]
+
+    def escolher(self, motor):
+        valido = mascara(motor)
+        melhor, valor = DEFENDER, None
+        for a, v in enumerate(self.valores(observacao(motor))):
+            if valido[a] and (valor is None or v > valor):
+                melhor, valor = a, v
+        return para_motor(melhor)
+
+    def salvar(self, caminho):
+        os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+        dados = {"versao": VERSAO, "impressao": REGISTRO.impressao.hex(), "observacao": list(OBSERVACAO),
+                 "acoes": list(ACOES), "pesos": self.pesos, "info": self.info}
+        with open(caminho, "w", encoding="utf-8") as f:
+            json.dump(dados, f, indent=1, ensure_ascii=False)
+
+    @classmethod
+    def carregar(cls, caminho=CAMINHO_PADRAO):
+        # OSError: arquivo ausente; ValueError: formato ou regras diferentes
+        with open(caminho, encoding="utf-8") as f:
+            dados = json.load(f)
+        if dados.get("versao") != VERSAO:
+            raise ValueError(f"versão de política não suportada: {dados.get('versao')}")
+        if dados.get("impressao") != REGISTRO.impressao.hex():
+            raise ValueError("política treinada com outras regras de feitiços; treine de novo")
+        if tuple(dados.get("observacao", ())) != OBSERVACAO or tuple(dados.get("acoes", ())) != ACOES:
+            raise ValueError("observação ou ações diferentes das desta versão")
+        return cls(dados["pesos"], dados.get("info"))
+
+
+# ---------- Oponente ----------
+class OponentePolitica:
+    """Inimigo da dificuldade "Treinada": decide na hora, sem thread."""
+
+    def __init__(self, politica):
+        self.politica = politica
+
+    @classmethod
+    def carregar(cls, caminho=CAMINHO_PADRAO):
+        return cls(PoliticaLinear.carregar(caminho))
+
+    def reiniciar(self):
+        pass
+
+    def pensar(self, motor):
+        futuro = Future()
+        futuro.set_result(self.politica.escolher(motor))
+        return futuro
+
+    def encerrar(self):
+        pass
@@ -0,0 +1,151 @@
+# Batalha dos Feiticeiros — Políticas de Jogo
+# Políticas plugáveis para qualquer lado da batalha:
+#   politica(motor, quem, rng) -> ação
+# quem: "player" ou "enemy". Ações: nome do feitiço, "defender", "pocao"
+# (poção só existe para o jogador). O rng é da política, nunca o do motor,
+# para não desviar a sequência de sorteios das regras. Dano e custo dos
+# feitiços vêm da tabela do feiticeiro de cada lado (progressao.py).
+
+from motor_batalha import FEITICOS, REGISTRO
+
+# Dano esperado por acerto, já contando o crítico (12% de x1.6)
+FATOR_CRITICO = 1 + 0.12 * 0.6
+
+
+# ---------- Visão do estado ----------
+def visao(motor, quem):
+    # (minha_vida, vida_oponente, minha_mana, defesa_oponente, pocoes)
+    if quem == "player":
+        return (motor.vida_jogador, motor.vida_inimigo, motor.mana_jogador,
+                motor.defesa_inimigo, motor.pocoes)
+    return (motor.vida_inimigo, motor.vida_jogador, motor.mana_inimigo,
+            motor.defesa_ativa, 0)
+
+
+def tabela(motor, quem):
+    # progressao.TabelaNivel de quem joga: dano e custo por Feitico.indice
+    return motor.tabela_jogador if quem == "player" else motor.tabela_inimigo
+
+
+def acoes_validas(motor, quem):
+    _, _, mana, _, pocoes = visao(motor, quem)
+    custos = tabela(motor, quem).mana
+    acoes = [t for t, d in FEITICOS.items() if custos[d.indice] <= mana]
+    acoes.append("defender")
+    if pocoes > 0:
+        acoes.append("pocao")
+    return acoes
+
+
+def _sem_mana(motor, quem):
+    # Nenhum feitiço acessível: o jogador defende; o inimigo pede o feitiço
+    # mais barato, que o motor troca por canalizar mana (+10), como na IA embutida
+    if quem == "player":
+        return "defender"
+    custos = tabela(motor, quem).mana
+    return min(FEITICOS, key=lambda t: custos[FEITICOS[t].indice])
+
+
+def _precisao(motor, quem, tipo):
+    chance = FEITICOS[tipo].chance
+    if quem == "enemy":
+        chance = max(5, min(95, chance + motor.enemy_acc_mod))
+    return chance / 100
+
+
+# ---------- Políticas ----------
+def ia_padrao(motor, quem, rng):
+    # A IA original (_escolha_ia) vista do lado de quem joga
+    vida, vida_op, mana, _, pocoes = visao(motor, quem)
+    defesa_op = motor.defesa_ativa if quem == "enemy" else motor.defesa_inimigo
+    if vida <= 25 and rng.random() < 0.35:
+        return "defender"
+    regra = "padrao"
+    if vida_op < 35:
+        regra = "jogador_fraco"
+    if mana < 25:
+        regra = "sem_mana"
+    if defesa_op:
+        regra = "jogador_defende"
+    tipo = rng.choices(REGISTRO.ids, REGISTRO.pesos_ia[regra])[0]
+    if tabela(motor, quem).mana[FEITICOS[tipo].indice] > mana and quem == "player":
+        return "defender"
+    return tipo  # inimigo sem mana para ele: o motor canaliza, como na IA embutida
+
+
+def ia_embutida(motor, quem, rng):
+    # Lado inimigo: deixa o motor decidir com a IA embutida (mesmo RNG das regras)
+    if quem == "enemy":
+        return None
+    return ia_padrao(motor, quem, rng)
+
+
+def gulosa(motor, quem, rng):
+    # Maximiza o dano esperado neste turno; cura quando a vida está baixa
+    vida, vida_op, mana, defesa_op, pocoes = visao(motor, quem)
+    if pocoes > 0 and vida <= 35:
+        return "pocao"
+    melhor, valor = None, 0.0
+    t = tabela(motor, quem)
+    for tipo, d in FEITICOS.items():
+        if t.mana[d.indice] > mana:
+            continue
+        dano = t.dano[d.indice]
+        esperado = _precisao(motor, quem, tipo) * dano * FATOR_CRITICO
+        if defesa_op:
+            esperado *= 0.5
+        # golpe que pode finalizar vale mais
+        if dano >= vida_op:
+            esperado += _precisao(motor, quem, tipo) * 100
+        if esperado > valor:
+            melhor, valor = tipo, esperado
+    if melhor is None:
+        return _sem_mana(motor, quem) if min(t.mana[:-1]) > mana else "defender"
+    return melhor
+
+
+def _roteiro():
+    # Do registro: o mais barato, o segundo mais barato, o mais barato de
+    # novo, o de maior dano e defender (raio, fogo, raio, meteoros no
+    # arquivo padrão)
+    por_custo = sorted(REGISTRO, key=lambda f: (f.mana, -f.dano))
+    barato, segundo = por_custo[0].id, por_custo[min(1, len(por_custo) - 1)].id
+    forte = max(REGISTRO, key=lambda f: f.dano).id
+    return (barato, segundo, barato, forte, "defender")
+
+
+ROTEIRO = _roteiro()
+
+
+def roteirizada(motor, quem, rng):
+    # Sequência fixa por turno; sem mana para o feitiço da vez, defende
+    # (o inimigo sem mana para nenhum feitiço canaliza)
+    tipo = ROTEIRO[motor.turnos % len(ROTEIRO)]
+    if tipo == "defender":
+        return tipo
+    mana = visao(motor, quem)[2]
+    custos = tabela(motor, quem).mana
+    if custos[FEITICOS[tipo].indice] > mana:
+        return _sem_mana(motor, quem) if min(custos[:-1]) > mana else "defender"
+    return tipo
+
+
+def aleatoria(motor, quem, rng):
+    return rng.choice(acoes_validas(motor, quem))
+
+
+POLITICAS = {
+    "ia": ia_embutida,
+    "gulosa": gulosa,
+    "roteirizada": roteirizada,
+    "aleatoria": aleatoria,
+}
+
+
+def para_jogador(politica):
+    # Adapta para a assinatura de motor_batalha.jogar_partida
+    return lambda motor, rng: politica(motor, "player", rng)
+
+
+def para_inimigo(politica):
+    return lambda motor, rng: politica(motor, "enemy", rng)
@@ -0,0 +1,250 @@
+# Batalha dos Feiticeiros — Progressão (magia e nível dos feiticeiros)
+# Cada feiticeiro tem magia e nível; o poder de ataque
+# (funcoes_adicionais.poder_ataque) escala o dano e o custo de mana dos
+# feitiços em relação ao PODER_BASE:
+#   dano = dano_base * (100 * PODER_BASE + GANHO_DANO * (poder - PODER_BASE)) // (100 * PODER_BASE)
+#   mana = idem com GANHO_MANA, no máximo MANA_MAXIMA
+# Com MAGIA_BASE e NIVEL_BASE (o padrão) os números são os do registro.
+# - tabela(magia, nivel): TabelaNivel calculada uma vez e guardada; o motor
+#   guarda a de cada lado e, a cada golpe, só indexa pelo feitiço
+# - tabelas_por_nivel(magia): uma tabela por nível, 1..NIVEL_MAXIMO
+# - poder_lote / tabelas_lote: o elenco inteiro de uma vez (NumPy), com
+#   uma linha por perfil (magia, nível) possível, calculadas de uma vez; o
+#   simulador vetorizado só indexa essas linhas
+# - Feiticeiro: magia, nível e experiência do modo progressão da interface
+#   (cada vitória ou derrota dá experiência; subir de nível dá magia)
+#
+# Execução:
+#   python progressao.py --magia 12
+#   python progressao.py --elenco 1000000
+
+import json
+import numbers
+import os
+import time
+from collections import namedtuple
+
+from feiticos import FEITICO_NULO, REGISTRO
+from funcoes_adicionais import poder_ataque
+
+MAGIA_BASE = 10
+NIVEL_BASE = 1
+MAGIA_MAXIMA = 30
+NIVEL_MAXIMO = 20
+PODER_BASE = poder_ataque(MAGIA_BASE, NIVEL_BASE)
+GANHO_DANO = 5  # % a mais de dano por PODER_BASE de poder acima da base
+GANHO_MANA = 2  # % a mais de custo, idem
+MANA_MAXIMA = 100  # a mana dos dois lados não regenera acima disto
+
+# Experiência: total para chegar ao nível n = EXPERIENCIA_NIVEL * n * (n - 1) / 2
+EXPERIENCIA_NIVEL = 100
+EXPERIENCIA_VITORIA = 100
+EXPERIENCIA_DERROTA = 30
+MAGIA_POR_NIVEL = 1
+
+ARQUIVO_FEITICEIRO = (os.environ.get("BATALHA_FEITICEIRO")
+                      or os.path.join(os.path.dirname(os.path.abspath(__file__)), "salvamentos", "feiticeiro.json"))
+VERSAO = 1
+
+# dano e mana: um valor por feitiço (ordem do registro) e, no fim, o do
+# FEITICO_NULO, para indexar com Feitico.indice (-1 = nulo) sem teste
+TabelaNivel = namedtuple("TabelaNivel", ("magia", "nivel", "poder", "dano", "mana"))
+
+
+# ---------- Tabelas ----------
+def _inteiro(x):
+    # int, numpy.int64 etc.; bool não (True seria magia 1)
+    return isinstance(x, numbers.Integral) and not isinstance(x, bool)
+
+
+def validar(magia, nivel):
+    if not (_inteiro(magia) and 1 <= magia <= MAGIA_MAXIMA):
+        raise ValueError(f"magia deve ser um inteiro de 1 a {MAGIA_MAXIMA}: {magia!r}")
+    if not (_inteiro(nivel) and 1 <= nivel <= NIVEL_MAXIMO):
+        raise ValueError(f"nível deve ser um inteiro de 1 a {NIVEL_MAXIMO}: {nivel!r}")
+
+
+def _escalar(base, poder, ganho):
+    return base * (100 * PODER_BASE + ganho * (poder - PODER_BASE)) // (100 * PODER_BASE)
+
+
+_TABELAS = {}  # (magia, nivel) -> TabelaNivel
+
+
+def tabela(magia=MAGIA_BASE, nivel=NIVEL_BASE):
+    chave = (magia, nivel)
+    t = _TABELAS.get(chave)
+    if t is None:
+        validar(magia, nivel)
+        magia, nivel = int(magia), int(nivel)  # numpy.int64 vira int: a tabela é só de ints
+        poder = poder_ataque(magia, nivel)
+        dano = tuple(_escalar(f.dano, poder, GANHO_DANO) for f in REGISTRO) + (FEITICO_NULO.dano,)
+        mana = tuple(min(MANA_MAXIMA, _escalar(f.mana, poder, GANHO_MANA)) for f in REGISTRO) + (FEITICO_NULO.mana,)
+        t = _TABELAS[chave] = TabelaNivel(magia, nivel, poder, dano, mana)
+    return t
+
+
+TABELA_BASE = tabela()
+
+
+def tabelas_por_nivel(magia=MAGIA_BASE):
+    return [tabela(magia, n) for n in range(1, NIVEL_MAXIMO + 1)]
+
+
+# ---------- Elencos (NumPy) ----------
+def poder_lote(magias, niveis):
+    """poder_ataque de um elenco inteiro: arrays de magia e nível -> int64."""
+    import numpy as np
+    magias = np.asarray(magias, dtype=np.int64)
+    niveis = np.asarray(niveis, dtype=np.int64)
+    if magias.size and (magias.min() < 1 or magias.max() > MAGIA_MAXIMA):
+        raise ValueError(f"magia deve ficar entre 1 e {MAGIA_MAXIMA}")
+    if niveis.size and (niveis.min() < 1 or niveis.max() > NIVEL_MAXIMO):
+        raise ValueError(f"nível deve ficar entre 1 e {NIVEL_MAXIMO}")
+    return poder_ataque(magias, niveis)
+
+
+def perfil_lote(magias, niveis):
+    # linha de cada feiticeiro nas tabelas de tabelas_lote
+    import numpy as np
+    magias, niveis = np.broadcast_arrays(np.asarray(magias, dtype=np.int64), np.asarray(niveis, dtype=np.int64))
+    poder_lote(magias, niveis)  # valida
+    return ((magias - 1) * NIVEL_MAXIMO + niveis - 1).astype(np.intp)
+
+
+def tabelas_lote(magias, niveis, dano_base=None, mana_base=None):
+    """
+    Tabelas de um elenco inteiro. Devolve (dano, mana, perfil): dano e mana
+    int32 (perfis, feitiços), uma linha por par (magia, nível) possível, e
+    perfil com a linha de cada feiticeiro. Bases padrão: as do registro
+    (mesmos números de tabela(), sem o FEITICO_NULO).
+    """
+    import numpy as np
+    if dano_base is None:
+        dano_base = [f.dano for f in REGISTRO]
+    if mana_base is None:
+        mana_base = [f.mana for f in REGISTRO]
+    perfil = perfil_lote(magias, niveis)
+    grade_magia, grade_nivel = np.divmod(np.arange(MAGIA_MAXIMA * NIVEL_MAXIMO), NIVEL_MAXIMO)
+    poder = poder_lote(grade_magia + 1, grade_nivel + 1)[:, None]
+    escala_dano = 100 * PODER_BASE + GANHO_DANO * (poder - PODER_BASE)
+    escala_mana = 100 * PODER_BASE + GANHO_MANA * (poder - PODER_BASE)
+    dano = np.asarray(dano_base, dtype=np.int64)[None, :] * escala_dano // (100 * PODER_BASE)
+    mana = np.minimum(MANA_MAXIMA, np.asarray(mana_base, dtype=np.int64)[None, :] * escala_mana // (100 * PODER_BASE))
+    return dano.astype(np.int32), mana.astype(np.int32), perfil
+
+
+# ---------- Feiticeiro ----------
+def experiencia_para(nivel):
+    # experiência total para chegar a `nivel`
+    return EXPERIENCIA_NIVEL * nivel * (nivel - 1) // 2
+
+
+class Feiticeiro:
+    """Magia, nível e experiência de um feiticeiro do modo progressão."""
+
+    def __init__(self, nome="Feiticeiro", magia=MAGIA_BASE, nivel=NIVEL_BASE, experiencia=0):
+        validar(magia, nivel)
+        self.nome = nome
+        self.magia = int(magia)
+        self.nivel = int(nivel)
+        self.experiencia = max(int(experiencia), experiencia_para(self.nivel))
+
+    @property
+    def par(self):
+        # (magia, nível), como o motor recebe
+        return (self.magia, self.nivel)
+
+    @property
+    def poder(self):
+        return poder_ataque(self.magia, self.nivel)
+
+    def tabela(self):
+        return tabela(self.magia, self.nivel)
+
+    def falta_para_subir(self):
+        if self.nivel >= NIVEL_MAXIMO:
+            return 0
+        return experiencia_para(self.nivel + 1) - self.experiencia
+
+    def ganhar_experiencia(self, pontos):
+        # devolve quantos níveis subiu
+        self.experiencia += pontos
+        subiu = 0
+        while self.nivel < NIVEL_MAXIMO and self.experiencia >= experiencia_para(self.nivel + 1):
+            self.nivel += 1
+            self.magia = min(MAGIA_MAXIMA, self.magia + MAGIA_POR_NIVEL)
+            subiu += 1
+        return subiu
+
+    def experiencia_da_partida(self, motor, lado="player"):
+        # partida terminada: vitória ou derrota de `lado`
+        if not motor.game_over:
+            return 0
+        return EXPERIENCIA_VITORIA if motor.vencedor == lado else EXPERIENCIA_DERROTA
+
+    def oponente(self):
+        # inimigo do modo progressão: mesmo nível, magia base
+        return (MAGIA_BASE, self.nivel)
+
+    # ---------- Arquivo ----------
+    def salvar(self, caminho=ARQUIVO_FEITICEIRO):
+        os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+        dados = {"versao": VERSAO, "nome": self.nome, "magia": self.magia, "nivel": self.nivel,
+                 "experiencia": self.experiencia}
+        tmp = caminho + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(dados, f, ensure_ascii=False)
+        os.replace(tmp, caminho)
+
+    @classmethod
+    def carregar(cls, caminho=ARQUIVO_FEITICEIRO):
+        # OSError: arquivo ausente; ValueError: formato ou números inválidos
+        with open(caminho, encoding="utf-8") as f:
+            dados = json.load(f)
+        if not isinstance(dados, dict) or dados.get("versao") != VERSAO:
+            raise ValueError(f"{caminho}: formato de feiticeiro não suportado")
+        experiencia = dados.get("experiencia", 0)
+        if not _inteiro(experiencia) or experiencia < 0:
+            raise ValueError(f"{caminho}: experiência inválida")
+        return cls(str(dados.get("nome", "Feiticeiro")), dados.get("magia"), dados.get("nivel"), experiencia)
+
+
+# ---------- Main ----------
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Tabelas de dano e mana por magia e nível.")
+    parser.add_argument("--magia", type=int, default=MAGIA_BASE)
+    parser.add_argument("--elenco", type=int, metavar="N", help="mede as tabelas de N feiticeiros sorteados (NumPy)")
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.elenco:
+        import numpy as np
+        rng = np.random.default_rng(args.semente)
+        magias = rng.integers(1, MAGIA_MAXIMA + 1, args.elenco)
+        niveis = rng.integers(1, NIVEL_MAXIMO + 1, args.elenco)
+        inicio = time.perf_counter()
+        dano, mana, perfil = tabelas_lote(magias, niveis)
+        duracao = time.perf_counter() - inicio
+        print(f"{args.elenco:,} feiticeiros ({len(dano)} perfis possíveis) em {1000 * duracao:.1f} ms "
+              f"({args.elenco / max(duracao, 1e-9):,.0f} feiticeiros/s)")
+        poder = poder_lote(magias, niveis)
+        print(f"Poder: médio {poder.mean():.1f}, máximo {poder.max()} | "
+              f"dano médio por feitiço: {', '.join(f'{f.id} {dano[perfil, f.indice].mean():.1f}' for f in REGISTRO)}")
+        return
+
+    try:
+        validar(args.magia, NIVEL_BASE)
+    except ValueError as e:
+        parser.error(str(e))
+    ids = REGISTRO.ids
+    print(f"Magia {args.magia} (base {MAGIA_BASE}, nível base {NIVEL_BASE}) — dano/mana por feitiço")
+    print(f"{'nível':>5} {'poder':>5} {'exp.':>6}  " + "  ".join(f"{t:>12}" for t in ids))
+    for t in tabelas_por_nivel(args.magia):
+        celulas = "  ".join(f"{t.dano[f.indice]:>6}/{t.mana[f.indice]:<5}" for f in REGISTRO)
+        print(f"{t.nivel:>5} {t.poder:>5} {experiencia_para(t.nivel):>6}  {celulas}")
+
+
+if __name__ == "__main__":
+    main()
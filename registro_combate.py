@@ -0,0 +1,108 @@
+# Batalha dos Feiticeiros — Registro de Combate
+# Modelo do log separado do widget:
+# - RegistroCombate guarda o histórico completo da sessão (com teto) e um
+#   buffer circular só com as linhas visíveis
+# - LogTk coalesce as linhas novas e escreve no tk.Text uma vez por quadro
+#   (um insert, um see), apagando do topo o que passou do limite: o widget
+#   nunca tem mais que `limite_linhas` linhas
+# - exportar() grava o histórico numa thread, sem travar a interface
+
+import threading
+from collections import deque
+from concurrent.futures import Future
+
+LIMITE_LINHAS = 200       # linhas no widget
+LIMITE_HISTORICO = 100000  # linhas guardadas para exportação
+INTERVALO_MS = 16          # ~1 quadro a 60 fps
+
+
+class RegistroCombate:
+    def __init__(self, limite_linhas=LIMITE_LINHAS, limite_historico=LIMITE_HISTORICO):
+        self.visiveis = deque(maxlen=limite_linhas)
+        self.historico = deque(maxlen=limite_historico)
+        self.total = 0  # linhas registradas desde o início (inclusive as descartadas)
+
+    @property
+    def limite_linhas(self):
+        return self.visiveis.maxlen
+
+    def adicionar(self, texto):
+        self.visiveis.append(texto)
+        self.historico.append(texto)
+        self.total += 1
+
+    def limpar(self):
+        # Nova partida: some da tela, mas continua no histórico da sessão
+        self.visiveis.clear()
+        if self.historico:
+            self.historico.append("-" * 40)
+
+    def exportar(self, caminho):
+        """
+        Grava o histórico em `caminho` numa thread e devolve um Future com o
+        número de linhas escritas. A cópia é feita antes, na thread de quem chama.
+        """
+        linhas = list(self.historico)
+        futuro = Future()
+
+        def gravar():
+            try:
+                with open(caminho, "w", encoding="utf-8") as f:
+                    f.writelines(l + "\n" for l in linhas)
+            except Exception as e:
+                futuro.set_exception(e)
+            else:
+                futuro.set_result(len(linhas))
+
+        threading.Thread(target=gravar, name="exportar-log", daemon=True).start()
+        return futuro
+
+
+class LogTk:
+    """Liga um RegistroCombate a um tk.Text com escrita em lote por quadro."""
+
+    def __init__(self, root, widget, registro=None, intervalo_ms=INTERVALO_MS):
+        self.root = root
+        self.widget = widget
+        self.registro = registro or RegistroCombate()
+        self.intervalo_ms = intervalo_ms
+        self._pendentes = []
+        self._after = None
+        self._linhas_widget = 0
+        self.descargas = 0  # contadores para perfilamento
+        self.linhas_escritas = 0
+
+    def adicionar(self, texto):
+        self.registro.adicionar(texto)
+        self._pendentes.append(texto)
+        if self._after is None:
+            self._after = self.root.after(self.intervalo_ms, self.descarregar)
+
+    def descarregar(self):
+        self._after = None
+        if not self._pendentes:
+            return
+        limite = self.registro.limite_linhas
+        # rajada maior que o limite: só as últimas chegam ao widget
+        novas = self._pendentes[-limite:]
+        self._pendentes.clear()
+        w = self.widget
+        w.insert("end", "".join(t + "\n" for t in novas))
+        # um texto pode ter várias linhas (ex.: "\n🎉 Você venceu")
+        self._linhas_widget += sum(t.count("\n") + 1 for t in novas)
+        excesso = self._linhas_widget - limite
+        if excesso > 0:
+            w.delete("1.0", f"{excesso + 1}.0")
+            self._linhas_widget = limite
+        w.see("end")
+        self.descargas += 1
+        self.linhas_escritas += len(novas)
+
+    def limpar(self):
+        if self._after is not None:
+            self.root.after_cancel(self._after)
+            self._after = None
+        self._pendentes.clear()
+        self.registro.limpar()
+        self.widget.delete("1.0", "end")
+        self._linhas_widget = 0
@@ -0,0 +1,223 @@
+# Batalha dos Feiticeiros — Replays
+# Uma partida é reproduzível a partir de (dificuldade, semente, feiticeiros,
+# ações): o
+# motor sorteia tudo com o próprio RNG e guarda cada ação em motor.acoes
+# (1 byte por ação; ver motor_batalha.codificar_acao). Jogadas do MCTS ou
+# de outra política externa ficam gravadas como a ação escolhida.
+#
+# Arquivo .bfr:
+#   cabeçalho  "BFRP" | versão u8 | impressão das regras (8 bytes)
+#              | semente u64 | magia e nível dos feiticeiros (jogador,
+#              inimigo) u8 x4 | tamanho do nome da dificuldade u8 | nome utf-8
+#   corpo      um byte por ação, só acrescentado (GravadorReplay escreve
+#              durante a partida; um arquivo cortado ainda é um replay válido)
+#
+# Reprodução sem interface a toda velocidade (reproduzir) ou na interface
+# com animações. Saltos para qualquer jogada partem do instantâneo mais
+# próximo (motor.clonar a cada INTERVALO_INSTANTANEO ações) em vez do início.
+#
+# Execução:
+#   python replay.py partida.bfr
+#   python replay.py partida.bfr --turno 12
+#   python replay.py --gerar partida.bfr --semente 42 --dificuldade Difícil
+
+import bisect
+import struct
+import time
+from array import array
+
+from feiticos import REGISTRO
+from motor_batalha import DIFICULDADES, MotorBatalha, decodificar_acao
+from progressao import MAGIA_BASE, NIVEL_BASE, validar
+
+MAGICO = b"BFRP"
+VERSAO = 3  # 3: feitiço recusado por falta de mana não é mais gravado
+_CABECALHO = struct.Struct("<4sB8sQBBBBB")
+INTERVALO_INSTANTANEO = 32  # ações entre instantâneos para os saltos
+
+
+def aplicar(motor, codigo):
+    # Executa uma ação gravada; devolve o retorno do motor
+    quem, acao = decodificar_acao(codigo)
+    if quem == "player":
+        return motor.executar(acao)
+    return motor.turno_inimigo(acao)
+
+
+class Replay:
+    def __init__(self, dificuldade, semente, acoes=b"", intervalo=INTERVALO_INSTANTANEO, feiticeiro_jogador=None,
+                 feiticeiro_inimigo=None):
+        if dificuldade not in DIFICULDADES:
+            raise ValueError(f"dificuldade desconhecida: {dificuldade}")
+        if not 0 <= semente < 2**64:
+            raise ValueError("a semente precisa caber em 64 bits sem sinal")
+        self.dificuldade = dificuldade
+        self.semente = semente
+        # (magia, nível) de cada lado; None = o de base (progressao.py)
+        self.feiticeiro_jogador = tuple(feiticeiro_jogador or (MAGIA_BASE, NIVEL_BASE))
+        self.feiticeiro_inimigo = tuple(feiticeiro_inimigo or (MAGIA_BASE, NIVEL_BASE))
+        validar(*self.feiticeiro_jogador)
+        validar(*self.feiticeiro_inimigo)
+        self.acoes = bytes(acoes)
+        self.intervalo = intervalo
+        self._instantaneos = None  # [motor após 0, intervalo, 2*intervalo, ... ações]
+        self._turnos = None  # array: motor.turnos antes de cada ação
+        self.turnos_total = None
+
+    @classmethod
+    def de_motor(cls, motor):
+        return cls(motor.dificuldade, motor.semente, motor.acoes, feiticeiro_jogador=motor.feiticeiro_jogador,
+                   feiticeiro_inimigo=motor.feiticeiro_inimigo)
+
+    def __len__(self):
+        return len(self.acoes)
+
+    def motor_inicial(self, eventos=False):
+        return MotorBatalha(self.dificuldade, self.semente, eventos=eventos,
+                            feiticeiro_jogador=self.feiticeiro_jogador, feiticeiro_inimigo=self.feiticeiro_inimigo)
+
+    def reproduzir(self, eventos=False):
+        """Joga todas as ações a partir do início e devolve o motor final."""
+        motor = self.motor_inicial(eventos)
+        for codigo in self.acoes:
+            aplicar(motor, codigo)
+        return motor
+
+    # ---------- Saltos ----------
+    def _indexar(self):
+        # Uma passada: instantâneos periódicos e o turno antes de cada ação
+        motor = self.motor_inicial()
+        instantaneos = [motor.clonar()]
+        turnos = array("H")
+        for k, codigo in enumerate(self.acoes, 1):
+            turnos.append(motor.turnos)
+            aplicar(motor, codigo)
+            if k % self.intervalo == 0:
+                instantaneos.append(motor.clonar())
+        self._instantaneos, self._turnos = instantaneos, turnos
+        self.turnos_total = motor.turnos
+
+    def posicionar(self, jogada, eventos=False):
+        """Motor logo após as `jogada` primeiras ações (0 = início)."""
+        if self._instantaneos is None:
+            self._indexar()
+        jogada = max(0, min(jogada, len(self.acoes)))
+        base = jogada // self.intervalo
+        motor = self._instantaneos[base].clonar()
+        for codigo in self.acoes[base * self.intervalo:jogada]:
+            aplicar(motor, codigo)
+        motor.registrar_eventos = eventos
+        return motor
+
+    def jogada_do_turno(self, turno):
+        # primeira ação feita no turno `turno` do jogador (turnos contam de 0)
+        if self._turnos is None:
+            self._indexar()
+        return bisect.bisect_left(self._turnos, turno)
+
+
+# ---------- Arquivo ----------
+def _cabecalho(replay):
+    nome = replay.dificuldade.encode("utf-8")
+    return _CABECALHO.pack(MAGICO, VERSAO, REGISTRO.impressao, replay.semente, *replay.feiticeiro_jogador,
+                           *replay.feiticeiro_inimigo, len(nome)) + nome
+
+
+def salvar(caminho, replay):
+    with open(caminho, "wb") as f:
+        f.write(_cabecalho(replay))
+        f.write(replay.acoes)
+
+
+def carregar(caminho):
+    with open(caminho, "rb") as f:
+        dados = f.read()
+    if len(dados) < _CABECALHO.size or dados[:4] != MAGICO:
+        raise ValueError(f"{caminho}: não é um replay")
+    _, versao, impressao, semente, magia_j, nivel_j, magia_i, nivel_i, n = _CABECALHO.unpack_from(dados)
+    if versao != VERSAO:
+        raise ValueError(f"{caminho}: versão {versao} não suportada (esperada {VERSAO})")
+    if impressao != REGISTRO.impressao:
+        raise ValueError(f"{caminho}: gravado com outras regras de feitiços")
+    inicio = _CABECALHO.size + n
+    dificuldade = dados[_CABECALHO.size:inicio].decode("utf-8")
+    return Replay(dificuldade, semente, dados[inicio:], feiticeiro_jogador=(magia_j, nivel_j),
+                  feiticeiro_inimigo=(magia_i, nivel_i))
+
+
+class GravadorReplay:
+    """
+    Escreve a partida de `motor` em `caminho` enquanto ela acontece: o
+    cabeçalho na criação e, a cada acompanhar(), só as ações novas.
+    """
+
+    def __init__(self, caminho, motor):
+        self.motor = motor
+        self._acoes = motor.acoes
+        self._escritas = 0
+        self._arquivo = open(caminho, "wb")
+        self._arquivo.write(_cabecalho(Replay.de_motor(motor)))
+
+    def acompanhar(self):
+        if self.motor.acoes is not self._acoes:
+            raise RuntimeError("o motor começou outra partida")
+        novas = self._acoes[self._escritas:]
+        if novas:
+            self._arquivo.write(novas)
+            self._arquivo.flush()
+            self._escritas += len(novas)
+
+    def fechar(self):
+        if not self._arquivo.closed:
+            self.acompanhar()
+            self._arquivo.close()
+
+
+# ---------- Main ----------
+def main(argv=None):
+    import argparse
+    import random
+
+    from motor_batalha import DIFICULDADES_IA_EMBUTIDA, politica_aleatoria
+
+    parser = argparse.ArgumentParser(description="Reproduz (ou grava) um replay da Batalha dos Feiticeiros.")
+    parser.add_argument("caminho")
+    parser.add_argument("--turno", type=int, default=None, help="mostra o estado no início deste turno")
+    parser.add_argument("--gerar", action="store_true", help="joga uma partida aleatória e grava em caminho")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--dificuldade", default="Normal", choices=DIFICULDADES_IA_EMBUTIDA)
+    args = parser.parse_args(argv)
+
+    if args.gerar:
+        motor = MotorBatalha(args.dificuldade, args.semente, eventos=False)
+        gravador = GravadorReplay(args.caminho, motor)
+        rng = random.Random(args.semente ^ 0x5EED)
+        while not motor.game_over and motor.turnos < 500:
+            if not motor.executar(politica_aleatoria(motor, rng)):
+                motor.defender()
+            if motor.fase == "inimigo":
+                motor.turno_inimigo()
+            gravador.acompanhar()
+        gravador.fechar()
+        print(f"Gravado: {args.caminho} ({len(motor.acoes)} ações, vencedor {motor.vencedor})")
+        return
+
+    try:
+        replay = carregar(args.caminho)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    inicio = time.perf_counter()
+    motor = replay.reproduzir()
+    duracao = max(time.perf_counter() - inicio, 1e-9)
+    print(f"Dificuldade: {replay.dificuldade} | semente {replay.semente} | {len(replay)} ações "
+          f"({len(replay) / duracao:,.0f} ações/s)")
+    print(f"Vencedor: {motor.vencedor} | turnos {motor.turnos} | vida {motor.vida_jogador} x {motor.vida_inimigo}")
+    if args.turno is not None:
+        jogada = replay.jogada_do_turno(args.turno)
+        m = replay.posicionar(jogada)
+        print(f"Turno {args.turno} (ação {jogada}): vida {m.vida_jogador} x {m.vida_inimigo} | "
+              f"mana {m.mana_jogador} x {m.mana_inimigo} | poções {m.pocoes} | fase {m.fase}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+# Batalha dos Feiticeiros — Salvamento
+# Estado completo da batalha num registro binário de tamanho fixo
+# (struct + arrays, sem pickle/JSON), versionado e ligado às regras de
+# feitiços em uso (impressão do registro):
+#   "BFSV" | versão | impressão | dificuldade | semente | vidas/manas |
+#   poções | flags | fase | vencedor | turnos | acertos | nº de ações |
+#   status dos dois lados (int16 por efeito) | lançamentos e acertos por
+#   feitiço e lado (uint32) | estado do Mersenne Twister
+#   (array('I') com 624 palavras + posição) | gauss_next | magia e nível
+#   dos feiticeiros dos dois lados (progressao.py)
+# Depois do registro vem o log de ações da partida (motor.acoes), para que
+# uma partida carregada ainda possa virar replay.
+#
+# AutoSalvamento: a interface serializa no fim de cada turno (microssegundos)
+# e uma thread grava em arquivo temporário + os.replace; se chegar um estado
+# novo antes da gravação anterior, só o mais recente é escrito.
+#
+# Execução (mostra um arquivo salvo):
+#   python salvamento.py salvamentos/autosave.bfs
+
+import math
+import os
+import queue
+import struct
+import sys
+import threading
+from array import array
+
+from feiticos import EFEITOS, REGISTRO
+from motor_batalha import DIFICULDADES, N_FEITICOS, MotorBatalha
+
+MAGICO = b"BFSV"
+VERSAO = 3
+PASTA_SALVAMENTOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "salvamentos")
+AUTOSAVE = os.environ.get("BATALHA_AUTOSAVE") or os.path.join(PASTA_SALVAMENTOS, "autosave.bfs")
+
+_DIFICULDADES = tuple(DIFICULDADES)
+_FASES = ("jogador", "inimigo", "fim")
+_VENCEDORES = (None, "player", "enemy")
+_PALAVRAS_MT = 625  # 624 palavras de estado + posição
+_ESTADO = struct.Struct("<4sB8sBQhhhhBBBBHHHIdBBBB")
+_STATUS = struct.Struct(f"<{2 * len(EFEITOS)}h")
+_CONTADORES = struct.Struct(f"<{4 * N_FEITICOS}I")
+_INICIO_MT = _ESTADO.size + _STATUS.size + _CONTADORES.size
+TAMANHO = _INICIO_MT + 4 * _PALAVRAS_MT  # bytes, sem o log de ações
+
+
+# ---------- Formato ----------
+def serializar(motor):
+    _, mt, gauss = motor.rng.getstate()
+    palavras = array("I", mt)
+    if sys.byteorder == "big":
+        palavras.byteswap()
+    flags = motor.defesa_ativa | motor.defesa_inimigo << 1 | motor.game_over << 2
+    return b"".join((
+        _ESTADO.pack(MAGICO, VERSAO, REGISTRO.impressao, _DIFICULDADES.index(motor.dificuldade),
+                     motor.semente, motor.vida_jogador, motor.vida_inimigo, motor.mana_jogador,
+                     motor.mana_inimigo, motor.pocoes, flags, _FASES.index(motor.fase),
+                     _VENCEDORES.index(motor.vencedor), motor.turnos, motor.acertos_player,
+                     motor.acertos_enemy, len(motor.acoes), math.nan if gauss is None else gauss,
+                     *motor.feiticeiro_jogador, *motor.feiticeiro_inimigo),
+        _STATUS.pack(*motor.status_player, *motor.status_enemy),
+        _CONTADORES.pack(*motor.lancamentos, *motor.acertos_feiticos),
+        palavras.tobytes(),
+        motor.acoes,
+    ))
+
+
+def restaurar(dados, eventos=True):
+    """MotorBatalha no estado gravado em `dados` (bytes de serializar)."""
+    if len(dados) < TAMANHO or dados[:4] != MAGICO:
+        raise ValueError("não é um salvamento da Batalha dos Feiticeiros")
+    (_, versao, impressao, dificuldade, semente, vida_j, vida_i, mana_j, mana_i, pocoes, flags,
+     fase, vencedor, turnos, acertos_j, acertos_i, n_acoes, gauss,
+     magia_j, nivel_j, magia_i, nivel_i) = _ESTADO.unpack_from(dados)
+    if versao != VERSAO:
+        raise ValueError(f"versão {versao} não suportada (esperada {VERSAO})")
+    if impressao != REGISTRO.impressao:
+        raise ValueError("salvo com outras regras de feitiços")
+    if len(dados) != TAMANHO + n_acoes:
+        raise ValueError("salvamento truncado")
+    if dificuldade >= len(_DIFICULDADES) or fase >= len(_FASES) or vencedor >= len(_VENCEDORES):
+        raise ValueError("salvamento corrompido (dificuldade, fase ou vencedor fora da faixa)")
+
+    motor = MotorBatalha(_DIFICULDADES[dificuldade], semente, eventos=eventos,
+                         feiticeiro_jogador=(magia_j, nivel_j), feiticeiro_inimigo=(magia_i, nivel_i))
+    motor.vida_jogador, motor.vida_inimigo = vida_j, vida_i
+    motor.mana_jogador, motor.mana_inimigo = mana_j, mana_i
+    motor.pocoes = pocoes
+    motor.defesa_ativa = bool(flags & 1)
+    motor.defesa_inimigo = bool(flags & 2)
+    motor.game_over = bool(flags & 4)
+    motor.fase = _FASES[fase]
+    motor.vencedor = _VENCEDORES[vencedor]
+    motor.turnos, motor.acertos_player, motor.acertos_enemy = turnos, acertos_j, acertos_i
+    status = _STATUS.unpack_from(dados, _ESTADO.size)
+    n = len(EFEITOS)
+    motor.status_player = array("h", status[:n])
+    motor.status_enemy = array("h", status[n:])
+    contadores = _CONTADORES.unpack_from(dados, _ESTADO.size + _STATUS.size)
+    motor.lancamentos = array("I", contadores[:2 * N_FEITICOS])
+    motor.acertos_feiticos = array("I", contadores[2 * N_FEITICOS:])
+    palavras = array("I")
+    palavras.frombytes(dados[_INICIO_MT:TAMANHO])
+    if sys.byteorder == "big":
+        palavras.byteswap()
+    motor.rng.setstate((3, tuple(palavras), None if math.isnan(gauss) else gauss))
+    motor.acoes = bytearray(dados[TAMANHO:])
+    return motor
+
+
+# ---------- Arquivo ----------
+def _gravar_atomico(caminho, dados):
+    # Quem lê `caminho` vê o salvamento anterior inteiro ou o novo inteiro
+    os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+    tmp = caminho + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(dados)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, caminho)
+
+
+def salvar(caminho, motor):
+    _gravar_atomico(caminho, serializar(motor))
+
+
+def carregar(caminho, eventos=True):
+    with open(caminho, "rb") as f:
+        dados = f.read()
+    try:
+        return restaurar(dados, eventos)
+    except ValueError as e:
+        raise ValueError(f"{caminho}: {e}") from None
+
+
+class AutoSalvamento:
+    def __init__(self, caminho=AUTOSAVE):
+        self.caminho = caminho
+        self.gravacoes = 0
+        self.substituidos = 0  # estados que um mais novo tornou desnecessários
+        self.erro = None  # última falha de gravação (a interface não para por isso)
+        self._fila = queue.Queue(maxsize=1)
+        self._thread = threading.Thread(target=self._trabalhar, name="autosave", daemon=True)
+        self._thread.start()
+
+    def agendar(self, motor):
+        # Serializa já (na thread de quem chama) e entrega os bytes à thread
+        dados = serializar(motor)
+        while True:
+            try:
+                self._fila.put_nowait(dados)
+                return
+            except queue.Full:
+                try:
+                    self._fila.get_nowait()
+                    self.substituidos += 1
+                except queue.Empty:
+                    pass
+
+    def _trabalhar(self):
+        while True:
+            dados = self._fila.get()
+            if dados is None:
+                return
+            try:
+                _gravar_atomico(self.caminho, dados)
+                self.gravacoes += 1
+            except OSError as e:
+                self.erro = e
+
+    def encerrar(self, espera=2.0):
+        # Grava o que estiver pendente e para a thread
+        try:
+            self._fila.put(None, timeout=espera)
+        except queue.Full:
+            return
+        self._thread.join(espera)
+
+
+# ---------- Main ----------
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Mostra o conteúdo de um salvamento.")
+    parser.add_argument("caminho", nargs="?", default=AUTOSAVE)
+    args = parser.parse_args(argv)
+    try:
+        m = carregar(args.caminho, eventos=False)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    print(f"{args.caminho}: {TAMANHO} bytes de estado + {len(m.acoes)} ações")
+    print(f"Dificuldade {m.dificuldade} | semente {m.semente} | turno {m.turnos} | fase {m.fase}"
+          + (f" | vencedor {m.vencedor}" if m.game_over else ""))
+    print(f"Vida {m.vida_jogador} x {m.vida_inimigo} | mana {m.mana_jogador} x {m.mana_inimigo} | "
+          f"poções {m.pocoes} | defesa {m.defesa_ativa} x {m.defesa_inimigo}")
+    (mj, nj), (mi, ni) = m.feiticeiro_jogador, m.feiticeiro_inimigo
+    print(f"Feiticeiros: magia {mj} nível {nj} x magia {mi} nível {ni}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+# Batalha dos Feiticeiros — Servidor de Partidas
+# Muitas partidas sem interface num só processo (asyncio), com as regras do
+# jogo (MotorBatalha): jogador contra a IA embutida ou jogador contra jogador
+# (o segundo a chegar controla o lado do inimigo).
+#
+# Protocolo: uma mensagem JSON por linha (UTF-8), em TCP ou socket Unix.
+#   cliente -> servidor
+#     {"op": "entrar", "modo": "ia", "dificuldade": "Normal", "semente": 42}
+#     {"op": "entrar", "modo": "pvp", "dificuldade": "Normal"}
+#     {"op": "acao", "acao": "fogo"}        feitiço, "defender" ou "pocao"
+#     {"op": "metricas"}
+#     {"op": "sair"}
+#   servidor -> cliente
+#     {"tipo": "aguardando"}                pvp, até chegar um adversário
+#     {"tipo": "inicio", "partida": 7, "lado": "player", "dificuldade": ..., "estado": {...}}
+#     {"tipo": "jogada", "quem": "player", "eventos": [[...], ...], "estado": {...}}
+#     {"tipo": "fim", "partida": 7, "vencedor": "player" | "enemy" | null, "motivo": ...}
+#     {"tipo": "metricas", ...}  {"tipo": "erro", "mensagem": ...}
+# "eventos" são os do motor (os mesmos que a interface anima) e "estado" só
+# o que a interface mostra: o RNG fica no servidor.
+#
+# Métricas: conexões, partidas ativas e terminadas, partidas/s (últimos
+# JANELA_S segundos e média), ações/s e latência de cada ação (mensagem lida
+# -> respostas escritas) em p50/p95/p99, no total e por partida.
+#
+# Execução:
+#   python servidor_partidas.py --porta 8765
+#   python servidor_partidas.py --unix /tmp/batalha.sock --estatisticas --relatorio 5
+#   python carga_partidas.py --partidas 20000 --conexoes 1000     (gerador de carga)
+
+import asyncio
+import itertools
+import json
+import time
+from collections import deque
+
+from instrumentacao import Serie
+from motor_batalha import ACOES_INIMIGO, ACOES_JOGADOR, DIFICULDADES_IA_EMBUTIDA, MotorBatalha
+
+HOST = "127.0.0.1"
+PORTA = 8765
+LIMITE_TURNOS = 500  # partida sem vencedor até aqui termina empatada
+TAMANHO_LINHA = 64 * 1024  # maior mensagem aceita
+JANELA_S = 10  # segundos da taxa de partidas/s "recente"
+
+CAMPOS_ESTADO = ("vida_jogador", "vida_inimigo", "mana_jogador", "mana_inimigo", "pocoes",
+                 "defesa_ativa", "defesa_inimigo", "fase", "turnos", "acertos_player",
+                 "acertos_enemy", "game_over", "vencedor")
+VEZ = {"player": "jogador", "enemy": "inimigo"}  # lado -> fase do motor em que ele age
+_ACOES = {"player": frozenset(ACOES_JOGADOR), "enemy": frozenset(ACOES_INIMIGO)}
+
+
+def estado(motor):
+    e = {c: getattr(motor, c) for c in CAMPOS_ESTADO}
+    e["status_player"] = motor.status_player.tolist()
+    e["status_enemy"] = motor.status_enemy.tolist()
+    return e
+
+
+_codificar = json.JSONEncoder(separators=(",", ":")).encode  # saída ASCII: o caminho rápido do json
+
+
+def linha(msg):
+    return (_codificar(msg) + "\n").encode("ascii")
+
+
+def _erro(mensagem):
+    return {"tipo": "erro", "mensagem": mensagem}
+
+
+class Partida:
+    __slots__ = ("id", "motor", "modo", "jogadores", "acoes", "latencia_total", "latencia_max")
+
+    def __init__(self, id, motor, modo):
+        self.id = id
+        self.motor = motor
+        self.modo = modo
+        self.jogadores = {}  # lado -> Conexao
+        self.acoes = 0
+        self.latencia_total = 0.0
+        self.latencia_max = 0.0
+
+
+class Conexao:
+    __slots__ = ("writer", "partida", "lado")
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.partida = None
+        self.lado = None
+
+    def enviar(self, msg):
+        self.writer.write(linha(msg))
+
+
+class ServidorPartidas:
+    def __init__(self, estatisticas=None, limite_turnos=LIMITE_TURNOS):
+        self.estatisticas = estatisticas  # estatisticas.Estatisticas, opcional
+        self.limite_turnos = limite_turnos
+        self.partidas = {}  # id -> Partida em andamento
+        self.espera = {}  # dificuldade -> Conexao aguardando adversário (pvp)
+        self.conexoes = 0
+        self.terminadas = 0
+        self.acoes = 0
+        self.latencia = Serie()
+        self.inicio = time.perf_counter()
+        self._ids = itertools.count(1)
+        self._fins = deque(maxlen=JANELA_S + 1)  # [segundo, partidas terminadas nele]
+
+    # ---------- Conexões ----------
+    async def atender(self, reader, writer):
+        con = Conexao(writer)
+        self.conexoes += 1
+        try:
+            while True:
+                try:
+                    dados = await reader.readline()
+                except (ConnectionError, ValueError):  # ValueError: linha maior que o limite
+                    break
+                if not dados:
+                    break
+                recebida = time.perf_counter()
+                try:
+                    msg = json.loads(dados)
+                except ValueError:
+                    con.enviar(_erro("JSON inválido"))
+                    continue
+                if not isinstance(msg, dict):
+                    con.enviar(_erro("a mensagem deve ser um objeto JSON"))
+                    continue
+                if msg.get("op") == "sair":
+                    break
+                try:
+                    self.tratar(con, msg, recebida)
+                except Exception as e:  # mensagem que escapou da validação: erro só para este cliente
+                    con.enviar(_erro(f"mensagem não processada: {type(e).__name__}"))
+                try:
+                    await writer.drain()
+                except ConnectionError:
+                    break
+        finally:
+            self.conexoes -= 1
+            self._desconectar(con)
+            writer.close()
+
+    def tratar(self, con, msg, recebida):
+        op = msg.get("op")
+        if op == "acao":
+            self._acao(con, msg.get("acao"), recebida)
+        elif op == "entrar":
+            self._entrar(con, msg)
+        elif op == "metricas":
+            con.enviar(self.metricas(con.partida))
+        else:
+            con.enviar(_erro(f"operação desconhecida: {op!r}"))
+
+    def _desconectar(self, con):
+        for dificuldade, esperando in list(self.espera.items()):
+            if esperando is con:
+                del self.espera[dificuldade]
+        p = con.partida
+        if p is not None:
+            del p.jogadores[con.lado]
+            con.partida = None
+            if p.id in self.partidas:
+                self._terminar(p, "abandono")
+
+    # ---------- Partidas ----------
+    def _entrar(self, con, msg):
+        modo = msg.get("modo", "ia")
+        dificuldade = msg.get("dificuldade", "Normal")
+        semente = msg.get("semente")
+        if not isinstance(modo, str) or modo not in ("ia", "pvp"):
+            con.enviar(_erro(f"modo desconhecido: {modo!r}"))
+            return
+        if not isinstance(dificuldade, str) or dificuldade not in DIFICULDADES_IA_EMBUTIDA:
+            con.enviar(_erro(f"dificuldade indisponível no servidor: {dificuldade!r}"))
+            return
+        if semente is not None and (isinstance(semente, bool) or not (isinstance(semente, int) and 0 <= semente < 2**64)):
+            con.enviar(_erro("a semente precisa ser um inteiro de 64 bits sem sinal"))
+            return
+        self._desconectar(con)  # quem entra de novo abandona a partida (ou a fila) anterior
+
+        if modo == "ia":
+            self._comecar(MotorBatalha(dificuldade, semente), modo, {"player": con})
+            return
+        outro = self.espera.pop(dificuldade, None)
+        if outro is None:
+            self.espera[dificuldade] = con
+            con.enviar({"tipo": "aguardando"})
+            return
+        # quem esperava joga primeiro
+        self._comecar(MotorBatalha(dificuldade, semente), modo, {"player": outro, "enemy": con})
+
+    def _comecar(self, motor, modo, jogadores):
+        p = Partida(next(self._ids), motor, modo)
+        self.partidas[p.id] = p
+        motor.drenar_eventos()
+        e = estado(motor)
+        for lado, con in jogadores.items():
+            p.jogadores[lado] = con
+            con.partida, con.lado = p, lado
+            con.enviar({"tipo": "inicio", "partida": p.id, "modo": modo, "lado": lado,
+                        "dificuldade": motor.dificuldade, "estado": e})
+
+    def _acao(self, con, acao, recebida):
+        p = con.partida
+        if p is None:
+            con.enviar(_erro("entre numa partida antes de agir"))
+            return
+        m = p.motor
+        if m.fase != VEZ[con.lado]:
+            con.enviar(_erro("não é a sua vez"))
+            return
+        if not isinstance(acao, str) or acao not in _ACOES[con.lado]:
+            con.enviar(_erro(f"ação inválida: {acao!r}"))
+            return
+        if con.lado == "player":
+            m.executar(acao)
+        else:
+            m.turno_inimigo(acao)
+        self._publicar(p, con.lado)
+        if p.modo == "ia" and m.fase == "inimigo":
+            m.turno_inimigo()
+            self._publicar(p, "enemy")
+        if m.game_over or m.turnos >= self.limite_turnos:
+            self._terminar(p, "fim" if m.game_over else "limite_turnos")
+
+        duracao = time.perf_counter() - recebida
+        self.acoes += 1
+        self.latencia.adicionar(duracao)
+        p.acoes += 1
+        p.latencia_total += duracao
+        if duracao > p.latencia_max:
+            p.latencia_max = duracao
+
+    def _publicar(self, p, quem):
+        # Serializa uma vez e manda a mesma linha a todos os jogadores da partida
+        dados = linha({"tipo": "jogada", "quem": quem, "eventos": p.motor.drenar_eventos(),
+                       "estado": estado(p.motor)})
+        for con in p.jogadores.values():
+            con.writer.write(dados)
+
+    def _terminar(self, p, motivo):
+        del self.partidas[p.id]
+        m = p.motor
+        self.terminadas += 1
+        segundo = int(time.perf_counter())
+        if self._fins and self._fins[-1][0] == segundo:
+            self._fins[-1][1] += 1
+        else:
+            self._fins.append([segundo, 1])
+        if self.estatisticas is not None and m.game_over:
+            self.estatisticas.registrar(m, "servidor")
+        msg = {"tipo": "fim", "partida": p.id, "vencedor": m.vencedor, "turnos": m.turnos, "motivo": motivo}
+        for con in p.jogadores.values():
+            con.enviar(msg)
+            con.partida = None
+
+    # ---------- Métricas ----------
+    def metricas(self, partida=None):
+        agora = time.perf_counter()
+        recentes = sum(n for s, n in self._fins if s >= int(agora) - JANELA_S)
+        decorrido = max(agora - self.inicio, 1e-9)
+        p50, p95, p99 = self.latencia.percentis(50, 95, 99)
+        r = {
+            "tipo": "metricas",
+            "conexoes": self.conexoes,
+            "partidas_ativas": len(self.partidas),
+            "aguardando": len(self.espera),
+            "partidas_terminadas": self.terminadas,
+            "partidas_por_s": recentes / min(JANELA_S, decorrido),
+            "partidas_por_s_media": self.terminadas / decorrido,
+            "acoes": self.acoes,
+            "acoes_por_s_media": self.acoes / decorrido,
+            "latencia_ms": {"p50": 1000 * p50, "p95": 1000 * p95, "p99": 1000 * p99},
+        }
+        if partida is not None:
+            r["partida"] = {"id": partida.id, "acoes": partida.acoes,
+                            "latencia_media_ms": 1000 * partida.latencia_total / max(1, partida.acoes),
+                            "latencia_max_ms": 1000 * partida.latencia_max}
+        return r
+
+
+# ---------- Execução ----------
+async def servir(servidor, host=HOST, porta=PORTA, unix=None, relatorio=0, pronto=None):
+    # pronto: asyncio.Event sinalizado quando o socket já aceita conexões
+    if unix:
+        srv = await asyncio.start_unix_server(servidor.atender, unix, limit=TAMANHO_LINHA, backlog=1024)
+    else:
+        srv = await asyncio.start_server(servidor.atender, host, porta, limit=TAMANHO_LINHA, backlog=1024)
+    if pronto is not None:
+        pronto.set()
+    tarefa = asyncio.create_task(_relatar(servidor, relatorio)) if relatorio else None
+    try:
+        async with srv:
+            await srv.serve_forever()
+    finally:
+        if tarefa is not None:
+            tarefa.cancel()
+
+
+async def _relatar(servidor, intervalo):
+    while True:
+        await asyncio.sleep(intervalo)
+        r = servidor.metricas()
+        lat = r["latencia_ms"]
+        print(f"conexões {r['conexoes']:>6} | ativas {r['partidas_ativas']:>6} | terminadas "
+              f"{r['partidas_terminadas']:>9,} | {r['partidas_por_s']:>8,.0f} partidas/s | latência p50 "
+              f"{lat['p50']:.3f} p95 {lat['p95']:.3f} p99 {lat['p99']:.3f} ms", flush=True)
+
+
+# ---------- Main ----------
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Servidor de partidas da Batalha dos Feiticeiros (JSON por linha).")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--porta", type=int, default=PORTA)
+    parser.add_argument("--unix", metavar="CAMINHO", help="socket Unix em vez de TCP")
+    parser.add_argument("--limite-turnos", type=int, default=LIMITE_TURNOS)
+    parser.add_argument("--relatorio", type=float, default=0, metavar="S",
+                        help="imprime as métricas a cada S segundos")
+    parser.add_argument("--estatisticas", nargs="?", const="", default=None, metavar="BANCO",
+                        help="registra as partidas terminadas na base de estatísticas (estatisticas.py)")
+    args = parser.parse_args(argv)
+
+    est = None
+    if args.estatisticas is not None:
+        from estatisticas import BANCO, Estatisticas
+        est = Estatisticas(args.estatisticas or BANCO)
+    servidor = ServidorPartidas(est, args.limite_turnos)
+    print(f"Servindo em {args.unix or f'{args.host}:{args.porta}'}", flush=True)
+    try:
+        asyncio.run(servir(servidor, args.host, args.porta, args.unix, args.relatorio))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if est is not None:
+            est.fechar()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,446 @@
+# Batalha dos Feiticeiros — Solucionador de Jogo Ótimo
+# Calcula, para cada estado no início do turno do jogador, a probabilidade
+# de vitória sob jogo ótimo contra a IA embutida do inimigo e a melhor
+# ação, por programação dinâmica (iteração de valor) sobre uma tabela
+# densa indexada por array:
+#   V[s] = max_a  E[ W[s'] ]      (início do turno do jogador)
+#   W[t] = E[ V[s''] ]            (início do turno do inimigo, IA embutida)
+#
+# Vida e mana exatas (1 em 1) dariam ~10^11 estados, então a grade usa
+# passos configuráveis (--passo-vida / --passo-mana, 1 = exato). Valores que
+# caem entre dois pontos da grade são divididos entre os vizinhos com
+# probabilidade proporcional (arredondamento estocástico), o que preserva
+# a vida/mana esperada. Queimadura acumulada é limitada a --queimadura-max.
+# O modelo cobre um efeito de dano por turno ("queimadura") e efeitos que
+# fazem perder a vez por 1 turno; com outros efeitos em uso nos feitiços
+# (cura, escudo, status em si mesmo) o solucionador recusa o registro.
+#
+# A tabela gerada fica em disco e é consultada via mmap (sem NumPy),
+# então a interface mostra a dica de melhor jogada em O(1).
+#
+# Requer (apenas para gerar): numpy
+#
+# Execução:
+#   python solucionador.py --dificuldade Normal
+#   python solucionador.py --dificuldade Normal --avaliar 20000
+
+import json
+import math
+import mmap
+import os
+import struct
+import time
+import unicodedata
+
+from motor_batalha import DIFICULDADES, DIFICULDADES_IA_EMBUTIDA, EFEITOS, REGISTRO
+
+VERSAO = 1
+MAGICO = b"BFSOL\x00"
+PASTA_TABELAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tabelas")
+
+# Ações na tabela (-1 = sem escolha: impedido ou derrotado no início do turno)
+ACOES = REGISTRO.ids + ("defender", "pocao")
+# posições no array de status do motor
+_QUEIMADURA = EFEITOS.indice.get("queimadura", -1)
+_IMPEDEM = tuple(e.indice for e in EFEITOS if e.pula_turno)
+SEM_ACAO = -1
+
+VIDA_MAX = 120
+MANA_MAX = 110
+
+
+def caminho_tabela(dificuldade, pasta=PASTA_TABELAS):
+    nome = unicodedata.normalize("NFKD", dificuldade).encode("ascii", "ignore").decode().lower()
+    return os.path.join(pasta, f"solucao_{nome}.bin")
+
+
+# ---------- Grade ----------
+class Grade:
+    """
+    Eixos (mesma forma para V e W):
+      vida_jogador, vida_inimigo, mana_jogador, mana_inimigo,
+      pocoes, defesa_jogador, defesa_inimigo, queimadura_jogador,
+      queimadura_inimigo, impedido
+    `impedido` é do jogador em V (congelado/atordoado pelo inimigo) e do
+    inimigo em W: o outro lado sempre já consumiu o seu no próprio turno.
+    """
+
+    EIXOS = ("vida_jogador", "vida_inimigo", "mana_jogador", "mana_inimigo", "pocoes",
+             "defesa_jogador", "defesa_inimigo", "queimadura_jogador", "queimadura_inimigo", "impedido")
+
+    def __init__(self, passo_vida=20, passo_mana=20, queimadura_max=2):
+        self.passo_vida = passo_vida
+        self.passo_mana = passo_mana
+        self.queimadura_max = queimadura_max
+        nv = -(-VIDA_MAX // passo_vida) + 1
+        nm = -(-MANA_MAX // passo_mana) + 1
+        nq = queimadura_max + 1
+        self.forma = (nv, nv, nm, nm, 4, 2, 2, nq, nq, 2)
+        self.tamanho = math.prod(self.forma)
+        passos = []
+        acc = 1
+        for n in reversed(self.forma):
+            passos.append(acc)
+            acc *= n
+        self.passos = tuple(reversed(passos))
+
+    def meta(self):
+        return {"passo_vida": self.passo_vida, "passo_mana": self.passo_mana,
+                "queimadura_max": self.queimadura_max, "forma": list(self.forma)}
+
+    def indice(self, vida_j, vida_i, mana_j, mana_i, pocoes, defesa_j, defesa_i, queima_j, queima_i, impedido):
+        # Estado do motor -> índice plano (ponto mais próximo da grade)
+        def vida(v):
+            return max(1, min(self.forma[0] - 1, round(v / self.passo_vida)))
+
+        def mana(m):
+            return max(0, min(self.forma[2] - 1, round(m / self.passo_mana)))
+
+        q = self.queimadura_max
+        comps = (vida(vida_j), vida(vida_i), mana(mana_j), mana(mana_i), min(3, pocoes),
+                 int(bool(defesa_j)), int(bool(defesa_i)), min(q, queima_j), min(q, queima_i), int(bool(impedido)))
+        return sum(c * p for c, p in zip(comps, self.passos))
+
+
+# ---------- Iteração de valor (NumPy) ----------
+def verificar_modelo(registro):
+    """
+    Confere se os efeitos usados pelos feitiços cabem na grade (eixo de
+    queimadura + eixo "impedido") e devolve o dano por turno da queimadura.
+    """
+    ef = registro.efeitos
+    for d in registro:
+        if not d.status:
+            continue
+        e = ef.por_indice[d.efeito]
+        if d.status_alvo != "oponente" or e.cura_por_turno or e.reducao_dano:
+            raise ValueError(f"o solucionador não modela o efeito '{e.id}' de '{d.id}'")
+        if e.id == "queimadura":
+            continue
+        if not e.pula_turno or e.dano_por_turno or d.status_turnos != 1:
+            raise ValueError(f"o solucionador só modela queimadura e perda de vez por 1 turno ('{d.id}')")
+    return ef.por_indice[ef.indice["queimadura"]].dano_por_turno if "queimadura" in ef.indice else 0
+
+
+class Solucionador:
+    def __init__(self, dificuldade="Normal", grade=None, bloco=1 << 20):
+        import numpy as np
+        self.np = np
+        self.dificuldade = dificuldade
+        self.acc_mod = DIFICULDADES[dificuldade]["enemy_acc_mod"]
+        self.grade = grade or Grade()
+        self.bloco = bloco
+        f = REGISTRO.por_indice
+        self.dano = [d.dano for d in f]
+        self.chance = [d.chance for d in f]
+        self.custo = [d.mana for d in f]
+        self.status_chance = [d.status_chance for d in f]
+        self.queima = [d.status == "queimadura" for d in f]
+        self.turnos_queima = [d.status_turnos for d in f]
+        self.dano_queima = verificar_modelo(REGISTRO)
+
+    # ----- acesso à tabela com arredondamento estocástico -----
+    # Cada eixo que muda vira (deslocamento do índice, passo até o vizinho
+    # de cima, fração ou None); eixos que não mudam não custam nada.
+    def _eixo(self, k, real, atual):
+        np = self.np
+        g = self.grade
+        x = real / (g.passo_vida if k < 2 else g.passo_mana)
+        if k < 2:
+            x = np.maximum(x, 1.0)  # vivo nunca cai no ponto 0
+        x = np.minimum(x, g.forma[k] - 1)
+        lo = np.floor(x)
+        fr = (x - lo).astype(np.float32)
+        lo = lo.astype(np.int32)
+        sobe = ((lo < g.forma[k] - 1) * g.passos[k]).astype(np.int32)
+        return (lo - atual) * np.int32(g.passos[k]), sobe, fr if np.any(fr) else None
+
+    def _inteiro(self, k, novo, atual):
+        return (novo - atual) * self.np.int32(self.grade.passos[k]), 0, None
+
+    def _valor(self, T, base, *eixos):
+        # Esperança de T no estado base + mudanças (no máximo 2 eixos fracionários)
+        idx = base
+        partes = []
+        for desloc, sobe, fr in eixos:
+            idx = idx + desloc
+            if fr is not None:
+                partes.append((sobe, fr))
+        total = 0
+        for mascara in range(1 << len(partes)):
+            i = idx
+            peso = 1
+            for j, (sobe, fr) in enumerate(partes):
+                if mascara >> j & 1:
+                    i = i + sobe
+                    peso = peso * fr
+                else:
+                    peso = peso * (1 - fr)
+            total = total + peso * T[i]
+        return total
+
+    def _componentes(self, inicio, fim):
+        # índice plano, índices na grade e valores reais de vida/mana
+        np = self.np
+        g = self.grade
+        base = np.arange(inicio, fim, dtype=np.int32)
+        idx = tuple(i.astype(np.int32) for i in np.unravel_index(base, g.forma))
+        reais = (idx[0] * g.passo_vida, idx[1] * g.passo_vida, idx[2] * g.passo_mana, idx[3] * g.passo_mana)
+        return base, idx, reais
+
+    # ----- turno do jogador: V a partir de W -----
+    def _backup_jogador(self, W, inicio, fim):
+        np = self.np
+        qmax = self.grade.queimadura_max
+        base, idx, (vj, vi, mj, mi) = self._componentes(inicio, fim)
+        _, _, _, _, po, dj, di, qj, qe, imp = idx
+        eixo, inteiro = self._eixo, self._inteiro
+
+        # status no início do turno
+        queima = qj > 0
+        vj = vj - self.dano_queima * queima
+        morto = vj <= 0
+        e_vj = eixo(0, vj, idx[0])
+        e_regen = eixo(2, np.minimum(100, mj + 6), idx[2])
+        base = base + inteiro(7, qj - queima, qj)[0] + inteiro(9, 0, imp)[0]
+
+        def w(*mudancas, vida=e_vj, mana=e_regen):
+            return self._valor(W, base, vida, mana, *mudancas)
+
+        q = np.full((len(ACOES), fim - inicio), -np.inf, dtype=np.float32)
+        sem_defesa = inteiro(6, 0, di)
+        for k in range(len(self.dano)):
+            pode = mj >= self.custo[k]
+            e_mana = eixo(2, np.minimum(100, mj - self.custo[k] + 6), idx[2])
+            p = self.chance[k] / 100
+            ps = self.status_chance[k] / 100
+            if self.queima[k]:
+                efeito = inteiro(8, np.minimum(qmax, qe + self.turnos_queima[k]), qe)
+            else:
+                efeito = inteiro(9, 1, 0)  # impedido já foi zerado na base
+            acerto = 0
+            for pc, dano in ((0.12, int(self.dano[k] * 1.6)), (0.88, self.dano[k])):
+                vi_k = vi - np.where(di == 1, int(dano * 0.5), dano)
+                e_vi = eixo(1, vi_k, idx[1])
+                com = w(e_vi, sem_defesa, efeito, mana=e_mana)
+                sem = w(e_vi, sem_defesa, mana=e_mana)
+                acerto = acerto + pc * np.where(vi_k <= 0, 1.0, ps * com + (1 - ps) * sem)
+            valor = (1 - p) * w(mana=e_mana) + p * acerto
+            q[k] = np.where(pode, valor, -np.inf)
+
+        q[ACOES.index("defender")] = w(inteiro(5, 1, dj))
+        pode = po > 0
+        pocao = w(inteiro(4, np.maximum(po - 1, 0), po), vida=eixo(0, np.minimum(100, vj + 25), idx[0]))
+        q[ACOES.index("pocao")] = np.where(pode, pocao, -np.inf)
+
+        melhor = q.argmax(axis=0)
+        v = q.max(axis=0)
+        impedido = imp > 0
+        v = np.where(impedido, w(), v)
+        acao = np.where(impedido | morto, SEM_ACAO, melhor)
+        v = np.where(morto, 0.0, v)
+        return v, acao
+
+    # ----- turno do inimigo (IA embutida): W a partir de V -----
+    def _backup_inimigo(self, V, inicio, fim):
+        np = self.np
+        qmax = self.grade.queimadura_max
+        base, idx, (vj, vi, mj, mi) = self._componentes(inicio, fim)
+        _, _, _, _, po, dj, di, qj, qe, imp = idx
+        eixo, inteiro = self._eixo, self._inteiro
+
+        queima = qe > 0
+        vi = vi - self.dano_queima * queima
+        venceu = vi <= 0
+        e_vi = eixo(1, vi, idx[1])
+        e_regen = eixo(3, np.minimum(100, mi + 6), idx[3])
+        base = base + inteiro(8, qe - queima, qe)[0] + inteiro(9, 0, imp)[0]
+
+        def v(*mudancas, mana=e_regen):
+            return self._valor(V, base, e_vi, mana, *mudancas)
+
+        impedido = imp > 0
+        p_def = np.where(vi <= 25, 0.35, 0.0).astype(np.float32)
+        defende = v(inteiro(6, 1, di))
+        canaliza = v(mana=eixo(3, np.minimum(100, np.minimum(100, mi + 10) + 6), idx[3]))
+
+        # pesos da _escolha_ia (a última regra válida vence)
+        pi = REGISTRO.pesos_ia
+        pesos = np.empty((len(self.dano), fim - inicio), dtype=np.float32)
+        pesos[:] = np.array(pi["padrao"], dtype=np.float32)[:, None]
+        for cond, regra in ((vj < 35, "jogador_fraco"), (mi < 25, "sem_mana"), (dj == 1, "jogador_defende")):
+            pesos[:, cond] = np.array(pi[regra], dtype=np.float32)[:, None]
+        pesos /= pesos.sum(axis=0)
+
+        sem_defesa = inteiro(5, 0, dj)
+        ataque = 0
+        for k in range(len(self.dano)):
+            pode = mi >= self.custo[k]
+            e_mana = eixo(3, np.minimum(100, mi - self.custo[k] + 6), idx[3])
+            p = max(5, min(95, self.chance[k] + self.acc_mod)) / 100
+            ps = self.status_chance[k] / 100
+            if self.queima[k]:
+                efeito = inteiro(7, np.minimum(qmax, qj + self.turnos_queima[k]), qj)
+            else:
+                efeito = inteiro(9, 1, 0)  # impedido já foi zerado na base
+            acerto = 0
+            for pc, dano in ((0.12, int(self.dano[k] * 1.6)), (0.88, self.dano[k])):
+                vj_k = vj - np.where(dj == 1, int(dano * 0.5), dano)
+                e_vj = eixo(0, vj_k, idx[0])
+                com = v(e_vj, sem_defesa, efeito, mana=e_mana)
+                sem = v(e_vj, sem_defesa, mana=e_mana)
+                acerto = acerto + pc * np.where(vj_k <= 0, 0.0, ps * com + (1 - ps) * sem)
+            lanca = (1 - p) * v(mana=e_mana) + p * acerto
+            ataque = ataque + pesos[k] * np.where(pode, lanca, canaliza)
+
+        w = p_def * defende + (1 - p_def) * ataque
+        w = np.where(impedido, v(), w)
+        return np.where(venceu, 1.0, w)
+
+    def resolver(self, tolerancia=1e-4, max_iteracoes=500, progresso=None):
+        np = self.np
+        n = self.grade.tamanho
+        V = np.zeros(n, dtype=np.float32)
+        W = np.zeros(n, dtype=np.float32)
+        acoes = np.full(n, SEM_ACAO, dtype=np.int8)
+        for it in range(1, max_iteracoes + 1):
+            delta = 0.0
+            for a in range(0, n, self.bloco):
+                b = min(n, a + self.bloco)
+                W[a:b] = self._backup_inimigo(V, a, b)
+            for a in range(0, n, self.bloco):
+                b = min(n, a + self.bloco)
+                v, ac = self._backup_jogador(W, a, b)
+                delta = max(delta, float(np.abs(v - V[a:b]).max()))
+                V[a:b] = v
+                acoes[a:b] = ac
+            if progresso:
+                progresso(it, delta)
+            if delta < tolerancia:
+                break
+        self.V, self.acoes = V, acoes
+        return V, acoes
+
+    def salvar(self, caminho):
+        # Cabeçalho + JSON de metadados, depois float32[n] (vitória) e int8[n] (ação)
+        meta = dict(self.grade.meta(), versao=VERSAO, impressao=REGISTRO.impressao.hex(),
+                    dificuldade=self.dificuldade, enemy_acc_mod=self.acc_mod, acoes=list(ACOES))
+        bruto = json.dumps(meta).encode()
+        cabecalho = MAGICO + struct.pack("<I", len(bruto)) + bruto
+        cabecalho += b"\x00" * (-len(cabecalho) % 8)
+        os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+        tmp = caminho + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(cabecalho)
+            f.write(self.V.astype("<f4").tobytes())
+            f.write(self.acoes.astype("i1").tobytes())
+        os.replace(tmp, caminho)
+
+
+# ---------- Consulta O(1) (sem NumPy) ----------
+class TabelaSolucao:
+    """
+    Tabela gerada pelo Solucionador, mapeada em memória. Abrir não lê
+    os dados; cada consulta lê 5 bytes.
+    """
+
+    def __init__(self, caminho):
+        self._arquivo = open(caminho, "rb")
+        try:
+            self._mm = mmap.mmap(self._arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._arquivo.close()
+            raise
+        try:
+            self._ler_cabecalho(caminho)
+        except (ValueError, KeyError, TypeError) as e:
+            self.fechar()
+            if isinstance(e, ValueError):
+                raise
+            raise ValueError(f"metadados inválidos na tabela de solução: {caminho}") from e
+
+    def _ler_cabecalho(self, caminho):
+        inicio = len(MAGICO) + 4
+        if self._mm[:len(MAGICO)] != MAGICO or len(self._mm) < inicio:
+            raise ValueError(f"arquivo não é uma tabela de solução: {caminho}")
+        (tam,) = struct.unpack_from("<I", self._mm, len(MAGICO))
+        self.meta = json.loads(self._mm[inicio:inicio + tam])
+        if self.meta["versao"] != VERSAO:
+            raise ValueError(f"versão de tabela não suportada: {self.meta['versao']}")
+        if self.meta.get("impressao") != REGISTRO.impressao.hex():
+            raise ValueError(f"tabela gerada com outras regras de feitiços; gere de novo: {caminho}")
+        self.grade = Grade(self.meta["passo_vida"], self.meta["passo_mana"], self.meta["queimadura_max"])
+        self.acoes = tuple(self.meta.get("acoes", ACOES))  # feitiços de quando foi gerada
+        self._off_valor = inicio + tam + (-(inicio + tam) % 8)
+        self._off_acao = self._off_valor + 4 * self.grade.tamanho
+        if len(self._mm) != self._off_acao + self.grade.tamanho:
+            raise ValueError(f"tabela de solução truncada ou com tamanho errado: {caminho}")
+
+    def consultar(self, motor):
+        # -> (ação ou None, probabilidade de vitória) para o início do turno do jogador
+        st_j = motor.status_player
+        i = self.grade.indice(
+            motor.vida_jogador, motor.vida_inimigo, motor.mana_jogador, motor.mana_inimigo,
+            motor.pocoes, motor.defesa_ativa, motor.defesa_inimigo,
+            st_j[_QUEIMADURA] if _QUEIMADURA >= 0 else 0,
+            motor.status_enemy[_QUEIMADURA] if _QUEIMADURA >= 0 else 0,
+            any(st_j[k] for k in _IMPEDEM))
+        (valor,) = struct.unpack_from("<f", self._mm, self._off_valor + 4 * i)
+        acao = struct.unpack_from("b", self._mm, self._off_acao + i)[0]
+        return (self.acoes[acao] if acao != SEM_ACAO else None), valor
+
+    def fechar(self):
+        self._mm.close()
+        self._arquivo.close()
+
+
+def politica_tabela(tabela):
+    # Política do jogador para motor_batalha.jogar_partida
+    def politica(motor, rng):
+        acao, _ = tabela.consultar(motor)
+        return acao or "defender"
+    return politica
+
+
+# ---------- Main ----------
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Gera a tabela de jogo ótimo por programação dinâmica.")
+    parser.add_argument("--dificuldade", default="Normal", choices=DIFICULDADES_IA_EMBUTIDA)
+    parser.add_argument("--passo-vida", type=int, default=20)
+    parser.add_argument("--passo-mana", type=int, default=20)
+    parser.add_argument("--queimadura-max", type=int, default=2)
+    parser.add_argument("--tolerancia", type=float, default=1e-4)
+    parser.add_argument("--saida", help="arquivo da tabela (padrão: tabelas/solucao_<dificuldade>.bin)")
+    parser.add_argument("--avaliar", type=int, default=0, metavar="N",
+                        help="joga N partidas no motor seguindo a tabela")
+    args = parser.parse_args(argv)
+    caminho = args.saida or caminho_tabela(args.dificuldade)
+
+    if not args.avaliar or not os.path.exists(caminho):
+        grade = Grade(args.passo_vida, args.passo_mana, args.queimadura_max)
+        print(f"Grade {grade.forma} = {grade.tamanho:,} estados")
+        inicio = time.perf_counter()
+        sol = Solucionador(args.dificuldade, grade)
+        sol.resolver(args.tolerancia, progresso=lambda it, d: print(f"  iteração {it:3d}  Δ={d:.2e}", flush=True))
+        sol.salvar(caminho)
+        print(f"Tabela salva em {caminho} ({time.perf_counter() - inicio:.1f}s)")
+
+    if args.avaliar:
+        from motor_batalha import MotorBatalha, jogar_partida
+        tabela = TabelaSolucao(caminho)
+        motor = MotorBatalha(args.dificuldade, eventos=False)
+        motor.novo_jogo(args.dificuldade, 0)
+        _, previsto = tabela.consultar(motor)
+        politica = politica_tabela(tabela)
+        vitorias = 0
+        for i in range(args.avaliar):
+            motor.novo_jogo(args.dificuldade, i)
+            vitorias += jogar_partida(motor, politica) == "player"
+        tabela.fechar()
+        print(f"Previsto pela tabela: {100 * previsto:.1f}% | "
+              f"Obtido em {args.avaliar} partidas: {100 * vitorias / args.avaliar:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# Batalha dos Feiticeiros — Som
+# O backend é escolhido uma vez, na inicialização:
+# - winsound.Beep (Windows): bloqueia pela duração do tom, então toca numa
+#   thread própria alimentada por uma fila curta; se a fila estiver cheia
+#   o tom é descartado (rajadas de golpes não acumulam atraso)
+# - root.bell() (demais sistemas): é instantâneo, toca direto
+# - nulo: para execuções sem interface e benchmarks
+#   (também forçado por BATALHA_SEM_SOM=1)
+
+import os
+import queue
+import threading
+
+TONS = {
+    "ok": (880, 100),    # (frequência Hz, duração ms)
+    "fail": (220, 140),
+}
+TAMANHO_FILA = 2
+
+
+# ---------- Backends ----------
+class SomNulo:
+    nome = "nulo"
+    bloqueia = False
+
+    def tocar(self, frequencia, duracao_ms):
+        pass
+
+
+class SomWinsound:
+    nome = "winsound"
+    bloqueia = True
+
+    def __init__(self, winsound):
+        self._beep = winsound.Beep
+
+    def tocar(self, frequencia, duracao_ms):
+        self._beep(frequencia, duracao_ms)
+
+
+class SomSino:
+    nome = "sino"
+    bloqueia = False
+
+    def __init__(self, root):
+        self.root = root
+
+    def tocar(self, frequencia, duracao_ms):
+        try:
+            self.root.bell()
+        except Exception:
+            pass
+
+
+def resolver_backend(root=None, nulo=False):
+    if nulo or os.environ.get("BATALHA_SEM_SOM"):
+        return SomNulo()
+    try:
+        import winsound
+        return SomWinsound(winsound)
+    except ImportError:
+        pass
+    if root is not None:
+        return SomSino(root)
+    return SomNulo()
+
+
+# ---------- Tocador ----------
+class Som:
+    def __init__(self, backend=None, tamanho_fila=TAMANHO_FILA):
+        self.backend = backend or SomNulo()
+        self.ativo = True
+        self.descartados = 0  # tons perdidos por fila cheia
+        self._fila = None
+        self._thread = None
+        if self.backend.bloqueia:
+            self._fila = queue.Queue(maxsize=tamanho_fila)
+            self._thread = threading.Thread(target=self._trabalhar, args=(self._fila,), name="som", daemon=True)
+            self._thread.start()
+
+    def tocar(self, nome):
+        if not self.ativo:
+            return
+        tom = TONS[nome]
+        if self._fila is None:
+            self.backend.tocar(*tom)
+            return
+        try:
+            self._fila.put_nowait(tom)
+        except queue.Full:
+            self.descartados += 1
+
+    def _trabalhar(self, fila):
+        # a fila vem por argumento: encerrar() zera self._fila com a thread tocando
+        while True:
+            tom = fila.get()
+            if tom is None:
+                return
+            try:
+                self.backend.tocar(*tom)
+            except Exception:
+                pass
+
+    def encerrar(self):
+        self.ativo = False
+        if self._fila is not None:
+            # a sentinela precisa entrar mesmo com a fila cheia
+            while True:
+                try:
+                    self._fila.put_nowait(None)
+                    break
+                except queue.Full:
+                    try:
+                        self._fila.get_nowait()
+                    except queue.Empty:
+                        pass
+            self._fila = None
@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+pytest.importorskip("numpy")
+
+import afinador_balanceamento as af  # noqa: E402
+import feiticos  # noqa: E402
+from motor_batalha import DIFICULDADES, PRESETS, _ajustar_dificuldades, teto_inicial  # noqa: E402
+
+
+def _base():
+    with open(feiticos.ARQUIVO_PADRAO, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_busca_nao_passa_do_teto_de_vida_e_mana():
+    eixos, vetor = af.eixos_busca(_base(), list(af.ALVOS))
+    for (secao, nome, campo, lo, hi), v in zip(eixos, vetor):
+        if secao == "dificuldades" and campo != "enemy_acc_mod":
+            assert hi == max(100, PRESETS[nome][campo])
+            assert lo <= v <= hi
+    # os números de fábrica acima de 100 continuam alcançáveis, sem subir mais
+    assert teto_inicial("Difícil", "vida_inimigo") == 120
+    assert teto_inicial("Normal", "mana") == 100
+
+
+def test_arquivo_acima_do_teto_e_recusado():
+    copia = {d: dict(c) for d, c in DIFICULDADES.items()}
+    with pytest.raises(ValueError):
+        _ajustar_dificuldades(copia, {"Difícil": {"vida_inimigo": 148}})
+    with pytest.raises(ValueError):
+        _ajustar_dificuldades(copia, {"Fácil": {"mana": 117}})
+    _ajustar_dificuldades(copia, {"Fácil": {"mana": 110, "enemy_acc_mod": -20}})
+    assert copia["Fácil"]["mana"] == 110
+
+
+def _contexto(**mudar):
+    eixos, _ = af.eixos_busca(_base(), ["Normal"])
+    contexto = {"base": _base(), "eixos": eixos, "dificuldades": ["Normal"], "partidas": 100, "semente": 0,
+                "politica": "aleatoria"}
+    contexto.update(mudar)
+    return contexto
+
+
+def test_cache_reaproveita_so_o_mesmo_contexto(tmp_path):
+    caminho = str(tmp_path / "cache.json")
+    cache = af.CacheAvaliacoes(caminho, _contexto())
+    cache[(1, 2, 3)] = {"Normal": (0.5, 11.0)}
+    cache.salvar()
+    # mesma chave com as chaves do contexto em outra ordem
+    reaberto = af.CacheAvaliacoes(caminho, dict(reversed(list(_contexto().items()))))
+    assert reaberto.chave == cache.chave
+    assert reaberto.get((1, 2, 3)) == {"Normal": (0.5, 11.0)} and reaberto.acertos == 1
+    for mudar in ({"partidas": 200}, {"semente": 1}, {"politica": "gulosa"}):
+        outro = af.CacheAvaliacoes(caminho, _contexto(**mudar))
+        assert outro.chave != cache.chave and len(outro) == 0
+
+
+def test_cache_corrompido_comeca_vazio(tmp_path):
+    caminho = tmp_path / "cache.json"
+    caminho.write_text("{", encoding="utf-8")
+    assert len(af.CacheAvaliacoes(str(caminho), _contexto())) == 0
+
+
+def test_arquivo_gerado_carrega_no_jogo(tmp_path, capsys):
+    saida = tmp_path / "balanceado.json"
+    af.main(["--geracoes", "2", "--variacoes", "2", "--partidas", "200", "--processos", "1", "--cache", "",
+             "--saida", str(saida)])
+    registro = feiticos.carregar(str(saida))
+    assert registro.ids == feiticos.REGISTRO.ids
+    assert set(registro.dificuldades) == set(af.ALVOS)
+    copia = {d: dict(c) for d, c in DIFICULDADES.items()}
+    _ajustar_dificuldades(copia, registro.dificuldades)  # dentro do teto do motor
+    assert "Arquivo:" in capsys.readouterr().out
@@ -0,0 +1,83 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import ambiente_rl  # noqa: E402
+from ambiente_rl import AmbienteBatalhas  # noqa: E402
+from politica_treinada import ACOES, OBSERVACAO  # noqa: E402
+
+DEFENDER, CANALIZAR = ACOES.index("defender"), ACOES.index("canalizar")
+
+
+def _valida(info, rng):
+    # uma ação válida ao acaso por partida
+    return np.array([rng.choice(np.flatnonzero(m)) for m in info["mascara"]])
+
+
+def test_reset_formatos():
+    amb = AmbienteBatalhas(64, semente=1)
+    obs, info = amb.reset()
+    assert obs.shape == (64, len(OBSERVACAO)) and obs.dtype == np.float32
+    assert info["mascara"].shape == (64, len(ACOES)) and info["mascara"].dtype == bool
+    assert (obs[:, -1] == 1).all()
+
+
+def test_mesma_semente_mesmos_passos():
+    saidas = []
+    for _ in range(2):
+        amb = AmbienteBatalhas(32, semente=7)
+        _, info = amb.reset()
+        rng = np.random.default_rng(0)
+        passos = []
+        for _ in range(20):
+            obs, recompensa, terminado, _, info = amb.step(_valida(info, rng))
+            passos.append((obs, recompensa, terminado))
+        saidas.append(passos)
+    for a, b in zip(*saidas):
+        for x, y in zip(a, b):
+            assert np.array_equal(x, y)
+
+
+def test_recompensa_so_no_fim_e_autorreset():
+    amb = AmbienteBatalhas(256, dificuldade="Normal", semente=3)
+    _, info = amb.reset()
+    rng = np.random.default_rng(3)
+    terminadas = 0
+    for _ in range(60):
+        obs, recompensa, terminado, truncado, info = amb.step(_valida(info, rng))
+        assert (recompensa[~terminado] == 0).all()
+        assert set(np.abs(recompensa[terminado])) <= {1}
+        if terminado.any():
+            terminadas += int(terminado.sum())
+            final = info["obs_final"][terminado]
+            # vida do inimigo (col. 0) ou do jogador (col. 1) zerada
+            assert ((final[:, 0] <= 0) | (final[:, 1] <= 0)).all()
+            vencedor_inimigo = final[:, 1] <= 0
+            assert (recompensa[terminado][vencedor_inimigo] == 1).all()
+        # quem recomeçou já está ativo de novo, no 1º turno
+        assert amb.lote.ativos.all()
+        assert (amb.lote.turnos[terminado | truncado] <= 1).all()
+    assert terminadas > 0
+
+
+def test_truncado_sem_autorreset():
+    amb = AmbienteBatalhas(16, semente=2, limite_turnos=2, autorreset=False)
+    amb.reset()
+    _, recompensa, terminado, truncado, info = amb.step(np.full(16, DEFENDER))
+    assert "obs_final" not in info
+    assert (truncado | terminado).all() and not (truncado & terminado).any()
+    assert (recompensa[truncado] == 0).all()
+    assert not amb.lote.ativos.any()
+
+
+def test_mascara_sem_mana():
+    amb = AmbienteBatalhas(4, semente=0)
+    amb.reset()
+    amb.lote.mana_inimigo[:] = 0
+    m = amb.mascara()
+    assert not m[:, :DEFENDER].any()
+    assert m[:, DEFENDER].all() and m[:, CANALIZAR].all()
+    amb.lote.mana_inimigo[:] = 100
+    assert not amb.mascara()[:, CANALIZAR].any()
+    assert amb.mascara()[:, :DEFENDER].all()
+    assert ambiente_rl.CODIGOS.shape == (len(ACOES),)
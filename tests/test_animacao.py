@@ -0,0 +1,125 @@
+import types
+
+import animacao
+from animacao import AgendadorAnimacoes
+
+
+class RootFalso:
+    def __init__(self):
+        self.pendentes = {}
+        self._seq = 0
+
+    def after(self, ms, funcao):
+        self._seq += 1
+        self.pendentes[self._seq] = funcao
+        return self._seq
+
+    def after_cancel(self, ident):
+        self.pendentes.pop(ident, None)
+
+    def rodar(self):
+        # roda um quadro: o(s) callback(s) agendado(s) até agora
+        pendentes, self.pendentes = self.pendentes, {}
+        for funcao in pendentes.values():
+            funcao()
+
+
+class CanvasFalso:
+    def __init__(self):
+        self.itens = {}
+        self.escritas = []
+
+    def _criar(self, coords, **opcoes):
+        item = len(self.itens) + 1
+        self.itens[item] = {"coords": list(coords), **opcoes}
+        return item
+
+    def create_text(self, *coords, **opcoes):
+        return self._criar(coords, **opcoes)
+
+    def create_oval(self, *coords, **opcoes):
+        return self._criar(coords, **opcoes)
+
+    def coords(self, item, *c):
+        if not c:
+            return list(self.itens[item]["coords"])
+        self.escritas.append(("coords", item))
+        self.itens[item]["coords"] = list(c)
+
+    def itemconfigure(self, item, **opcoes):
+        self.escritas.append(("config", item))
+        self.itens[item].update(opcoes)
+
+    def itemcget(self, item, opcao):
+        return self.itens[item].get(opcao, "")
+
+
+def _agendador(monkeypatch):
+    relogio = [0.0]
+    monkeypatch.setattr(animacao, "time", types.SimpleNamespace(perf_counter=lambda: relogio[0]))
+    root, canvas = RootFalso(), CanvasFalso()
+    return AgendadorAnimacoes(root, canvas), root, canvas, relogio
+
+
+def test_um_unico_timer_para_varias_animacoes(monkeypatch):
+    ag, root, _, relogio = _agendador(monkeypatch)
+    for _ in range(5):
+        ag.adicionar(lambda t: t < 100)
+    assert len(root.pendentes) == 1
+    root.rodar()
+    assert len(root.pendentes) == 1 and ag.quadros == 1
+    relogio[0] = 0.2
+    root.rodar()
+    assert not root.pendentes and not ag.animacoes  # sem animação, sem tick
+
+
+def test_escritas_do_quadro_saem_uma_vez_por_item(monkeypatch):
+    ag, root, canvas, _ = _agendador(monkeypatch)
+    alvo = canvas.create_oval(0, 0, 10, 10, fill="#ff0000")
+    canvas.escritas.clear()
+
+    def passo(t):
+        for x in range(10):
+            ag.coords(alvo, x, 0, x + 10, 10)
+        return False
+
+    ag.adicionar(passo)
+    root.rodar()
+    assert canvas.escritas == [("coords", alvo)]
+    assert canvas.coords(alvo) == [9, 0, 19, 10]
+
+
+def test_tempo_escalado_e_fim_da_animacao(monkeypatch):
+    ag, root, canvas, relogio = _agendador(monkeypatch)
+    ag.definir_velocidade(2 * animacao.VELOCIDADE_PADRAO_MS)
+    alvo = canvas.create_oval(0, 0, 10, 10, fill="#ff0000")
+    ag.registrar_sprite(alvo)
+    ag.tremer(alvo, meio_ciclo_ms=25, vezes=2)
+    root.rodar()
+    relogio[0] = 0.030  # 30 ms reais = 15 ms de animação: ainda no 1º meio ciclo
+    root.rodar()
+    assert canvas.coords(alvo) == [6, 0, 16, 10]
+    relogio[0] = 1.0  # atrasado: termina e volta ao repouso, sem passos perdidos
+    root.rodar()
+    assert canvas.coords(alvo) == [0, 0, 10, 10]
+    assert not ag.animacoes and not root.pendentes
+
+
+def test_pool_de_textos_recicla_o_mais_antigo(monkeypatch):
+    ag, root, canvas, _ = _agendador(monkeypatch)
+    criados = len(canvas.itens)
+    for k in range(12):
+        ag.texto(50, 50, str(k), "#ffffff")
+    assert len(canvas.itens) == criados  # nada criado além do pool
+    assert len(ag.animacoes) == 8
+    root.rodar()
+    textos = sorted(canvas.itens[i]["text"] for i in ag.textos.em_uso)
+    assert textos == sorted(str(k) for k in range(4, 12))
+
+
+def test_cancelar_tudo_finaliza_e_desliga_o_timer(monkeypatch):
+    ag, root, canvas, _ = _agendador(monkeypatch)
+    ag.texto(50, 50, "-10", "#ff0000")
+    ag.cancelar_tudo()
+    assert not root.pendentes and not ag.animacoes
+    assert all(canvas.itens[i]["state"] == "hidden" for i in ag.textos.livres)
@@ -0,0 +1,97 @@
+# Lógica de entrada da interface, sem abrir janela: o app é montado só com
+# os atributos que os atalhos usam e um root que guarda os after()
+import types
+
+import pytest
+
+pytest.importorskip("tkinter")
+
+from batalha_dos_feiticeiros_plus_fixed import BatalhaFeiticeirosApp  # noqa: E402
+from motor_batalha import MotorBatalha, decodificar_acao  # noqa: E402
+
+
+class RootFalso:
+    def __init__(self):
+        self.pendentes = {}
+        self._seq = 0
+
+    def after(self, ms, funcao):
+        self._seq += 1
+        self.pendentes[self._seq] = funcao
+        return self._seq
+
+    def after_cancel(self, ident):
+        self.pendentes.pop(ident, None)
+
+    def rodar(self):
+        pendentes, self.pendentes = self.pendentes, {}
+        for funcao in pendentes.values():
+            funcao()
+
+
+def _app():
+    app = BatalhaFeiticeirosApp.__new__(BatalhaFeiticeirosApp)
+    app.root = RootFalso()
+    app.motor = MotorBatalha("Normal", 5, eventos=False)
+    app.replay = app.remoto = app.oponente = app._jogada_inimigo = app._inimigo_after = None
+    app._acao_pendente = app._ultima_soltura = None
+    app._teclas_presas = set()
+    app._processar_eventos = lambda: None
+    app._set_botoes_state = lambda estado: None
+    return app
+
+
+def _evento(tecla, horario):
+    return types.SimpleNamespace(keysym=tecla, time=horario)
+
+
+def _jogadas(app):
+    return [acao for quem, acao in map(decodificar_acao, app.motor.acoes) if quem == "player"]
+
+
+def test_tecla_na_vez_do_jogador_joga_no_mesmo_evento():
+    app = _app()
+    app._tecla(_evento("d", 1), "defender")
+    assert _jogadas(app) == ["defender"]
+    assert app.motor.fase == "inimigo" and len(app.root.pendentes) == 1
+
+
+def test_repeticao_automatica_e_ignorada():
+    app = _app()
+    app._tecla(_evento("d", 1), "defender")
+    app.root.rodar()  # inimigo joga
+    app._tecla(_evento("d", 2), "defender")  # Windows/macOS: KeyPress sem KeyRelease
+    app._soltar_tecla(_evento("d", 3))
+    app._tecla(_evento("d", 3), "defender")  # X11: KeyRelease + KeyPress no mesmo horário
+    assert _jogadas(app) == ["defender"]
+    app._soltar_tecla(_evento("d", 4))
+    app._tecla(_evento("d", 9), "defender")  # tecla solta e apertada de novo
+    assert _jogadas(app) == ["defender", "defender"]
+
+
+def test_vez_do_inimigo_guarda_so_a_ultima_acao():
+    app = _app()
+    app._pedir_acao("defender")
+    app._pedir_acao("pocao")
+    app._pedir_acao("defender")
+    assert app._acao_pendente == "defender" and _jogadas(app) == ["defender"]
+    app.root.rodar()
+    # o inimigo jogou e a pendente rodou logo em seguida
+    assert _jogadas(app) == ["defender", "defender"] and app._acao_pendente is None
+
+
+def test_cancelar_descarta_turno_agendado_e_pendente():
+    app = _app()
+    app._pedir_acao("defender")
+    app._pedir_acao("defender")
+    app._cancelar_inimigo()
+    assert not app.root.pendentes and app._acao_pendente is None
+
+
+def test_sem_acao_com_partida_encerrada_ou_replay():
+    app = _app()
+    app.replay = object()
+    app._pedir_acao("defender")
+    app.replay, app.motor.game_over = None, True
+    app._pedir_acao("defender")
+    assert _jogadas(app) == [] and app._acao_pendente is None
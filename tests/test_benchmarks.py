@@ -0,0 +1,47 @@
+import json
+
+import pytest
+
+import benchmarks
+
+
+def _arquivo(tmp_path, nome, taxas, pulados=()):
+    caminho = tmp_path / nome
+    caminho.write_text(json.dumps({
+        "resultados": {b: {"unidade": "op", "n": 1, "rodadas": 1, "ops_por_s": t, "melhor_ops_por_s": t}
+                       for b, t in taxas.items()},
+        "pulados": {b: "sem display" for b in pulados},
+    }), encoding="utf-8")
+    return str(caminho)
+
+
+@pytest.mark.parametrize("novo, pulados, codigo", [
+    ({"a": 1000, "b": 2000}, (), 0),
+    ({"a": 950, "b": 2000}, (), 0),        # 5% mais lento: dentro do limite
+    ({"a": 1500, "b": 2000, "c": 1}, (), 0),  # melhora e benchmark novo
+    ({"a": 800, "b": 2000}, (), 1),        # 20% mais lento
+    ({"a": 1000}, ("b",), 1),              # pulado em NOVO
+    ({"a": 1000}, (), 1),                  # ausente em NOVO
+])
+def test_comparar_codigo_de_saida(tmp_path, capsys, novo, pulados, codigo):
+    base = _arquivo(tmp_path, "base.json", {"a": 1000, "b": 2000})
+    novo = _arquivo(tmp_path, "novo.json", novo, pulados)
+    assert benchmarks.main(["--comparar", base, novo]) == codigo
+    assert ("regressão" in capsys.readouterr().out) == bool(codigo)
+
+
+def test_comparar_situacoes():
+    base = {"resultados": {"a": {"ops_por_s": 100.0}, "b": {"ops_por_s": 100.0}, "c": {"ops_por_s": 100.0}}}
+    novo = {"resultados": {"a": {"ops_por_s": 80.0}, "d": {"ops_por_s": 5.0}}, "pulados": {"b": "sem numpy"}}
+    linhas, regressoes = benchmarks.comparar(base, novo, limite=10)
+    assert {nome: situacao for nome, *_, situacao in linhas} == {
+        "a": "REGRESSÃO", "d": "novo", "b": "PULADO", "c": "AUSENTE"}
+    assert sorted(regressoes) == ["a", "b", "c"]
+
+
+def test_comparar_arquivo_ilegivel_e_erro_de_uso(tmp_path):
+    ruim = tmp_path / "ruim.json"
+    ruim.write_text("{", encoding="utf-8")
+    with pytest.raises(SystemExit) as e:
+        benchmarks.main(["--comparar", str(ruim), str(tmp_path / "nao_existe.json")])
+    assert e.value.code == 2
@@ -0,0 +1,65 @@
+import pytest
+
+import gerador_senha
+from bloqueio_senhas import ListaBloqueio, construir, limite_unicas
+
+ESPACO_2_MINUSCULAS = ["-n", "{n}", "--tamanho", "2", "--sem-maiusculas", "--sem-numeros", "--sem-simbolos",
+                       "--unicas"]
+
+
+def _gerar(tmp_path, *argv):
+    saida = tmp_path / "senhas.txt"
+    gerador_senha.main([*argv, "--saida", str(saida)])
+    return saida.read_bytes().split()
+
+
+def _lista(tmp_path, senhas):
+    pytest.importorskip("numpy")
+    lista, filtro = tmp_path / "lista.txt", tmp_path / "lista.bloom"
+    lista.write_text("".join(s + "\n" for s in senhas))
+    construir(str(lista), str(filtro))
+    return str(filtro)
+
+
+# ---------- Lista de bloqueio ----------
+def test_lista_contem_todas_as_senhas_da_lista(tmp_path):
+    senhas = [f"senha{i}" for i in range(2000)]
+    lista = ListaBloqueio(_lista(tmp_path, senhas))
+    try:
+        assert all(s in lista for s in senhas)
+        assert sum(f"outra{i}" in lista for i in range(2000)) <= 1
+    finally:
+        lista.fechar()
+
+
+def test_lista_truncada_e_recusada(tmp_path):
+    caminho = _lista(tmp_path, ["123456", "senha"])
+    with open(caminho, "r+b") as f:
+        f.truncate(f.seek(0, 2) - 1)
+    with pytest.raises(ValueError):
+        ListaBloqueio(caminho)
+
+
+def test_gerar_senha_reaproveita_a_lista_de_bloqueio(tmp_path):
+    filtro = _lista(tmp_path, ["123456", "senha"])
+    gerador_senha._LISTAS_BLOQUEIO.clear()
+    for _ in range(3):
+        assert len(gerador_senha.gerar_senha(10, bloqueio=filtro)) == 10
+    assert list(gerador_senha._LISTAS_BLOQUEIO) == [filtro]
+    gerador_senha._LISTAS_BLOQUEIO.pop(filtro).fechar()
+
+
+# ---------- --unicas ----------
+def test_unicas_no_limite_do_espaco_e_erro_de_uso(tmp_path, capsys):
+    # 26 * 26 = 676 senhas possíveis: pedir todas é recusado antes de gerar
+    with pytest.raises(SystemExit) as e:
+        _gerar(tmp_path, *(a.format(n=676) for a in ESPACO_2_MINUSCULAS))
+    assert e.value.code == 2
+    assert "--unicas" in capsys.readouterr().err
+
+
+def test_unicas_perto_do_limite_sem_repetidas(tmp_path):
+    n = limite_unicas(26 * 26)
+    senhas = _gerar(tmp_path, *(a.format(n=n) for a in ESPACO_2_MINUSCULAS))
+    assert len(senhas) == n == len(set(senhas))
+    assert all(len(s) == 2 and s.isalpha() and s.islower() for s in senhas)
@@ -0,0 +1,55 @@
+import pytest
+
+import efeitos
+
+TABELA = efeitos.de_dados([
+    {"id": "veneno", "dano_por_turno": 4},
+    {"id": "queimadura", "dano_por_turno": 5},
+    {"id": "regeneracao", "cura_por_turno": 6},
+    {"id": "congelado", "pula_turno": True},
+    {"id": "escudo", "reducao_dano": 30},
+    {"id": "barreira", "reducao_dano": 50},
+])
+VENENO, QUEIMADURA, REGENERACAO, CONGELADO, ESCUDO, BARREIRA = range(6)
+
+
+def test_estado_novo_sem_efeitos():
+    status = TABELA.novo_estado()
+    assert list(status) == [0] * len(TABELA)
+    assert TABELA.tique(status) == (0, 0, False, -1)
+    assert TABELA.reducao_dano(status) == 0
+
+
+def test_tique_soma_os_efeitos_ativos_e_desconta_um_turno():
+    status = TABELA.novo_estado()
+    status[QUEIMADURA], status[VENENO], status[REGENERACAO], status[CONGELADO] = 2, 1, 3, 1
+    # fonte: o primeiro efeito com dano na ordem da tabela
+    assert TABELA.tique(status) == (9, 6, True, VENENO)
+    assert list(status) == [0, 1, 2, 0, 0, 0]
+    assert TABELA.tique(status) == (5, 6, False, QUEIMADURA)
+    assert TABELA.tique(status) == (0, 6, False, -1)
+    assert list(status) == [0] * len(TABELA)
+
+
+def test_reducao_e_a_maior_entre_os_ativos():
+    status = TABELA.novo_estado()
+    status[ESCUDO] = 1
+    assert TABELA.reducao_dano(status) == 30
+    status[BARREIRA] = 1
+    assert TABELA.reducao_dano(status) == 50
+
+
+def test_sem_efeitos_declarados_usa_os_padrao():
+    assert [e.id for e in efeitos.de_dados(None)] == [d["id"] for d in efeitos.EFEITOS_PADRAO]
+
+
+@pytest.mark.parametrize("lista", [
+    [{"nome": "sem id"}],
+    [{"id": "a", "dano_por_turno": -1}],
+    [{"id": "a", "reducao_dano": 101}],
+    [{"id": "a", "cura_por_turno": 1.5}],
+    [{"id": "a"}, {"id": "a"}],
+])
+def test_efeito_invalido_e_recusado(lista):
+    with pytest.raises(ValueError):
+        efeitos.de_dados(lista)
@@ -0,0 +1,57 @@
+import types
+
+from estado_observavel import EstadoObservavel
+
+
+class RootFalso:
+    def __init__(self):
+        self.ociosos = []
+
+    def after_idle(self, funcao):
+        self.ociosos.append(funcao)
+        return len(self.ociosos)
+
+    def rodar(self):
+        ociosos, self.ociosos = self.ociosos, []
+        for funcao in ociosos:
+            funcao()
+
+
+def _estado():
+    root = RootFalso()
+    estado = EstadoObservavel(root, campos=("vida", "mana"))
+    chamadas = []
+    estado.ligar("vida", lambda v: chamadas.append(("vida", v)))
+    estado.ligar("mana", lambda v: chamadas.append(("mana", v)))
+    estado.publicar("vida", 100)
+    estado.publicar("mana", 50)
+    root.rodar()
+    chamadas.clear()
+    return root, estado, chamadas
+
+
+def test_varias_mudancas_viram_uma_atualizacao():
+    root, estado, chamadas = _estado()
+    for v in (90, 80, 70):
+        estado.publicar("vida", v)
+    assert len(root.ociosos) == 1 and not chamadas
+    root.rodar()
+    assert chamadas == [("vida", 70)]
+
+
+def test_valor_igual_nao_atualiza_o_widget():
+    root, estado, chamadas = _estado()
+    evitadas = estado.evitadas
+    estado.publicar("vida", 100)
+    estado.publicar("mana", 50)
+    assert not root.ociosos
+    assert estado.evitadas == evitadas + 2
+    root.rodar()
+    assert not chamadas
+
+
+def test_so_os_assinantes_do_campo_sujo_sao_chamados():
+    root, estado, chamadas = _estado()
+    estado.sincronizar(types.SimpleNamespace(vida=100, mana=35))
+    root.rodar()
+    assert chamadas == [("mana", 35)]
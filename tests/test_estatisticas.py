@@ -0,0 +1,61 @@
+from estatisticas import Estatisticas
+from motor_batalha import N_FEITICOS, REGISTRO, MotorBatalha, jogar_partida
+
+
+def _partidas(dificuldade, n, semente=0):
+    m = MotorBatalha(dificuldade, eventos=False)
+    for i in range(n):
+        m.novo_jogo(dificuldade, semente + i)
+        jogar_partida(m)
+        yield m
+
+
+def _linhas(est):
+    return est.con.execute("SELECT COUNT(*) FROM partidas").fetchone()[0]
+
+
+def test_registrar_grava_em_lotes(tmp_path):
+    with Estatisticas(str(tmp_path / "e.db"), lote=3) as est:
+        for k, m in enumerate(_partidas("Normal", 7), 1):
+            est.registrar(m)
+            assert _linhas(est) == 3 * (k // 3)
+        assert est.gravar() == 1
+        assert est.gravar() == 0
+    with Estatisticas(str(tmp_path / "e.db")) as est:
+        assert _linhas(est) == 7
+
+
+def test_resumos_conferem_com_as_partidas(tmp_path):
+    esperado = {}
+    lancamentos = [0] * (2 * N_FEITICOS)
+    with Estatisticas(str(tmp_path / "e.db"), lote=4) as est:
+        for d, origem in (("Normal", "jogo"), ("Difícil", "jogo"), ("Normal", "simulacao")):
+            for m in _partidas(d, 5):
+                est.registrar(m, origem)
+                r = esperado.setdefault((d, origem), [0, 0, 0])
+                r[0] += 1
+                r[1] += m.vencedor == "player"
+                r[2] += m.turnos
+                lancamentos = [a + b for a, b in zip(lancamentos, m.lancamentos)]
+        est.gravar()
+        obtido = {(r["dificuldade"], r["origem"]): [r["partidas"], r["vitorias"], r["turnos"]]
+                  for r in est.resumo()}
+        assert obtido == esperado
+        assert [r["origem"] for r in est.resumo(origem="simulacao")] == ["simulacao"]
+        feiticos = est.resumo_feiticos()
+        for lado, base in (("jogador", 0), ("inimigo", N_FEITICOS)):
+            for f in REGISTRO:
+                assert feiticos.get((f.id, lado), (0, 0))[0] == lancamentos[base + f.indice]
+
+
+def test_periodo_filtra_pela_data(tmp_path):
+    with Estatisticas(str(tmp_path / "e.db")) as est:
+        for k, m in enumerate(_partidas("Normal", 10)):
+            est.registrar(m, data=1000.0 + k)
+        for m in _partidas("Fácil", 2):
+            est.registrar(m, data=1002.0)
+        est.gravar()
+        normal = est.periodo(1003.0, 1006.0, dificuldade="Normal")
+        assert [r["partidas"] for r in normal] == [3]  # 1003, 1004, 1005
+        assert {r["dificuldade"]: r["partidas"] for r in est.periodo(1000.0, 1010.0)} == {"Normal": 10, "Fácil": 2}
+        assert est.periodo(2000.0, 3000.0) == []
@@ -0,0 +1,65 @@
+import copy
+import json
+
+import pytest
+
+import feiticos
+from feiticos import REGISTRO, carregar, de_dados
+
+with open(feiticos.ARQUIVO_PADRAO, encoding="utf-8") as _f:
+    PADRAO = json.load(_f)
+
+
+def _com(mudar):
+    dados = copy.deepcopy(PADRAO)
+    mudar(dados)
+    return dados
+
+
+def test_arquivo_padrao_carrega_igual():
+    r = de_dados(copy.deepcopy(PADRAO))
+    assert r.ids == REGISTRO.ids and r.impressao == REGISTRO.impressao
+    assert all(f.indice == k for k, f in enumerate(r))
+
+
+def test_mudar_uma_regra_muda_a_impressao():
+    r = de_dados(_com(lambda d: d["feiticos"][0].update(dano=d["feiticos"][0]["dano"] + 1)))
+    assert r.impressao != REGISTRO.impressao
+    # texto não é regra
+    r = de_dados(_com(lambda d: d["feiticos"][0].update(nome="Outro nome")))
+    assert r.impressao == REGISTRO.impressao
+
+
+def test_json_invalido_e_recusado(tmp_path):
+    caminho = tmp_path / "f.json"
+    caminho.write_text('{"feiticos": [', encoding="utf-8")
+    with pytest.raises(ValueError):
+        carregar(str(caminho))
+
+
+@pytest.mark.parametrize("versao", [0, 2, "1", True, None])
+def test_versao_desconhecida_e_recusada(versao):
+    with pytest.raises(ValueError, match="versão"):
+        de_dados(_com(lambda d: d.update(versao=versao)))
+
+
+@pytest.mark.parametrize("mudar", [
+    lambda d: d.update(feiticos=[]),
+    lambda d: d.update(feiticos=d["feiticos"] * (feiticos.MAX_FEITICOS // len(d["feiticos"]) + 1)),
+    lambda d: d["feiticos"][0].pop("mana"),
+    lambda d: d["feiticos"][0].update(dano=-1),
+    lambda d: d["feiticos"][0].update(chance=101),
+    lambda d: d["feiticos"][0].update(mana=2.5),
+    lambda d: d["feiticos"][0].update(status="petrificado"),
+    lambda d: d["feiticos"][0].update(status_alvo="todos"),
+    lambda d: d["feiticos"][0].update(pesos_ia={"panico": 1}),
+    lambda d: d["feiticos"][1].update(id=d["feiticos"][0]["id"]),
+    lambda d: d["feiticos"][0].update(id="defender"),
+    lambda d: d["feiticos"][0].update(tecla="p"),
+    lambda d: d.update(dificuldades={"Normal": {"vida": 0}}),
+    lambda d: d.update(dificuldades={"Normal": {"sorte": 3}}),
+], ids=["vazio", "demais", "sem_campo", "negativo", "chance", "fracao", "status", "alvo", "pesos",
+        "id_repetido", "id_reservado", "tecla_reservada", "dificuldade_zero", "dificuldade_campo"])
+def test_arquivo_invalido_e_recusado(mudar):
+    with pytest.raises(ValueError):
+        de_dados(_com(mudar))
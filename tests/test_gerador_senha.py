@@ -0,0 +1,86 @@
+import collections
+
+import pytest
+
+import gerador_senha
+from gerador_senha import alfabeto, gerar_bytes, senhas
+
+
+def _linhas(dados):
+    assert dados.endswith(b"\n")
+    return dados[:-1].split(b"\n")
+
+
+# ---------- Geração em lote ----------
+@pytest.mark.parametrize("tamanho", [1, 7, 16])
+def test_gerar_bytes_tamanho_e_alfabeto(tamanho):
+    caracteres = alfabeto(simbolos=False)
+    linhas = _linhas(gerar_bytes(5000, tamanho, caracteres))
+    assert len(linhas) == 5000
+    assert all(len(l) == tamanho for l in linhas)
+    assert set(b"".join(linhas)) <= set(caracteres.encode())
+
+
+def test_tamanho_zero_da_linhas_vazias():
+    assert gerar_bytes(3, 0, "ab") == b"\n\n\n"
+
+
+def test_alfabeto_sem_vies():
+    # 3 caracteres: 256 % 3 != 0, então sem a rejeição o "a" sairia mais
+    # (86/256 em vez de 1/3: ~7800 a mais em 3 milhões)
+    contagem = collections.Counter(gerar_bytes(1, 3000000, "abc")[:-1])
+    assert all(abs(n - 1000000) < 4000 for n in contagem.values())  # ~5 desvios
+
+
+@pytest.mark.parametrize("caracteres", ["", "aa", "é", "x" * 257])
+def test_alfabeto_invalido_e_recusado(caracteres):
+    with pytest.raises(ValueError):
+        gerar_bytes(1, 4, caracteres)
+
+
+def test_iterador_de_senhas_em_varios_blocos():
+    lista = list(senhas(10, 6, "xyz", lote=3))
+    assert len(lista) == 10
+    assert all(len(s) == 6 and set(s) <= set("xyz") for s in lista)
+
+
+def test_cli_escreve_uma_senha_por_linha(tmp_path):
+    saida = tmp_path / "senhas.txt"
+    gerador_senha.main(["-n", "1000", "--tamanho", "12", "--sem-simbolos", "--saida", str(saida)])
+    linhas = _linhas(saida.read_bytes())
+    assert len(linhas) == 1000
+    assert all(len(l) == 12 and l.isalnum() for l in linhas)
+
+
+# ---------- Paralelo ----------
+@pytest.mark.parametrize("processos", [1, 2])
+def test_paralelo_preenche_o_arquivo_inteiro(tmp_path, processos):
+    caminho = tmp_path / "senhas.txt"
+    caracteres = alfabeto()
+    # fragmentos e lotes que não dividem a quantidade: o último fica menor
+    total = gerador_senha.gerar_paralelo(str(caminho), 2503, 10, caracteres, processos=processos,
+                                         fragmento=1000, lote=300)
+    dados = caminho.read_bytes()
+    assert total == len(dados) == 2503 * 11
+    linhas = _linhas(dados)
+    assert len(linhas) == 2503
+    assert all(len(l) == 10 and set(l) <= set(caracteres.encode()) for l in linhas)
+    assert len(set(linhas)) == 2503  # nenhum fragmento ficou zerado ou repetido
+
+
+def test_paralelo_com_politica(tmp_path):
+    from politica_senha import PoliticaSenha
+    caminho = tmp_path / "senhas.txt"
+    politica = PoliticaSenha(minimos={"numeros": 3})
+    gerador_senha.gerar_paralelo(str(caminho), 500, 8, politica, processos=2, fragmento=200)
+    linhas = _linhas(caminho.read_bytes())
+    assert len(linhas) == 500
+    assert all(len(l) == 8 and sum(c in b"0123456789" for c in l) >= 3 for l in linhas)
+
+
+def test_paralelo_recusa_unicas(tmp_path):
+    from bloqueio_senhas import FiltroSenhas
+    with pytest.raises(ValueError):
+        gerador_senha.gerar_paralelo(str(tmp_path / "s.txt"), 10, 8, alfabeto(),
+                                     filtro=FiltroSenhas(unicas=True, capacidade=10))
+    assert not (tmp_path / "s.txt").exists()
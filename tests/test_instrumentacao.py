@@ -0,0 +1,41 @@
+import instrumentacao
+from instrumentacao import Instrumentacao, Serie
+
+
+def _serie(valores):
+    s = Serie()
+    for v in valores:
+        s.adicionar(v)
+    return s
+
+
+def test_percentis_por_posto_mais_proximo():
+    s = _serie(range(100, 0, -1))  # ordem de chegada não importa
+    assert s.percentis(0, 50, 95, 99, 100) == (1, 50, 95, 99, 100)
+    assert _serie([7]).percentis(50, 99) == (7, 7)
+    assert _serie([1, 2, 3, 4]).percentis(25, 50, 75, 76) == (1, 2, 3, 4)
+
+
+def test_serie_vazia():
+    assert Serie().percentis(50, 95) == (0.0, 0.0)
+
+
+def test_percentis_so_das_ultimas_amostras():
+    s = _serie([1000.0] * 10 + [1.0] * instrumentacao.AMOSTRAS)
+    assert s.percentis(99) == (1.0,)
+    # contadores e máximo cobrem a série inteira
+    assert s.chamadas == 10 + instrumentacao.AMOSTRAS
+    assert s.maximo == 1000.0
+
+
+def test_envolver_mede_e_desinstalar_volta_ao_metodo_da_classe():
+    class Alvo:
+        def dobro(self, x):
+            return 2 * x
+
+    inst, alvo = Instrumentacao(root=None), Alvo()
+    inst.instalar(alvo, ["dobro"], prefixo="alvo.")
+    assert alvo.dobro(3) == 6 and alvo.dobro(4) == 8
+    assert inst.resumo()["alvo.dobro"]["chamadas"] == 2
+    inst.desinstalar()
+    assert "dobro" not in vars(alvo) and not inst.instalada
@@ -0,0 +1,51 @@
+import random
+
+import pytest
+
+from feiticos import EFEITOS, REGISTRO
+from motor_batalha import (ACOES_INIMIGO, ACOES_JOGADOR, MotorBatalha, codificar_acao, decodificar_acao,
+                           jogar_partida)
+
+CARO = max(REGISTRO, key=lambda f: f.mana)
+QUEIMADURA = EFEITOS.indice["queimadura"]
+
+
+def _sempre_caro(motor, rng):
+    return CARO.id
+
+
+def test_mesma_semente_mesma_partida():
+    a, b = MotorBatalha("Normal", 7, eventos=False), MotorBatalha("Normal", 7, eventos=False)
+    assert jogar_partida(a) == jogar_partida(b)
+    assert (a.turnos, a.vida_jogador, a.vida_inimigo, a.acoes) == (b.turnos, b.vida_jogador, b.vida_inimigo, b.acoes)
+
+
+@pytest.mark.parametrize("quem, acoes", [("player", ACOES_JOGADOR), ("enemy", ACOES_INIMIGO)])
+def test_codigos_de_acao_ida_e_volta(quem, acoes):
+    for acao in acoes:
+        assert decodificar_acao(codificar_acao(quem, acao)) == (quem, acao)
+    assert decodificar_acao(codificar_acao("enemy", None)) == ("enemy", None)
+
+
+def test_feitico_sem_mana_nao_muda_nada():
+    m = MotorBatalha("Normal", 3, eventos=False)
+    m.mana_jogador = 0
+    m.status_player[QUEIMADURA] = 2
+    antes = (m.chave(), m.turnos, bytes(m.acoes), m.rng.getstate())
+    assert m.executar(CARO.id) is False
+    assert (m.chave(), m.turnos, bytes(m.acoes), m.rng.getstate()) == antes
+    assert m.fase == "jogador"
+
+
+def test_jogar_partida_feitico_recusado_vira_uma_defesa():
+    # o fallback de jogar_partida é um único DEFENDER: um tique de status
+    m = MotorBatalha("Normal", 3, eventos=False)
+    m.mana_jogador = 0
+    m.status_player[QUEIMADURA] = 2
+    defesa = m.clonar()
+    jogar_partida(m, _sempre_caro, random.Random(0), limite_turnos=1)
+    defesa.defender()
+    defesa.turno_inimigo()
+    assert (m.chave(), m.turnos, bytes(m.acoes)) == (defesa.chave(), defesa.turnos, bytes(defesa.acoes))
+    assert decodificar_acao(m.acoes[0]) == ("player", "defender")
+
@@ -0,0 +1,39 @@
+import pytest
+
+from motor_batalha import ACOES_INIMIGO, MotorBatalha
+from oponente_mcts import OponenteMCTS, acoes_inimigo
+
+
+def _vez_do_inimigo(semente=3, turnos=0):
+    m = MotorBatalha("Especialista", semente, eventos=False)
+    m.executar("defender")
+    m.turnos += turnos
+    return m
+
+
+@pytest.mark.parametrize("turnos", [0, 60, 500])
+def test_escolhe_acao_valida_com_orcamento_pequeno(turnos):
+    m = _vez_do_inimigo(turnos=turnos)
+    antes = (m.chave(), m.turnos, bytes(m.acoes))
+    oponente = OponenteMCTS(semente=1)
+    acao = oponente.escolher(m, orcamento_ms=20)
+    assert acao in acoes_inimigo(m)
+    assert oponente.iteracoes > 0
+    assert (m.chave(), m.turnos, bytes(m.acoes)) == antes  # a busca não toca no motor
+
+
+def test_partida_ja_terminada_nao_quebra():
+    m = _vez_do_inimigo()
+    m.game_over = True
+    assert OponenteMCTS(semente=1).escolher(m, orcamento_ms=5) in ACOES_INIMIGO
+
+
+def test_pensar_e_reiniciar_durante_a_busca():
+    oponente = OponenteMCTS(50, semente=2)
+    m = _vez_do_inimigo(turnos=70)
+    try:
+        futuro = oponente.pensar(m)
+        oponente.reiniciar()
+        assert futuro.result(timeout=5) in acoes_inimigo(m)
+    finally:
+        oponente.encerrar()
@@ -0,0 +1,33 @@
+import string
+
+import pytest
+
+import gerador_senha
+from politica_senha import PoliticaSenha
+
+
+def test_total_da_politica_confere_com_a_contagem_direta():
+    p = PoliticaSenha({"a": "ab", "d": "01"}, {"d": 1})
+    # senhas de 2 caracteres sobre "ab01" com pelo menos um dígito: 16 - 4
+    assert p.total(2) == 12
+
+
+def test_senhas_geradas_cumprem_os_minimos():
+    p = PoliticaSenha(minimos={"numeros": 2, "simbolos": 1})
+    for _ in range(200):
+        s = p.gerar(8)
+        assert sum(c in string.digits for c in s) >= 2
+        assert sum(c in p.classes["simbolos"] for c in s) >= 1
+
+
+@pytest.mark.parametrize("minimo", [-1, 1.5, True])
+def test_minimo_invalido_e_recusado(minimo):
+    with pytest.raises(ValueError):
+        PoliticaSenha(minimos={"numeros": minimo})
+
+
+def test_cli_recusa_minimo_negativo(tmp_path, capsys):
+    with pytest.raises(SystemExit) as e:
+        gerador_senha.main(["-n", "3", "--min-numeros", "-1", "--saida", str(tmp_path / "senhas.txt")])
+    assert e.value.code == 2
+    assert "não negativo" in capsys.readouterr().err
@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+import progressao
+from feiticos import REGISTRO
+from progressao import Feiticeiro, tabela, validar
+
+
+def test_tabela_base_tem_os_numeros_do_registro():
+    t = tabela()
+    assert t.dano[:-1] == tuple(f.dano for f in REGISTRO)
+    assert t.mana[:-1] == tuple(f.mana for f in REGISTRO)
+
+
+@pytest.mark.parametrize("magia, nivel", [(True, 1), (10, True), (10.0, 1), (10, 1.0), ("10", 1), (None, 1),
+                                          (0, 1), (progressao.MAGIA_MAXIMA + 1, 1), (10, 0),
+                                          (10, progressao.NIVEL_MAXIMO + 1)])
+def test_validar_recusa(magia, nivel):
+    with pytest.raises(ValueError):
+        validar(magia, nivel)
+
+
+def test_validar_aceita_inteiros_do_numpy():
+    np = pytest.importorskip("numpy")
+    for tipo in (np.int8, np.int32, np.int64, np.uint16):
+        validar(tipo(12), tipo(3))
+    t = tabela(np.int64(12), np.int64(3))
+    assert t is tabela(12, 3)  # a mesma entrada do cache
+    assert all(type(x) is int for x in (t.magia, t.nivel, t.poder, *t.dano, *t.mana))
+    with pytest.raises(ValueError):
+        validar(np.bool_(True), 1)
+
+
+def test_tabelas_lote_conferem_com_tabela():
+    np = pytest.importorskip("numpy")
+    magias, niveis = np.array([1, 10, 30, 17]), np.array([1, 1, 20, 9])
+    dano, mana, perfil = progressao.tabelas_lote(magias, niveis)
+    for m, n, p in zip(magias, niveis, perfil):
+        t = tabela(int(m), int(n))
+        assert tuple(dano[p]) == t.dano[:-1] and tuple(mana[p]) == t.mana[:-1]
+    with pytest.raises(ValueError):
+        progressao.tabelas_lote([0], [1])
+
+
+def test_feiticeiro_sobe_de_nivel_e_volta_do_arquivo(tmp_path):
+    f = Feiticeiro("Ana")
+    assert f.ganhar_experiencia(progressao.experiencia_para(3)) == 2
+    assert (f.nivel, f.magia) == (3, progressao.MAGIA_BASE + 2 * progressao.MAGIA_POR_NIVEL)
+    caminho = str(tmp_path / "f.json")
+    f.salvar(caminho)
+    g = Feiticeiro.carregar(caminho)
+    assert (g.nome, g.par, g.experiencia) == (f.nome, f.par, f.experiencia)
+
+
+@pytest.mark.parametrize("mudar", [{"versao": 2}, {"magia": True}, {"nivel": 2.5}, {"experiencia": -1}])
+def test_feiticeiro_invalido_no_arquivo(tmp_path, mudar):
+    caminho = tmp_path / "f.json"
+    dados = {"versao": progressao.VERSAO, "nome": "Ana", "magia": 10, "nivel": 1, "experiencia": 0, **mudar}
+    caminho.write_text(json.dumps(dados), encoding="utf-8")
+    with pytest.raises(ValueError):
+        Feiticeiro.carregar(str(caminho))
@@ -0,0 +1,101 @@
+from registro_combate import LogTk, RegistroCombate
+
+
+class RootFalso:
+    def __init__(self):
+        self.pendentes = {}
+        self._seq = 0
+
+    def after(self, ms, funcao):
+        self._seq += 1
+        self.pendentes[self._seq] = funcao
+        return self._seq
+
+    def after_cancel(self, ident):
+        self.pendentes.pop(ident, None)
+
+    def rodar(self):
+        pendentes, self.pendentes = self.pendentes, {}
+        for funcao in pendentes.values():
+            funcao()
+
+
+class TextoFalso:
+    """tk.Text reduzido: linhas terminadas em \\n, índices "linha.coluna" só no início da linha."""
+
+    def __init__(self):
+        self.linhas = []
+        self.inserts = 0
+
+    def insert(self, indice, texto):
+        assert indice == "end"
+        self.linhas.extend(texto.split("\n")[:-1])
+        self.inserts += 1
+
+    def delete(self, inicio, fim):
+        assert inicio == "1.0"
+        if fim == "end":
+            self.linhas.clear()
+        else:
+            del self.linhas[:int(fim.split(".")[0]) - 1]
+
+    def see(self, indice):
+        pass
+
+
+def test_registro_descarta_as_linhas_mais_antigas():
+    r = RegistroCombate(limite_linhas=3, limite_historico=5)
+    for k in range(8):
+        r.adicionar(str(k))
+    assert list(r.visiveis) == ["5", "6", "7"]
+    assert list(r.historico) == ["3", "4", "5", "6", "7"]
+    assert r.total == 8
+
+
+def test_limpar_mantem_o_historico_da_sessao():
+    r = RegistroCombate()
+    r.adicionar("a")
+    r.limpar()
+    assert not r.visiveis
+    assert list(r.historico) == ["a", "-" * 40]
+
+
+def test_rajada_vira_uma_escrita_por_quadro():
+    root, widget = RootFalso(), TextoFalso()
+    log = LogTk(root, widget, RegistroCombate(limite_linhas=4))
+    for k in range(10):
+        log.adicionar(f"linha {k}")
+    assert len(root.pendentes) == 1 and not widget.linhas
+    root.rodar()
+    assert widget.inserts == 1 and log.descargas == 1
+    assert widget.linhas == [f"linha {k}" for k in range(6, 10)]
+
+
+def test_widget_nunca_passa_do_limite():
+    root, widget = RootFalso(), TextoFalso()
+    log = LogTk(root, widget, RegistroCombate(limite_linhas=4))
+    for k in range(7):
+        log.adicionar("\nvitória" if k == 5 else str(k))  # texto de duas linhas
+        root.rodar()
+        assert len(widget.linhas) <= 4
+    assert widget.linhas == ["4", "", "vitória", "6"]
+
+
+def test_limpar_cancela_a_descarga_pendente():
+    root, widget = RootFalso(), TextoFalso()
+    log = LogTk(root, widget)
+    log.adicionar("a")
+    log.limpar()
+    assert not root.pendentes and not widget.linhas
+    log.adicionar("b")
+    root.rodar()
+    assert widget.linhas == ["b"]
+
+
+def test_exportar_grava_o_historico(tmp_path):
+    r = RegistroCombate()
+    for k in range(3):
+        r.adicionar(f"turno {k}")
+    caminho = tmp_path / "log.txt"
+    assert r.exportar(str(caminho)).result(5) == 3
+    assert caminho.read_text(encoding="utf-8").splitlines() == ["turno 0", "turno 1", "turno 2"]
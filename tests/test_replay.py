@@ -0,0 +1,46 @@
+import random
+
+import pytest
+
+import replay
+from motor_batalha import MotorBatalha, politica_aleatoria
+
+
+def _jogar(m, semente, acoes=1000):
+    rng = random.Random(semente)
+    while len(m.acoes) < acoes and not m.game_over and m.turnos < 500:
+        if not m.executar(politica_aleatoria(m, rng)):
+            m.defender()
+        if m.fase == "inimigo":
+            m.turno_inimigo()
+    return m
+
+
+def test_replay_reproduz_a_partida(tmp_path):
+    m = _jogar(MotorBatalha("Difícil", 11, eventos=False), 11)
+    caminho = str(tmp_path / "p.bfr")
+    replay.salvar(caminho, replay.Replay.de_motor(m))
+    r = replay.carregar(caminho)
+    final = r.reproduzir()
+    assert (final.chave(), final.turnos, final.vencedor) == (m.chave(), m.turnos, m.vencedor)
+    meio = len(r) // 2
+    assert r.posicionar(meio).chave() == replay.Replay.de_motor(m).posicionar(meio).chave()
+
+
+def test_gravador_escreve_durante_a_partida(tmp_path):
+    caminho = str(tmp_path / "p.bfr")
+    m = MotorBatalha("Normal", 3, eventos=False)
+    gravador = replay.GravadorReplay(caminho, m)
+    _jogar(m, 5)
+    gravador.fechar()
+    assert replay.carregar(caminho).reproduzir().chave() == m.chave()
+
+
+def test_replay_de_outra_versao_e_recusado(tmp_path):
+    caminho = tmp_path / "p.bfr"
+    replay.salvar(str(caminho), replay.Replay.de_motor(_jogar(MotorBatalha("Difícil", 11, eventos=False), 11, 6)))
+    dados = bytearray(caminho.read_bytes())
+    dados[4] = replay.VERSAO - 1
+    caminho.write_bytes(bytes(dados))
+    with pytest.raises(ValueError):
+        replay.carregar(str(caminho))
@@ -0,0 +1,70 @@
+import random
+import struct
+
+import pytest
+
+import salvamento
+from motor_batalha import MotorBatalha, politica_aleatoria
+
+
+def _meia_partida(semente=11, acoes=6):
+    m = MotorBatalha("Difícil", semente, eventos=False)
+    rng = random.Random(semente)
+    while len(m.acoes) < acoes and not m.game_over:
+        if not m.executar(politica_aleatoria(m, rng)):
+            m.defender()
+        if m.fase == "inimigo":
+            m.turno_inimigo()
+    return m
+
+
+def _terminar(m, semente=5):
+    rng = random.Random(semente)
+    while not m.game_over and m.turnos < 500:
+        if not m.executar(politica_aleatoria(m, rng)):
+            m.defender()
+        if m.fase == "inimigo":
+            m.turno_inimigo()
+    return (m.vencedor, m.turnos, m.vida_jogador, m.vida_inimigo, bytes(m.acoes))
+
+
+def test_salvar_e_carregar_continua_igual(tmp_path):
+    m = _meia_partida()
+    caminho = str(tmp_path / "p.bfs")
+    salvamento.salvar(caminho, m)
+    carregado = salvamento.carregar(caminho, eventos=False)
+    assert carregado.chave() == m.chave()
+    assert _terminar(carregado) == _terminar(m)
+
+
+def test_restaurar_recusa_cabecalho_corrompido():
+    dados = salvamento.serializar(_meia_partida())
+    estragos = {
+        "mágico": b"XXXX" + dados[4:],
+        "versão": dados[:4] + bytes([salvamento.VERSAO + 1]) + dados[5:],
+        "impressão": dados[:5] + bytes(8) + dados[13:],
+        "truncado": dados[:-1],
+        "curto": dados[:10],
+    }
+    # dificuldade, fase e vencedor: índices u8 fora das tuplas do formato
+    for nome, antes in (("dificuldade", "<4sB8s"), ("fase", "<4sB8sBQhhhhBB"), ("vencedor", "<4sB8sBQhhhhBBB")):
+        pos = struct.calcsize(antes)
+        estragos[nome] = dados[:pos] + b"\xc8" + dados[pos + 1:]
+    for nome, estragado in estragos.items():
+        with pytest.raises(ValueError):
+            salvamento.restaurar(estragado)
+
+
+
+def test_autosalvamento_grava_o_ultimo_estado(tmp_path):
+    caminho = str(tmp_path / "auto.bfs")
+    auto = salvamento.AutoSalvamento(caminho)
+    m = _meia_partida(acoes=2)
+    for _ in range(20):
+        auto.agendar(m)
+        m = _meia_partida(acoes=len(m.acoes) + 1)
+    auto.agendar(m)
+    auto.encerrar()
+    assert auto.erro is None
+    assert auto.gravacoes + auto.substituidos == 21
+    assert salvamento.carregar(caminho, eventos=False).chave() == m.chave()
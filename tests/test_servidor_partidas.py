@@ -0,0 +1,96 @@
+import asyncio
+import json
+import socket
+
+import pytest
+
+from feiticos import REGISTRO
+from servidor_partidas import ServidorPartidas, servir
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="precisa de socket Unix")
+
+
+def _conversa(tmp_path, roteiro):
+    """Sobe o servidor num socket Unix, roda roteiro(enviar, receber) e devolve o resultado."""
+    caminho = str(tmp_path / "s.sock")
+
+    async def principal():
+        servidor = ServidorPartidas()
+        pronto = asyncio.Event()
+        tarefa = asyncio.create_task(servir(servidor, unix=caminho, pronto=pronto))
+        await pronto.wait()
+        reader, writer = await asyncio.open_unix_connection(caminho)
+
+        async def enviar(msg):
+            writer.write(msg if isinstance(msg, bytes) else (json.dumps(msg) + "\n").encode())
+            await writer.drain()
+
+        async def receber():
+            return json.loads(await asyncio.wait_for(reader.readline(), 5))
+
+        try:
+            return await roteiro(enviar, receber)
+        finally:
+            writer.close()
+            tarefa.cancel()
+            await asyncio.gather(tarefa, return_exceptions=True)
+
+    return asyncio.run(principal())
+
+
+@pytest.mark.parametrize("msg", [
+    b"{nao e json\n",
+    b"[1, 2]\n",
+    {"op": "voar"},
+    {"op": "acao", "acao": "fogo"},  # fora de partida
+    {"op": "entrar", "modo": ["ia"]},
+    {"op": "entrar", "dificuldade": {"Normal": 1}},
+    {"op": "entrar", "dificuldade": "Especialista"},
+    {"op": "entrar", "semente": True},
+    {"op": "entrar", "semente": -1},
+])
+def test_mensagem_malformada_responde_erro_e_segue(tmp_path, msg):
+    async def roteiro(enviar, receber):
+        await enviar(msg)
+        erro = await receber()
+        await enviar({"op": "metricas"})
+        return erro, await receber()
+
+    erro, metricas = _conversa(tmp_path, roteiro)
+    assert erro["tipo"] == "erro"
+    assert metricas["tipo"] == "metricas"  # a conexão continua de pé
+
+
+@pytest.mark.parametrize("acao", [["fogo"], {"a": 1}, 3, None, "pocao_magica"])
+def test_acao_invalida_dentro_da_partida(tmp_path, acao):
+    async def roteiro(enviar, receber):
+        await enviar({"op": "entrar", "semente": 1})
+        inicio = await receber()
+        await enviar({"op": "acao", "acao": acao})
+        erro = await receber()
+        await enviar({"op": "acao", "acao": "defender"})
+        return inicio, erro, await receber()
+
+    inicio, erro, jogada = _conversa(tmp_path, roteiro)
+    assert inicio["tipo"] == "inicio"
+    assert erro["tipo"] == "erro"
+    assert jogada["tipo"] == "jogada" and jogada["quem"] == "player"
+
+
+def test_partida_contra_a_ia_termina(tmp_path):
+    async def roteiro(enviar, receber):
+        await enviar({"op": "entrar", "dificuldade": "Fácil", "semente": 42})
+        msg = await receber()
+        assert msg["tipo"] == "inicio"
+        for _ in range(2000):
+            if msg["tipo"] == "fim":
+                return msg
+            if msg["tipo"] in ("inicio", "jogada") and msg["estado"]["fase"] == "jogador":
+                f = REGISTRO.por_indice[0]
+                await enviar({"op": "acao", "acao": f.id if msg["estado"]["mana_jogador"] >= f.mana else "defender"})
+            msg = await receber()
+        raise AssertionError("partida não terminou")
+
+    fim = _conversa(tmp_path, roteiro)
+    assert fim["vencedor"] in ("player", "enemy", None)
+    assert fim["motivo"] in ("fim", "limite_turnos")
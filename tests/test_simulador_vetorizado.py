@@ -0,0 +1,35 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import simulador_vetorizado as sv  # noqa: E402
+from feiticos import REGISTRO  # noqa: E402
+from motor_batalha import MotorBatalha, jogar_partida  # noqa: E402
+
+CARO = max(REGISTRO, key=lambda f: f.mana)
+
+
+def _sempre_caro(motor, rng):
+    return CARO.id
+
+
+def test_mesma_semente_mesmo_resumo():
+    a = sv.simular_dificuldade("Normal", 2000, semente=3)
+    b = sv.simular_dificuldade("Normal", 2000, semente=3)
+    assert (a["vitorias"], a["turnos_media"]) == (b["vitorias"], b["turnos_media"])
+    assert a["partidas"] == 2000
+    assert a["ic95"][0] <= a["taxa_vitoria"] <= a["ic95"][1]
+
+
+def test_motor_e_simulador_concordam_com_feitico_recusado():
+    n = 4000
+    m = MotorBatalha("Normal", eventos=False)
+    vitorias = 0
+    for i in range(n):
+        m.novo_jogo("Normal", i)
+        vitorias += jogar_partida(m, _sempre_caro) == "player"
+    lote = sv.LoteBatalhas.da_dificuldade("Normal", 40000, np.random.default_rng(0))
+    lote.simular(lambda lt, rng: np.full(lt.n, CARO.indice))
+    baixo, alto = sv.resumo(lote)["ic95"]
+    margem = 2.5 * (0.25 / n) ** 0.5  # ~2,5 desvios do motor
+    assert baixo - margem <= vitorias / n <= alto + margem
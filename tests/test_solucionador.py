@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from feiticos import REGISTRO  # noqa: E402
+from motor_batalha import MotorBatalha  # noqa: E402
+from solucionador import Grade, Solucionador, TabelaSolucao  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def arquivo(tmp_path_factory):
+    # grade grossa e poucas iterações: só o formato importa aqui
+    caminho = str(tmp_path_factory.mktemp("sol") / "normal.bin")
+    sol = Solucionador("Normal", Grade(60, 60, 1))
+    sol.resolver(max_iteracoes=2)
+    sol.salvar(caminho)
+    return caminho
+
+
+def test_tabela_abre_e_consulta(arquivo):
+    tabela = TabelaSolucao(arquivo)
+    try:
+        assert tabela.meta["impressao"] == REGISTRO.impressao.hex()
+        acao, chance = tabela.consultar(MotorBatalha("Normal", 1, eventos=False))
+        assert acao is None or acao in tabela.acoes
+        assert 0.0 <= chance <= 1.0
+    finally:
+        tabela.fechar()
+
+
+def _estragar(origem, destino, mudar):
+    with open(origem, "rb") as f:
+        dados = f.read()
+    with open(destino, "wb") as f:
+        f.write(mudar(dados))
+    return str(destino)
+
+
+@pytest.mark.parametrize("nome, mudar", [
+    ("truncada", lambda d: d[:-1]),
+    ("sobrando", lambda d: d + b"\x00"),
+    ("impressao", lambda d: d.replace(REGISTRO.impressao.hex().encode(), b"0" * 16, 1)),
+    ("magico", lambda d: b"XXXXXX" + d[6:]),
+    ("curta", lambda d: d[:7]),
+])
+def test_tabela_estragada_e_recusada_ao_abrir(arquivo, tmp_path, nome, mudar):
+    with pytest.raises(ValueError):
+        TabelaSolucao(_estragar(arquivo, tmp_path / f"{nome}.bin", mudar))
+
+
+def test_metadados_sem_campos_viram_value_error(arquivo, tmp_path):
+    def sem_grade(dados):
+        tam = int.from_bytes(dados[6:10], "little")
+        meta = json.loads(dados[10:10 + tam])
+        del meta["passo_vida"]
+        bruto = json.dumps(meta).encode().ljust(tam)
+        return dados[:10] + bruto + dados[10 + tam:]
+    with pytest.raises(ValueError):
+        TabelaSolucao(_estragar(arquivo, tmp_path / "meta.bin", sem_grade))
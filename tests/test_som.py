@@ -0,0 +1,59 @@
+import threading
+
+import som
+
+
+class SomPreso:
+    """Backend que bloqueia como o winsound até o teste liberar."""
+    nome = "preso"
+    bloqueia = True
+
+    def __init__(self):
+        self.tocando = threading.Event()
+        self.liberar = threading.Event()
+        self.tocados = []
+
+    def tocar(self, frequencia, duracao_ms):
+        self.tocados.append(frequencia)
+        self.tocando.set()
+        self.liberar.wait(5)
+
+
+class SomContado(som.SomNulo):
+    def __init__(self):
+        self.tocados = 0
+
+    def tocar(self, frequencia, duracao_ms):
+        self.tocados += 1
+
+
+def test_fila_cheia_descarta_sem_bloquear():
+    backend = SomPreso()
+    s = som.Som(backend, tamanho_fila=2)
+    s.tocar("ok")
+    assert backend.tocando.wait(5)  # a thread está presa no primeiro tom
+    for _ in range(5):
+        s.tocar("fail")
+    assert s.descartados == 3
+    s.encerrar()  # com a fila cheia, a sentinela ainda entra
+    backend.liberar.set()
+    s._thread.join(5)
+    assert not s._thread.is_alive()
+    # o tom que sobrou na fila ainda toca antes da sentinela
+    assert backend.tocados == [som.TONS["ok"][0], som.TONS["fail"][0]]
+
+
+def test_backend_instantaneo_toca_direto():
+    backend = SomContado()
+    s = som.Som(backend)
+    s.tocar("ok")
+    s.tocar("fail")
+    assert backend.tocados == 2 and s._thread is None
+    s.encerrar()
+    s.tocar("ok")
+    assert backend.tocados == 2
+
+
+def test_sem_som_forca_o_backend_nulo(monkeypatch):
+    monkeypatch.setenv("BATALHA_SEM_SOM", "1")
+    assert som.resolver_backend(root=object()).nome == "nulo"
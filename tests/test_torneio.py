@@ -0,0 +1,27 @@
+import politicas
+from feiticos import REGISTRO
+from torneio import tarefas_torneio, torneio
+
+JOGADORES, INIMIGOS = ("gulosa", "roteirizada"), ("ia", "gulosa")
+
+
+def test_mesma_semente_mesma_tabela():
+    a = torneio(JOGADORES, INIMIGOS, partidas=30, semente=4, processos=1)
+    assert torneio(JOGADORES, INIMIGOS, partidas=30, semente=4, processos=1) == a
+    assert torneio(JOGADORES, INIMIGOS, partidas=30, semente=5, processos=1) != a
+
+
+def test_tabela_nao_depende_do_numero_de_processos():
+    um = torneio(JOGADORES, INIMIGOS, partidas=30, semente=4, processos=1)
+    assert torneio(JOGADORES, INIMIGOS, partidas=30, semente=4, processos=2) == um
+
+
+def test_blocos_cobrem_as_partidas():
+    tarefas = tarefas_torneio(["gulosa"], ["ia"], ["Normal"], 2500, bloco=1000)
+    assert [t[-1] for t in tarefas] == [1000, 1000, 500]
+    assert len({t[3] for t in tarefas}) == 3
+
+
+def test_roteiro_usa_apenas_feiticos_do_registro():
+    ids = {f.id for f in REGISTRO}
+    assert all(p in ids or p == "defender" for p in politicas.ROTEIRO)
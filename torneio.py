@@ -0,0 +1,140 @@
+# Batalha dos Feiticeiros — Torneio de Políticas (multiprocessado)
+# Coloca políticas de jogador contra políticas de inimigo (politicas.py)
+# em todas as combinações, distribuindo blocos de partidas por um pool
+# de processos. Cada bloco tem semente própria derivada de
+# (semente, jogador, inimigo, dificuldade, bloco), então o resultado é
+# o mesmo com 1 ou 64 processos.
+#
+# Execução:
+#   python torneio.py --partidas 20000
+#   python torneio.py --jogador gulosa,aleatoria --inimigo ia --dificuldade Difícil --processos 8
+
+import hashlib
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from motor_batalha import DIFICULDADES_IA_EMBUTIDA, MotorBatalha, jogar_partida
+from politicas import POLITICAS, para_inimigo, para_jogador
+
+TAMANHO_BLOCO = 2000
+
+
+# ---------- Sementes ----------
+def semente_bloco(semente, jogador, inimigo, dificuldade, bloco):
+    # Semente estável entre execuções e processos (hash() do Python não é)
+    chave = f"{semente}|{jogador}|{inimigo}|{dificuldade}|{bloco}".encode()
+    return int.from_bytes(hashlib.blake2b(chave, digest_size=8).digest(), "little")
+
+
+# ---------- Trabalho de cada processo ----------
+def _jogar_bloco(tarefa):
+    jogador, inimigo, dificuldade, semente, partidas = tarefa
+    pol_jogador = para_jogador(POLITICAS[jogador])
+    pol_inimigo = POLITICAS[inimigo]
+    pol_inimigo = None if pol_inimigo is POLITICAS["ia"] else para_inimigo(pol_inimigo)
+
+    rng = random.Random(semente)
+    motor = MotorBatalha(dificuldade, eventos=False)
+    vitorias = derrotas = turnos = acertos_j = acertos_i = 0
+    for _ in range(partidas):
+        motor.novo_jogo(dificuldade, rng.getrandbits(64))
+        vencedor = jogar_partida(motor, pol_jogador, rng, politica_inimigo=pol_inimigo)
+        if vencedor == "player":
+            vitorias += 1
+        elif vencedor == "enemy":
+            derrotas += 1
+        turnos += motor.turnos
+        acertos_j += motor.acertos_player
+        acertos_i += motor.acertos_enemy
+    return (jogador, inimigo, dificuldade), (partidas, vitorias, derrotas, turnos, acertos_j, acertos_i)
+
+
+# ---------- Torneio ----------
+def tarefas_torneio(jogadores, inimigos, dificuldades, partidas, semente=0, bloco=TAMANHO_BLOCO):
+    tarefas = []
+    for d in dificuldades:
+        for j in jogadores:
+            for i in inimigos:
+                for b, inicio in enumerate(range(0, partidas, bloco)):
+                    n = min(bloco, partidas - inicio)
+                    tarefas.append((j, i, d, semente_bloco(semente, j, i, d, b), n))
+    return tarefas
+
+
+def torneio(jogadores, inimigos, dificuldades=("Normal",), partidas=10000, semente=0, processos=None):
+    """
+    Joga `partidas` partidas por combinação e devolve a tabela mesclada:
+    {(jogador, inimigo, dificuldade): [partidas, vitórias, derrotas, turnos, acertos_j, acertos_i]}
+    """
+    tarefas = tarefas_torneio(jogadores, inimigos, dificuldades, partidas, semente)
+    processos = processos or os.cpu_count() or 1
+    tabela = {}
+    if processos == 1:
+        resultados = map(_jogar_bloco, tarefas)
+        return _mesclar(tabela, resultados)
+    with ProcessPoolExecutor(max_workers=processos) as pool:
+        # blocos pequenos e numerosos mantêm todos os núcleos ocupados até o fim
+        return _mesclar(tabela, pool.map(_jogar_bloco, tarefas, chunksize=1))
+
+
+def _mesclar(tabela, resultados):
+    for chave, valores in resultados:
+        acumulado = tabela.setdefault(chave, [0] * len(valores))
+        for k, v in enumerate(valores):
+            acumulado[k] += v
+    return tabela
+
+
+def imprimir_tabela(tabela, jogadores, inimigos, dificuldades):
+    largura = max(len(i) for i in inimigos) + 2
+    for d in dificuldades:
+        print(f"\n== {d} == (vitórias do jogador | turnos médios)")
+        print(f"{'jogador / inimigo':<20}" + "".join(f"{i:>{largura + 12}}" for i in inimigos))
+        for j in jogadores:
+            celulas = []
+            for i in inimigos:
+                n, vit, _, turnos, _, _ = tabela[(j, i, d)]
+                celulas.append(f"{100 * vit / max(1, n):6.1f}% | {turnos / max(1, n):4.1f}")
+            print(f"{j:<20}" + "".join(f"{c:>{largura + 12}}" for c in celulas))
+
+
+# ---------- Main ----------
+def main(argv=None):
+    import argparse
+    nomes = ",".join(POLITICAS)
+    parser = argparse.ArgumentParser(description="Torneio de políticas em todos os núcleos.")
+    parser.add_argument("--jogador", default=nomes, help=f"políticas do jogador ({nomes})")
+    parser.add_argument("--inimigo", default=nomes, help=f"políticas do inimigo ({nomes})")
+    parser.add_argument("--dificuldade", default="Normal",
+                        help=f"lista separada por vírgulas ({','.join(DIFICULDADES_IA_EMBUTIDA)})")
+    parser.add_argument("--partidas", type=int, default=10000, help="partidas por combinação")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--processos", type=int, default=None, help="padrão: todos os núcleos")
+    args = parser.parse_args(argv)
+
+    jogadores = args.jogador.split(",")
+    inimigos = args.inimigo.split(",")
+    dificuldades = args.dificuldade.split(",")
+    for p in jogadores + inimigos:
+        if p not in POLITICAS:
+            parser.error(f"política desconhecida: {p}")
+    for d in dificuldades:
+        if d not in DIFICULDADES_IA_EMBUTIDA:
+            # Especialista e Treinada dependem de um oponente que o torneio não cria
+            parser.error(f"dificuldade indisponível no torneio: {d}")
+
+    inicio = time.perf_counter()
+    tabela = torneio(jogadores, inimigos, dificuldades, args.partidas, args.semente, args.processos)
+    duracao = time.perf_counter() - inicio
+    imprimir_tabela(tabela, jogadores, inimigos, dificuldades)
+
+    total = sum(v[0] for v in tabela.values())
+    processos = args.processos or os.cpu_count() or 1
+    print(f"\n{total:,} partidas em {duracao:.2f}s com {processos} processo(s) "
+          f"({total / max(duracao, 1e-9):,.0f} partidas/s)")
+
+
+if __name__ == "__main__":
+    main()